@@ -0,0 +1,139 @@
+import cProfile
+import functools
+import pstats
+import re
+import time
+from pathlib import Path
+
+# number of rows of the summary tables printed by `ActionProfiler.print_summary`
+SUMMARY_ROWS = 10
+
+class ActionProfiler:
+    """
+    Profiles the actions of the interactive app, e.g. every call of a `prompts` function, with one cProfile
+    profile and wall-clock timer per action.
+
+    Time spent waiting for the user is excluded from both: while an excluded function (a questionary prompt,
+    `prompts.pause`) runs, the clock of the profiler is stopped, so the functions waiting for the user are
+    profiled with the time they actually spent working.
+    """
+
+    def __init__(self, output_dir: str = "profiles") -> None:
+        self.output_dir = Path(output_dir)
+        self._profiles = {}
+        self._timings = {}
+        self._waited = 0.0
+        self._wait_start = None
+        self._wait_depth = 0
+        self._patched = []
+
+    def clock(self) -> float:
+        """Returns the elapsed seconds, not counting the time spent in excluded functions."""
+        if self._wait_start is not None:
+            return self._wait_start - self._waited
+        return time.perf_counter() - self._waited
+
+    def exclude(self, owner, name: str) -> None:
+        """
+        Excludes a function from the profiles and timers, e.g. `exclude(questionary.Question, "ask")`.
+
+        Args:
+            owner (module | class): The module or class the function is looked up from by its callers.
+            name (str): The name of the function.
+        """
+        function = getattr(owner, name)
+
+        @functools.wraps(function)
+        def excluded(*args, **kwargs):
+            # excluded functions may call each other: only the outermost call stops the clock
+            if self._wait_depth == 0:
+                self._wait_start = time.perf_counter()
+            self._wait_depth += 1
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._wait_depth -= 1
+                if self._wait_depth == 0:
+                    self._waited += time.perf_counter() - self._wait_start
+                    self._wait_start = None
+
+        setattr(owner, name, excluded)
+        self._patched.append((owner, name, function))
+
+    def restore(self) -> None:
+        """Restores the functions excluded with `exclude`."""
+        for owner, name, function in reversed(self._patched):
+            setattr(owner, name, function)
+        self._patched.clear()
+
+    def run(self, action: str, function, *args, **kwargs):
+        """
+        Runs an action, adding its call to the profile and timings of the action.
+
+        Args:
+            action (str): The name of the action.
+            function (callable): The function running the action.
+
+        Returns:
+            The result of the function.
+        """
+        profile = self._profiles.get(action)
+        if profile is None:
+            profile = self._profiles[action] = cProfile.Profile(self.clock)
+        start = self.clock()
+        try:
+            return profile.runcall(function, *args, **kwargs)
+        finally:
+            self._timings.setdefault(action, []).append(self.clock() - start)
+
+    def action_stats(self) -> list[tuple[str, int, float, float]]:
+        """
+        Returns the timings of the profiled actions, the slowest first.
+
+        Returns:
+            list[tuple[str, int, float, float]]: The action, its number of calls, and its total and maximum seconds.
+        """
+        stats = [(action, len(times), sum(times), max(times)) for action, times in self._timings.items()]
+        return sorted(stats, key=lambda stat: stat[2], reverse=True)
+
+    def function_stats(self) -> list[tuple[str, int, float, float]]:
+        """
+        Returns the functions called by the profiled actions, the slowest first by their own time.
+
+        Returns:
+            list[tuple[str, int, float, float]]: The function, its number of calls, its own seconds, and its
+                cumulative seconds including the functions it called.
+        """
+        stats = pstats.Stats(*self._profiles.values()) if self._profiles else None
+        if stats is None:
+            return []
+        functions = [
+            (pstats.func_std_string(function), calls, own_time, cumulative_time)
+            for function, (_, calls, own_time, cumulative_time, _) in stats.stats.items()
+        ]
+        return sorted(functions, key=lambda stat: stat[2], reverse=True)
+
+    def dump(self) -> list[Path]:
+        """
+        Writes the profile of every action to `<output_dir>/<action>.prof`, readable with pstats or snakeviz.
+
+        Returns:
+            list[Path]: The paths of the profile dumps.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for action, profile in self._profiles.items():
+            path = self.output_dir / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', action)}.prof"
+            profile.dump_stats(path)
+            paths.append(path)
+        return paths
+
+    def print_summary(self, rows: int = SUMMARY_ROWS) -> None:
+        """Prints the slowest actions and functions."""
+        print(f"{'Action':<40}{'Calls':>8}{'Total (s)':>12}{'Max (s)':>12}")
+        for action, calls, total, slowest in self.action_stats()[:rows]:
+            print(f"{action:<40}{calls:>8}{total:>12.4f}{slowest:>12.4f}")
+        print()
+        print(f"{'Function':<70}{'Calls':>8}{'Own (s)':>12}{'Cumul. (s)':>12}")
+        for function, calls, own_time, cumulative_time in self.function_stats()[:rows]:
+            print(f"{function[-70:]:<70}{calls:>8}{own_time:>12.4f}{cumulative_time:>12.4f}")
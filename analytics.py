@@ -1,20 +1,56 @@
 import sqlite3
 from datetime import datetime, timedelta, date
 from analytics_queries import *
+import backends
+import interval_store
+import bitmap_store
+import partitions
 
-def connect_db(db_name: str = "habit.db") -> sqlite3.Connection:
+# number of rows fetched at once by `stream_rows`
+STREAM_CHUNK_SIZE = 500
+
+def connect_db(db_name: str = "habit.db", read_only: bool = False) -> sqlite3.Connection:
     """
     Establishes a connection to the SQLite database and enables foreign key constraints.
+    The archived years of completions are attached, so that 'completions' reads every partition.
 
     Args:
-        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        db_name (str, optional): The name of the database file, or of an in-memory database ("memory:<name>").
+            Defaults to "habit.db".
+        read_only (bool, optional): Open the database in read-only mode. Defaults to False.
 
     Returns:
         sqlite3.Connection: A connection object to interact with the database.
     """
-    con = sqlite3.connect(db_name)
+    con = backends.connect(db_name, read_only)
     con.execute("PRAGMA foreign_keys = ON")
-    return con, con.cursor()
+    cursor = con.cursor()
+    partitions.attach_partitions(cursor, db_name)
+    return con, cursor
+
+def stream_rows(query: str, params: tuple = (), db_name: str = "habit.db", chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Streams the rows of a query, fetched STREAM_CHUNK_SIZE rows at a time, so that the first rows can be used
+    before the whole result is read. The connection is closed once the rows are exhausted or the generator closed.
+
+    Args:
+        query (str): The query, e.g. from analytics_queries.
+        params (tuple, optional): The parameters of the query. Defaults to ().
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        chunk_size (int, optional): The number of rows fetched at once. Defaults to STREAM_CHUNK_SIZE.
+
+    Yields:
+        tuple: The rows of the query.
+    """
+    con, cursor = connect_db(db_name, read_only=True)
+    try:
+        cursor.execute(query, params)
+        while rows := cursor.fetchmany(chunk_size):
+            yield from rows
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
 
 def fetch_all_habits(db_name: str = "habit.db") -> list[tuple]:
     """
@@ -70,6 +106,78 @@ def fetch_weekly_habits(db_name: str = "habit.db") -> list[tuple]:
     finally:
         con.close()
 
+def fetch_all_habits_with_id(db_name: str = "habit.db") -> list[tuple]:
+    """
+    Fetch all habits from the database, together with their id.
+    
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    
+    Returns:
+        list[tuple]: A list of tuples containing the habit id, name, periodicity, and creation date.
+    """
+    con, cursor = connect_db(db_name)
+    try:
+        return cursor.execute(all_habits_with_id_query).fetchall()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_daily_habits_with_id(db_name: str = "habit.db") -> list[tuple]:
+    """
+    Fetch all daily habits from the database, together with their id.
+    
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    
+    Returns:
+        list[tuple]: A list of tuples containing the habit id, name, periodicity, and creation date.
+    """
+    con, cursor = connect_db(db_name)
+    try:
+        return cursor.execute(daily_habits_with_id_query).fetchall()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_weekly_habits_with_id(db_name: str = "habit.db") -> list[tuple]:
+    """
+    Fetch all weekly habits from the database, together with their id.
+    
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    
+    Returns:
+        list[tuple]: A list of tuples containing the habit id, name, periodicity, and creation date.
+    """
+    con, cursor = connect_db(db_name)
+    try:
+        return cursor.execute(weekly_habits_with_id_query).fetchall()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_habit_names(db_name: str = "habit.db") -> list[str]:
+    """
+    Fetch the names of all habits from the database, in alphabetical order.
+    
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    
+    Returns:
+        list[str]: A list containing the name of every habit.
+    """
+    con, cursor = connect_db(db_name)
+    try:
+        return [row[0] for row in cursor.execute(habit_names_query)]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
 def count_habits(db_name: str = "habit.db") -> int:
     """
     Returns the total number of habits in the database.
@@ -142,7 +250,67 @@ def fetch_habit_completion_dates(habit_name: str, db_name: str = "habit.db") ->
     try:
         cursor.execute(habit_completion_dates_query, (habit_name,))
         data = cursor.fetchall() # returns a list of tuples with dates as strings
-        return [datetime.strptime(date[0], "%Y-%m-%d") for date in data] # convert strings to datetime objects
+        return [datetime.fromisoformat(date[0]) for date in data] # convert strings to datetime objects
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_completion_dates_by_id(habit_id: int, db_name: str = "habit.db") -> list[datetime]:
+    """
+    Fetch all completion dates for a habit identified by its id.
+
+    Args:
+        habit_id (int): The id of the habit.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    
+    Returns:
+        list[datetime]: A list of datetime objects representing the completion dates.
+    """
+    con, cursor = connect_db(db_name)
+    try:
+        cursor.execute(habit_id_completion_dates_query, (habit_id,))
+        return [datetime.fromisoformat(date[0]) for date in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def count_completions_by_id(habit_id: int, db_name: str = "habit.db") -> int:
+    """
+    Returns the number of completions of a habit identified by its id.
+
+    Args:
+        habit_id (int): The id of the habit.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    
+    Returns:
+        int: The number of completions of the habit.
+    """
+    con, cursor = connect_db(db_name)
+    try:
+        cursor.execute(habit_id_count_completions_query, (habit_id,))
+        return cursor.fetchone()[0]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_habit_id_and_periodicity(habit_name: str, db_name: str = "habit.db") -> tuple[int, str] | None:
+    """
+    Resolves a habit name to the id and periodicity of the habit.
+
+    Args:
+        habit_name (str): The name of the habit.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    
+    Returns:
+        tuple[int, str] | None: The id and periodicity of the habit, None if the habit does not exist.
+    """
+    con, cursor = connect_db(db_name)
+    try:
+        cursor.execute(habit_id_periodicity_query, (habit_name,))
+        return cursor.fetchone()
     except sqlite3.Error as e:
         print(f"database error: {e}")
     finally:
@@ -210,14 +378,10 @@ def calculate_weekly_streak(dates: list) -> int:
     current_streak = 1
 
     for i in range(1, len(dates)):
-        prev_year, prev_week, _ = dates[i - 1].isocalendar()
-        current_year, current_week, _ = dates[i].isocalendar()
-        if current_year == prev_year and current_week == prev_week: 
+        if is_same_week(dates[i - 1], dates[i]):
             # should not happen anymore with the new completion_week_exists function, but keep to be safe
             continue
-        elif current_year == prev_year and current_week == prev_week + 1:
-            current_streak += 1
-        elif current_year == prev_year + 1 and prev_week == 52 and current_week == 1:
+        elif is_next_week(dates[i - 1], dates[i]):
             current_streak += 1
         else:
             longest_streak = max(longest_streak, current_streak)
@@ -225,6 +389,101 @@ def calculate_weekly_streak(dates: list) -> int:
 
     return max(longest_streak, current_streak)
 
+def is_same_week(previous: date, current: date) -> bool:
+    """
+    Checks if two dates are in the same ISO week.
+
+    Args:
+        previous (date): The first date.
+        current (date): The second date.
+
+    Returns:
+        bool: True if both dates are in the same week, False otherwise.
+    """
+    return previous.isocalendar()[:2] == current.isocalendar()[:2]
+
+def is_next_week(previous: date, current: date) -> bool:
+    """
+    Checks if a date is in the ISO week following the week of another date, as weekly streaks count them.
+
+    Args:
+        previous (date): The earlier date.
+        current (date): The later date.
+
+    Returns:
+        bool: True if the week of `current` follows the week of `previous`, False otherwise.
+    """
+    prev_year, prev_week, _ = previous.isocalendar()
+    current_year, current_week, _ = current.isocalendar()
+    if current_year == prev_year:
+        return current_week == prev_week + 1
+    return current_year == prev_year + 1 and prev_week == 52 and current_week == 1
+
+def date_bounds(start: date | None = None, end: date | None = None) -> tuple[str, str]:
+    """
+    Returns the bounds of a date range as the ISO strings compared by the 'BETWEEN ? AND ?' queries,
+    open bounds being the first and last representable dates.
+
+    Args:
+        start (date | None, optional): The first date of the range. Defaults to no lower bound.
+        end (date | None, optional): The last date of the range. Defaults to no upper bound.
+
+    Returns:
+        tuple[str, str]: The first and last date of the range.
+    """
+    return (start or date.min).isoformat(), (end or date.max).isoformat()
+
+def calculate_completion_ratio(periodicity: str, creation_date: date, completions: int, today: date) -> float:
+    """
+    Calculate the completion ratio of a habit, i.e. its number of completions divided by the number of
+    periods (days or weeks) elapsed since its creation.
+
+    Args:
+        periodicity (str): The periodicity of the habit ('daily' or 'weekly').
+        creation_date (date): The date the habit was created.
+        completions (int): The number of completions of the habit.
+        today (date): The date the ratio is computed for.
+
+    Returns:
+        float: The completion ratio of the habit.
+    """
+    if periodicity == "daily":
+        habit_length = (today - creation_date).days + 1
+    else:
+        habit_length = ((today - creation_date).days // 7) + 1
+    return completions / habit_length if habit_length > 0 else 0
+
+def get_compact_store(db_name: str = "habit.db"):
+    """
+    Returns the compact completion storage enabled on the database, if any.
+    The interval storage is preferred over the bitmap storage when both are enabled.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        module | None: The `interval_store` or `bitmap_store` module, None if no compact storage is enabled.
+    """
+    if interval_store.is_enabled(db_name):
+        return interval_store
+    if bitmap_store.is_enabled(db_name):
+        return bitmap_store
+    return None
+
+def fetch_stored_completion_counts(db_name: str = "habit.db") -> dict[int, int] | None:
+    """
+    Returns the number of completions of every habit from the compact completion storage (intervals or bitmaps),
+    when one of them is enabled.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        dict[int, int] | None: The number of completions by habit id, None if no compact storage is enabled.
+    """
+    store = get_compact_store(db_name)
+    return store.count_completions_by_habit(db_name) if store else None
+
 def get_habit_longest_streak(habit_name: str, db_name: str = "habit.db") -> int:
     """
     Main function to get the longest streak for a selected habit, either daily or weekly based on the habit periodicity.
@@ -236,11 +495,41 @@ def get_habit_longest_streak(habit_name: str, db_name: str = "habit.db") -> int:
     Returns:
         int: The longest streak of completions ('daily' or 'weekly') for the selected habit.
     """
-    periodicity = fetch_habit_periodicity(habit_name, db_name)
-    if not periodicity:
+    habit = fetch_habit_id_and_periodicity(habit_name, db_name)
+    if not habit:
         return 0
+    return get_habit_longest_streak_by_id(*habit, db_name)
+
+def get_habit_longest_streak_by_id(habit_id: int, periodicity: str, db_name: str = "habit.db") -> int:
+    """
+    Get the longest streak of a habit already resolved to its id and periodicity.
+    
+    Args:
+        habit_id (int): The id of the habit.
+        periodicity (str): The periodicity of the habit ('daily' or 'weekly').
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        int: The longest streak of completions ('daily' or 'weekly') for the habit.
+    """
+    store = get_compact_store(db_name) if periodicity == "daily" else None
+    if store:
+        return store.longest_streak_by_id(habit_id, db_name)
+    return calculate_habit_longest_streak(habit_id, periodicity, db_name)
+
+def calculate_habit_longest_streak(habit_id: int, periodicity: str, db_name: str = "habit.db") -> int:
+    """
+    Calculate the longest streak of a habit from its completion dates.
     
-    dates = fetch_habit_completion_dates(habit_name, db_name)
+    Args:
+        habit_id (int): The id of the habit.
+        periodicity (str): The periodicity of the habit ('daily' or 'weekly').
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        int: The longest streak of completions ('daily' or 'weekly') for the habit.
+    """
+    dates = fetch_completion_dates_by_id(habit_id, db_name)
     if not dates:
         return 0
     
@@ -262,12 +551,19 @@ def get_habit_with_longest_daily_streak(db_name: str = "habit.db") -> list[str,
     Returns:
         list[str, int]: A list containing the habit name and the longest daily streak.
     """
-    habits = fetch_all_habits(db_name)
+    store = get_compact_store(db_name)
+    if store is interval_store:
+        return interval_store.get_habit_with_longest_daily_streak(db_name)
+
+    habits = fetch_all_habits_with_id(db_name)
     longest_daily_streak = ("", 0)
     
-    for habit_name, periodicity, _ in habits:
+    for habit_id, habit_name, periodicity, _ in habits:
         if periodicity == "daily":
-            streak = get_habit_longest_streak(habit_name, db_name)
+            if store:
+                streak = store.longest_streak_by_id(habit_id, db_name)
+            else:
+                streak = calculate_habit_longest_streak(habit_id, periodicity, db_name)
             if streak > longest_daily_streak[1]:
                 longest_daily_streak = (habit_name, streak)
     
@@ -283,12 +579,12 @@ def get_habit_with_longest_weekly_streak(db_name: str = "habit.db") -> list[str,
     Returns:
         list[str, int]: A list containing the habit name and the longest weekly streak.
     """
-    habits = fetch_all_habits(db_name)
+    habits = fetch_all_habits_with_id(db_name)
     longest_weekly_streak = ("", 0)
     
-    for habit_name, periodicity, _ in habits:
+    for habit_id, habit_name, periodicity, _ in habits:
         if periodicity == "weekly":
-            streak = get_habit_longest_streak(habit_name, db_name)
+            streak = calculate_habit_longest_streak(habit_id, periodicity, db_name)
             if streak > longest_weekly_streak[1]:
                 longest_weekly_streak = (habit_name, streak)
     return longest_weekly_streak
@@ -304,15 +600,17 @@ def get_daily_habits_completion_ratio(db_name: str = "habit.db") -> list[tuple[s
     Returns:
         list[str, float]: A list of tuples containing the habit name and the completion ratio.
     """
-    habits = fetch_daily_habits(db_name)
+    habits = fetch_daily_habits_with_id(db_name)
     completion_ratios = []
+    completion_counts = fetch_stored_completion_counts(db_name)
 
-    for habit, _, creation_date in habits:
-        creation_date = datetime.strptime(creation_date, "%Y-%m-%d")
-        today = date.today()
-        habit_length = (today - creation_date.date()).days +1
-        completion_occurences = len(fetch_habit_completion_dates(habit, db_name))
-        completion_ratio = completion_occurences / habit_length if habit_length > 0 else 0
+    for habit_id, habit, periodicity, creation_date in habits:
+        creation_date = date.fromisoformat(creation_date)
+        if completion_counts is not None:
+            completion_occurences = completion_counts.get(habit_id, 0)
+        else:
+            completion_occurences = count_completions_by_id(habit_id, db_name)
+        completion_ratio = calculate_completion_ratio(periodicity, creation_date, completion_occurences, date.today())
         completion_ratios.append((habit, completion_ratio))
     return completion_ratios
 
@@ -327,14 +625,16 @@ def get_weekly_habits_completion_ratio(db_name: str = "habit.db") -> list[tuple[
     Returns:
         list[str, float]: A list of tuples containing the habit name and the completion ratio.
     """
-    habits = fetch_weekly_habits(db_name)
+    habits = fetch_weekly_habits_with_id(db_name)
     completion_ratios = []
+    completion_counts = fetch_stored_completion_counts(db_name)
 
-    for habit, _, creation_date in habits:
-        creation_date = datetime.strptime(creation_date, "%Y-%m-%d")
-        today = datetime.now()
-        habit_length = ((today - creation_date).days // 7) +1
-        completion_occurences = len(fetch_habit_completion_dates(habit, db_name))
-        completion_ratio = completion_occurences / habit_length if habit_length > 0 else 0
+    for habit_id, habit, periodicity, creation_date in habits:
+        creation_date = date.fromisoformat(creation_date)
+        if completion_counts is not None:
+            completion_occurences = completion_counts.get(habit_id, 0)
+        else:
+            completion_occurences = count_completions_by_id(habit_id, db_name)
+        completion_ratio = calculate_completion_ratio(periodicity, creation_date, completion_occurences, date.today())
         completion_ratios.append((habit, completion_ratio))
     return completion_ratios
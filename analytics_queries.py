@@ -1,20 +1,54 @@
 all_habits_query = """
-    SELECT * 
+    SELECT habit, periodicity, creation_date 
+    FROM habits 
+    ORDER BY periodicity ASC, creation_date ASC, habit ASC
+    """ 
+all_habits_with_id_query = """
+    SELECT id, habit, periodicity, creation_date 
     FROM habits 
     ORDER BY periodicity ASC, creation_date ASC, habit ASC
     """ 
 daily_habits_query = """
-    SELECT * 
+    SELECT habit, periodicity, creation_date 
+    FROM habits 
+    WHERE periodicity = 'daily' 
+    ORDER BY habit ASC
+    """
+daily_habits_with_id_query = """
+    SELECT id, habit, periodicity, creation_date 
     FROM habits 
     WHERE periodicity = 'daily' 
     ORDER BY habit ASC
     """
 weekly_habits_query = """
-    SELECT * 
+    SELECT habit, periodicity, creation_date 
+    FROM habits 
+    WHERE periodicity = 'weekly' 
+    ORDER BY habit ASC
+    """
+weekly_habits_with_id_query = """
+    SELECT id, habit, periodicity, creation_date 
     FROM habits 
     WHERE periodicity = 'weekly' 
     ORDER BY habit ASC
     """
+all_habits_as_of_query = """
+    SELECT habit, periodicity, creation_date
+    FROM habits
+    WHERE creation_date <= ?
+    ORDER BY periodicity ASC, creation_date ASC, habit ASC
+    """
+periodicity_habits_as_of_query = """
+    SELECT habit, periodicity, creation_date
+    FROM habits
+    WHERE periodicity = ? AND creation_date <= ?
+    ORDER BY habit ASC
+    """
+habit_names_query = """
+    SELECT habit
+    FROM habits
+    ORDER BY habit ASC
+    """
 count_habits_query = """
     SELECT COUNT(*) 
     FROM habits
@@ -33,12 +67,186 @@ count_weekly_habits_query = """
 habit_completion_dates_query = """
     SELECT completion_date
     FROM completions
-    WHERE habit = ?
+    WHERE habit_id = (SELECT id FROM habits WHERE habit = ?)
+    ORDER BY completion_date
+    """
+habit_completion_dates_between_query = """
+    SELECT completion_date
+    FROM completions
+    WHERE habit_id = (SELECT id FROM habits WHERE habit = ?) AND completion_date BETWEEN ? AND ?
+    ORDER BY completion_date
+    """
+habit_count_completions_between_query = """
+    SELECT COUNT(*)
+    FROM completions
+    WHERE habit_id = (SELECT id FROM habits WHERE habit = ?) AND completion_date BETWEEN ? AND ?
+    """
+habit_id_completion_dates_query = """
+    SELECT completion_date
+    FROM completions
+    WHERE habit_id = ?
     ORDER BY completion_date
     """
+habit_id_count_completions_query = """
+    SELECT COUNT(*)
+    FROM completions
+    WHERE habit_id = ?
+    """
 
 habit_periodicity_query = """
     SELECT periodicity
     FROM habits
     WHERE habit = ?
-    """
\ No newline at end of file
+    """
+habit_id_periodicity_query = """
+    SELECT id, periodicity
+    FROM habits
+    WHERE habit = ?
+    """
+
+# {placeholders} is filled with one "?" per habit of the chunk
+chunk_completion_dates_query = """
+    SELECT habit_id, completion_date
+    FROM completions
+    WHERE habit_id IN ({placeholders})
+    ORDER BY habit_id, completion_date
+    """
+
+# every habit created by the end date followed by its completions between the start and end dates in chronological
+# order, streamed by the report engine: the bounds are a range of the (habit_id, completion_date) index
+report_stream_query = """
+    SELECT h.id, h.habit, h.periodicity, h.creation_date, c.completion_date
+    FROM habits h
+    LEFT JOIN completions c ON c.habit_id = h.id AND c.completion_date BETWEEN ? AND ?
+    WHERE h.creation_date <= ?
+    ORDER BY h.id, c.completion_date
+    """
+
+habit_details_query = """
+    SELECT id, periodicity, creation_date
+    FROM habits
+    WHERE habit = ?
+    """
+habit_by_id_query = """
+    SELECT id, habit, periodicity, creation_date
+    FROM habits
+    WHERE id = ?
+    """
+habit_by_name_query = """
+    SELECT id, habit, periodicity, creation_date
+    FROM habits
+    WHERE habit = ?
+    """
+habit_id_completion_dates_until_query = """
+    SELECT completion_date
+    FROM completions
+    WHERE habit_id = ? AND completion_date <= ?
+    ORDER BY completion_date
+    """
+
+# number of periods (days or weeks) of the habit h elapsed from its creation to the julian day p.today included,
+# the denominator of the completion ratios, as in analytics.calculate_completion_ratio
+elapsed_periods_sql = """CASE
+                WHEN p.today < julianday(h.creation_date) THEN 0
+                WHEN h.periodicity = 'daily' THEN CAST(p.today - julianday(h.creation_date) AS INTEGER) + 1
+                ELSE CAST((p.today - julianday(h.creation_date)) / 7 AS INTEGER) + 1
+            END"""
+# completion ratio of the habit h on the julian day p.today: its completions over its elapsed periods
+habit_completion_ratio_sql = f"""COALESCE(
+            (SELECT COUNT(*) FROM completions c WHERE c.habit_id = h.id) * 1.0 / NULLIF({elapsed_periods_sql}, 0)
+        , 0)"""
+
+# completion ratio of every habit of a periodicity on a date, in the order of the habit listings:
+# CROSS JOIN keeps habits as the outer loop, read in order from idx_habits_periodicity_habit
+habit_completion_ratios_query = f"""
+    WITH params AS (SELECT julianday(?) AS today)
+    SELECT h.habit, {habit_completion_ratio_sql}
+    FROM habits h
+    CROSS JOIN params p
+    WHERE h.periodicity = ?
+    ORDER BY h.habit
+    """
+
+# aggregate completion ratio of every group: completions of its habits over the periods elapsed since their creation
+group_completion_ratio_query = f"""
+    WITH params AS (SELECT julianday(?) AS today),
+    member_habits AS (
+        SELECT m.group_id, COUNT(c.habit_id) AS completions,
+            {elapsed_periods_sql} AS periods
+        FROM habit_group_members m
+        CROSS JOIN habits h ON h.id = m.habit_id
+        CROSS JOIN params p
+        LEFT JOIN completions c ON c.habit_id = h.id
+        GROUP BY m.group_id, m.habit_id
+    )
+    SELECT g.name, COALESCE(SUM(mh.completions) * 1.0 / NULLIF(SUM(mh.periods), 0), 0)
+    FROM habit_groups g
+    LEFT JOIN member_habits mh ON mh.group_id = g.id
+    GROUP BY g.name
+    ORDER BY g.name
+    """
+# best streak of every group, with the habit holding it: consecutive periods share the same
+# difference between their number and their rank (gaps and islands)
+group_best_streak_query = """
+    WITH periods AS (
+        SELECT DISTINCT c.habit_id, CASE h.periodicity
+            WHEN 'daily' THEN CAST(julianday(c.completion_date) AS INTEGER)
+            ELSE CAST((julianday(c.completion_date) - (CAST(strftime('%w', c.completion_date) AS INTEGER) + 6) % 7) / 7 AS INTEGER)
+        END AS period
+        FROM habits h
+        JOIN completions c ON c.habit_id = h.id
+        WHERE h.periodicity = ? AND h.id IN (SELECT habit_id FROM habit_group_members)
+    ),
+    islands AS (
+        SELECT habit_id, period - ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY period) AS island
+        FROM periods
+    ),
+    streaks AS (
+        SELECT habit_id, MAX(length) AS streak
+        FROM (SELECT habit_id, COUNT(*) AS length FROM islands GROUP BY habit_id, island)
+        GROUP BY habit_id
+    ),
+    ranked AS (
+        SELECT g.name, h.habit, s.streak,
+            ROW_NUMBER() OVER (PARTITION BY g.id ORDER BY s.streak DESC, h.creation_date, h.habit) AS rank
+        FROM streaks s
+        JOIN habits h ON h.id = s.habit_id
+        JOIN habit_group_members m ON m.habit_id = s.habit_id
+        JOIN habit_groups g ON g.id = m.group_id
+    )
+    SELECT name, habit, streak
+    FROM ranked
+    WHERE rank = 1
+    ORDER BY name
+    """
+# share of the daily habits of a group (created by then) completed on every day of a range
+group_daily_completion_rate_query = """
+    WITH RECURSIVE members AS (
+        SELECT h.id, h.creation_date
+        FROM habit_group_members m
+        JOIN habits h ON h.id = m.habit_id
+        WHERE m.group_id = (SELECT id FROM habit_groups WHERE name = ?) AND h.periodicity = 'daily'
+    ),
+    days(day) AS (
+        SELECT date(?)
+        UNION ALL
+        SELECT date(day, '+1 day') FROM days WHERE day < date(?)
+    )
+    SELECT d.day, COALESCE(COUNT(c.id) * 1.0 / NULLIF(COUNT(mb.id), 0), 0)
+    FROM days d
+    LEFT JOIN members mb ON mb.creation_date <= d.day
+    LEFT JOIN completions c ON c.habit_id = mb.id AND c.completion_date = d.day
+    GROUP BY d.day
+    ORDER BY d.day
+    """
+# one page of the habits of the given periodicities ranked by completion ratio, best first if the sign is 1 and
+# worst first if it is -1: SQLite keeps only LIMIT + OFFSET rows in its sorter
+ranked_completion_ratio_query = f"""
+    WITH params AS (SELECT julianday(?) AS today)
+    SELECT h.habit, {habit_completion_ratio_sql} AS ratio
+    FROM habits h
+    JOIN params p
+    WHERE h.periodicity IN (?, ?)
+    ORDER BY ratio * ? DESC, h.habit
+    LIMIT ? OFFSET ?
+    """
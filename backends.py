@@ -0,0 +1,125 @@
+"""
+Storage backends of the databases. Every function of the app takes a `db_name` and opens its own connection
+with `connect`, which picks the backend from the name:
+
+- a file name (e.g. "habit.db") is a SQLite database file;
+- a name starting with "memory:" (e.g. "memory:scratch") is a SQLite database kept in memory and shared by every
+  connection of the process opened with the same name, until it is dropped with `drop_db`.
+
+In-memory databases avoid any disk I/O, for tests and what-if analytics on a copy of a database (`clone_db`).
+Other backends can be added with `register_backend`.
+"""
+import os
+import sqlite3
+from pathlib import Path
+from urllib.parse import quote
+
+MEMORY_PREFIX = "memory:"
+
+class FileBackend:
+    """SQLite database files."""
+
+    # the databases outlive the process, and can be opened by other processes
+    persistent = True
+
+    def connect(self, db_name: str, read_only: bool = False) -> sqlite3.Connection:
+        """Opens a connection to a database file, in read-only mode if asked."""
+        if read_only:
+            return sqlite3.connect(f"{Path(db_name).resolve().as_uri()}?mode=ro", uri=True)
+        return sqlite3.connect(db_name)
+
+    def drop(self, db_name: str) -> None:
+        """Deletes a database file."""
+        if os.path.exists(db_name):
+            os.remove(db_name)
+
+class MemoryBackend:
+    """
+    In-memory SQLite databases shared by the connections of the process, through SQLite's shared cache.
+    An in-memory database disappears with its last connection: the backend keeps one connection open per
+    database until it is dropped, so that the connections opened and closed by every call see the same data.
+    """
+
+    persistent = False
+
+    def __init__(self) -> None:
+        self._keepers = {}
+
+    def uri(self, db_name: str) -> str:
+        """Returns the URI of the shared in-memory database of a name."""
+        return f"file:{quote(db_name[len(MEMORY_PREFIX):])}?mode=memory&cache=shared"
+
+    def connect(self, db_name: str, read_only: bool = False) -> sqlite3.Connection:
+        """Opens a connection to an in-memory database, created empty on its first connection."""
+        if db_name not in self._keepers:
+            self._keepers[db_name] = sqlite3.connect(self.uri(db_name), uri=True, check_same_thread=False)
+        con = sqlite3.connect(self.uri(db_name), uri=True)
+        if read_only:
+            con.execute("PRAGMA query_only = ON")
+        return con
+
+    def drop(self, db_name: str) -> None:
+        """Frees an in-memory database once its remaining connections are closed."""
+        keeper = self._keepers.pop(db_name, None)
+        if keeper is not None:
+            keeper.close()
+
+_backends = {MEMORY_PREFIX: MemoryBackend()}
+_default_backend = FileBackend()
+
+def register_backend(prefix: str, backend) -> None:
+    """
+    Registers a backend for the database names starting with a prefix.
+
+    Args:
+        prefix (str): The prefix of the database names, e.g. "memory:".
+        backend: An object with a `persistent` attribute and `connect(db_name, read_only)` and `drop(db_name)`
+            methods, like `FileBackend`.
+    """
+    _backends[prefix] = backend
+
+def backend_for(db_name: str):
+    """Returns the backend of a database name, `FileBackend` if no registered prefix matches."""
+    for prefix, backend in _backends.items():
+        if db_name.startswith(prefix):
+            return backend
+    return _default_backend
+
+def connect(db_name: str, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Opens a connection to a database with its backend.
+
+    Args:
+        db_name (str): The name of the database, e.g. "habit.db" or "memory:scratch".
+        read_only (bool, optional): Open the database in read-only mode. Defaults to False.
+
+    Returns:
+        sqlite3.Connection: A connection to the database.
+    """
+    return backend_for(db_name).connect(db_name, read_only)
+
+def is_persistent(db_name: str) -> bool:
+    """Returns whether a database is stored in files, which other processes and attached databases can open."""
+    return backend_for(db_name).persistent
+
+def drop_db(db_name: str) -> None:
+    """Deletes a database: removes a database file, or frees an in-memory database."""
+    backend_for(db_name).drop(db_name)
+
+def clone_db(source: str, target: str) -> None:
+    """
+    Copies a database into another one with SQLite's online backup, e.g. a database file into an in-memory
+    database to run what-if analytics without touching the file, or a template database into a fresh test database.
+    The target is overwritten.
+
+    Args:
+        source (str): The name of the database copied.
+        target (str): The name of the copy.
+    """
+    source_con = connect(source)
+    target_con = connect(target)
+    try:
+        source_con.backup(target_con)
+    finally:
+        target_con.close()
+        source_con.close()
@@ -0,0 +1,32 @@
+"""
+Benchmark of the habit name search over a large number of habits, for prefix, substring and fuzzy queries.
+
+Run from the repository root with:
+    python -m benchmarks.bench_habit_search --habits 10000 --repeat 100
+"""
+import argparse
+import time
+from habit_search import HabitSearchIndex
+
+QUERIES = ("habit n", "number 99", "nmber 42", "umber 123")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = HabitSearchIndex(f"habit number {i}" for i in range(args.habits))
+    print(f"index of {len(index)} habits: {time.perf_counter() - start:8.3f}s")
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            index.search(query)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        candidates = len(index.fuzzy_scores(query)[0])
+        print(f"{query!r:12} {elapsed * 1000:8.3f}ms per search ({candidates} fuzzy candidates)")
+
+if __name__ == "__main__":
+    main()
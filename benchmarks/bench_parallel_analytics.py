@@ -0,0 +1,46 @@
+"""
+Benchmark of the parallel analytics mode against the sequential analytics functions.
+
+Run from the repository root with:
+    python -m benchmarks.bench_parallel_analytics --habits 20000 --days 365
+"""
+import argparse
+import os
+import tempfile
+import time
+import analytics
+import parallel_analytics
+from synthetic_data import populate_synthetic_db
+
+def run_sequential(db_name: str) -> None:
+    """Runs the sequential analytics functions covered by the parallel mode."""
+    analytics.get_habit_with_longest_daily_streak(db_name)
+    analytics.get_habit_with_longest_weekly_streak(db_name)
+    analytics.get_daily_habits_completion_ratio(db_name)
+    analytics.get_weekly_habits_completion_ratio(db_name)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--chunk-size", type=int, default=parallel_analytics.DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "bench_habit.db")
+        populate_synthetic_db(db_name, habits=args.habits, days=args.days)
+
+        start = time.perf_counter()
+        run_sequential(db_name)
+        sequential = time.perf_counter() - start
+        print(f"sequential: {sequential:8.3f}s")
+
+        for workers in sorted(set(args.workers)):
+            start = time.perf_counter()
+            parallel_analytics.get_habits_analytics_parallel(db_name, workers=workers, chunk_size=args.chunk_size)
+            elapsed = time.perf_counter() - start
+            print(f"parallel, {workers:2d} worker(s): {elapsed:8.3f}s (speedup x{sequential / elapsed:.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Benchmark of the point-in-time reports regenerated over many historical dates, against a full report that reads
+the whole history whatever the date.
+
+Run from the repository root with:
+    python -m benchmarks.bench_point_in_time --habits 2000 --days 365 --dates 300
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+import point_in_time
+import report
+from synthetic_data import populate_synthetic_db
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--dates", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "bench_habit.db")
+        populate_synthetic_db(db_name, habits=args.habits, days=args.days)
+        # the historical dates, evenly spread over the history up to today
+        step = max(args.days // args.dates, 1)
+        dates = [date.today() - timedelta(days=offset) for offset in range(0, args.days, step)][:args.dates]
+
+        start = time.perf_counter()
+        report.build_report(db_name)
+        full = time.perf_counter() - start
+        print(f"full report:           {full:8.3f}s")
+
+        start = time.perf_counter()
+        point_in_time.build_historical_reports(dates, db_name=db_name)
+        elapsed = time.perf_counter() - start
+        print(f"{len(dates)} as-of reports: {elapsed:8.3f}s "
+              f"({elapsed / len(dates):.3f}s per report, x{elapsed / len(dates) / full:.2f} a full report)")
+
+if __name__ == "__main__":
+    main()
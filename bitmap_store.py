@@ -0,0 +1,310 @@
+import sqlite3
+from datetime import date, timedelta
+from itertools import groupby
+import db_handler as db
+
+# 366 days rounded up to whole bytes
+BITMAP_BYTES = 46
+
+def day_index(day: date) -> int:
+    """
+    Returns the position of a day in the bitmap of its year (0 for January 1st).
+
+    Args:
+        day (date): The day.
+
+    Returns:
+        int: The index of the day's bit.
+    """
+    return day.timetuple().tm_yday - 1
+
+def build_bitmap(dates: list[date]) -> bytes:
+    """
+    Builds the bitmap of a habit-year from its completion dates.
+
+    Args:
+        dates (list[date]): The completion dates, all in the same year.
+
+    Returns:
+        bytes: The 46 byte bitmap, bit i (little-endian) set if the habit was completed on day i of the year.
+    """
+    bits = 0
+    for day in dates:
+        bits |= 1 << day_index(day)
+    return bits.to_bytes(BITMAP_BYTES, "little")
+
+def longest_run(bits: int) -> int:
+    """
+    Returns the length of the longest run of consecutive set bits of an integer.
+    Each iteration shortens every run by one bit, so the loop runs as many times as the longest run is long.
+
+    Args:
+        bits (int): The integer to scan.
+
+    Returns:
+        int: The length of the longest run of set bits.
+    """
+    length = 0
+    while bits:
+        bits &= bits >> 1
+        length += 1
+    return length
+
+def bit_update_trigger(event: str) -> str:
+    """
+    Returns the statement creating the trigger that sets the bit of a completion when it is inserted, or clears it
+    when it is deleted. SQLite has no bitwise operators on blobs, so the byte holding the bit is replaced through
+    the 'bitmap_bytes' table, which maps every byte to its integer value.
+
+    Args:
+        event (str): The event of the trigger, 'INSERT' or 'DELETE'.
+
+    Returns:
+        str: The CREATE TRIGGER statement.
+    """
+    row = "NEW" if event == "INSERT" else "OLD"
+    year = f"CAST(strftime('%Y', {row}.completion_date) AS INTEGER)"
+    day = f"(CAST(strftime('%j', {row}.completion_date) AS INTEGER) - 1)"
+    mask = f"(1 << ({day} % 8))"
+    if event == "INSERT":
+        before = f"""
+            INSERT OR IGNORE INTO completion_bitmaps (habit_id, year, bits)
+            VALUES ({row}.habit_id, {year}, zeroblob({BITMAP_BYTES}));"""
+        new_value, after = f"o.value | {mask}", ""
+    else:
+        # the bitmaps only cover the habit-years with at least one completion
+        before, new_value = "", f"o.value & ~{mask}"
+        after = f"""
+            DELETE FROM completion_bitmaps
+            WHERE habit_id = {row}.habit_id AND year = {year} AND bits = zeroblob({BITMAP_BYTES});"""
+    return f"""
+        CREATE TRIGGER bitmap_{event.lower()}_completion AFTER {event} ON completions
+        BEGIN{before}
+            UPDATE completion_bitmaps
+            SET bits = CAST(substr(bits, 1, {day} / 8) || (
+                SELECT n.byte FROM bitmap_bytes o JOIN bitmap_bytes n ON n.value = {new_value}
+                WHERE o.byte = substr(bits, {day} / 8 + 1, 1)
+            ) || substr(bits, {day} / 8 + 2) AS BLOB)
+            WHERE habit_id = {row}.habit_id AND year = {year};{after}
+        END
+    """
+
+def enable_bitmap_storage(db_name: str = "habit.db") -> None:
+    """
+    Enables the storage of completions as one 366-bit bitmap per habit and year, alongside the 'completions' table.
+    Triggers set the bit of a completion when it is added and clear it when it is removed, in the transaction
+    of the write, so that every writer keeps the bitmaps up to date and reads never rebuild them.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Raises:
+        ValueError: If years of completions are archived: the triggers only see the completions of the main
+            database file, so the bitmaps would miss the archived history.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        if db.has_partitions(cursor):
+            raise ValueError("The bitmap storage cannot be enabled once completions are archived.")
+        cursor.execute("BEGIN")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS bitmap_bytes (
+                byte BLOB PRIMARY KEY,
+                value INTEGER NOT NULL UNIQUE
+            ) WITHOUT ROWID
+        """)
+        cursor.executemany("""
+            INSERT OR IGNORE INTO bitmap_bytes (byte, value) VALUES (?, ?)
+        """, ((bytes([value]), value) for value in range(256)))
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS completion_bitmaps (
+                habit_id INTEGER NOT NULL,
+                year INTEGER NOT NULL,
+                bits BLOB NOT NULL,
+                FOREIGN KEY(habit_id) REFERENCES habits(id) ON DELETE CASCADE,
+                PRIMARY KEY (habit_id, year)
+            ) WITHOUT ROWID
+        """)
+        for event in ("INSERT", "DELETE"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS bitmap_{event.lower()}_completion")
+            cursor.execute(bit_update_trigger(event))
+        # build the bitmaps of the existing completions, one habit-year at a time
+        cursor.execute("DELETE FROM completion_bitmaps")
+        for (habit_id, year), rows in groupby(cursor.execute("""
+            SELECT habit_id, CAST(strftime('%Y', completion_date) AS INTEGER), completion_date
+            FROM completions
+            ORDER BY habit_id, completion_date
+        """).fetchall(), key=lambda row: row[:2]):
+            cursor.execute("""
+                INSERT INTO completion_bitmaps (habit_id, year, bits) VALUES (?, ?, ?)
+            """, (habit_id, year, build_bitmap([date.fromisoformat(row[2]) for row in rows])))
+        con.commit()
+    except sqlite3.Error as e:
+        con.rollback()
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def disable_bitmap_storage(db_name: str = "habit.db") -> None:
+    """
+    Disables the bitmap storage of completions, dropping the bitmaps and their triggers.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("DROP TRIGGER IF EXISTS bitmap_insert_completion")
+        cursor.execute("DROP TRIGGER IF EXISTS bitmap_delete_completion")
+        cursor.execute("DROP TABLE IF EXISTS completion_bitmaps")
+        cursor.execute("DROP TABLE IF EXISTS bitmap_bytes")
+        con.commit()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def is_enabled(db_name: str = "habit.db") -> bool:
+    """
+    Checks if the bitmap storage of completions is enabled.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        bool: True if the completion bitmaps are maintained, False otherwise.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        return db.table_exists(cursor, "completion_bitmaps")
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def bitmaps_by_id(cursor: sqlite3.Cursor, habit_id: int, first_year: int = 1, last_year: int = 9999) -> dict[int, int]:
+    """
+    Reads the completion bitmaps of a habit.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database, which may be read-only.
+        habit_id (int): The id of the habit.
+        first_year (int, optional): The first year to read. Defaults to all years.
+        last_year (int, optional): The last year to read. Defaults to all years.
+
+    Returns:
+        dict[int, int]: The bitmap of every year with at least one completion, as an integer (bit i = day i).
+    """
+    cursor.execute("""
+        SELECT year, bits FROM completion_bitmaps
+        WHERE habit_id = ? AND year BETWEEN ? AND ?
+        ORDER BY year
+    """, (habit_id, first_year, last_year))
+    return {year: int.from_bytes(bits, "little") for year, bits in cursor}
+
+def fetch_bitmaps_by_id(habit_id: int, db_name: str = "habit.db", first_year: int = 1, last_year: int = 9999) -> dict[int, int]:
+    """
+    Fetch the completion bitmaps of a habit.
+
+    Args:
+        habit_id (int): The id of the habit.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        first_year (int, optional): The first year to fetch. Defaults to all years.
+        last_year (int, optional): The last year to fetch. Defaults to all years.
+
+    Returns:
+        dict[int, int]: The bitmap of every year with at least one completion, as an integer (bit i = day i).
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        return bitmaps_by_id(cursor, habit_id, first_year, last_year)
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def count_completions_by_habit(db_name: str = "habit.db") -> dict[int, int]:
+    """
+    Returns the number of completions of every habit, as the popcount of its bitmaps.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        dict[int, int]: The number of completions by habit id, for the habits with at least one completion.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        counts = {}
+        for habit_id, bits in cursor.execute("SELECT habit_id, bits FROM completion_bitmaps"):
+            counts[habit_id] = counts.get(habit_id, 0) + int.from_bytes(bits, "little").bit_count()
+        return counts
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def longest_streak_by_id(habit_id: int, db_name: str = "habit.db") -> int:
+    """
+    Returns the longest daily streak of a habit with a bit-run scan over its bitmaps.
+    The yearly bitmaps are laid out on a single integer indexed by day, so that runs continue across years.
+
+    Args:
+        habit_id (int): The id of the habit.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        int: The longest streak of consecutive days, 0 if the habit has no completion.
+    """
+    bitmaps = fetch_bitmaps_by_id(habit_id, db_name)
+    if not bitmaps:
+        return 0
+    base = date(min(bitmaps), 1, 1).toordinal()
+    bits = 0
+    for year, year_bits in bitmaps.items():
+        bits |= year_bits << (date(year, 1, 1).toordinal() - base)
+    return longest_run(bits)
+
+def week_completed(cursor: sqlite3.Cursor, habit_id: int, day: date) -> bool:
+    """
+    Checks if a habit was completed during the ISO week of a day by masking the 7 bits of the week.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database.
+        habit_id (int): The id of the habit.
+        day (date): The day whose week is checked.
+
+    Returns:
+        bool: True if the habit was completed during the week, False otherwise.
+    """
+    monday = day - timedelta(days=day.weekday())
+    sunday = monday + timedelta(days=6)
+    bitmaps = bitmaps_by_id(cursor, habit_id, monday.year, sunday.year)
+    if monday.year == sunday.year:
+        mask = 0b1111111 << day_index(monday)
+        return bool(bitmaps.get(monday.year, 0) & mask)
+    # the week overlaps two years: mask the end of the first one and the start of the second one
+    days_in_first_year = 7 - day_index(sunday) - 1
+    first_mask = ((1 << days_in_first_year) - 1) << day_index(monday)
+    second_mask = (1 << (day_index(sunday) + 1)) - 1
+    return bool(bitmaps.get(monday.year, 0) & first_mask or bitmaps.get(sunday.year, 0) & second_mask)
+
+def completion_week_exists(habit_id: int, day: date, db_name: str = "habit.db") -> bool:
+    """
+    Checks if a habit was completed during the ISO week of a day by masking the 7 bits of the week.
+
+    Args:
+        habit_id (int): The id of the habit.
+        day (date): The day whose week is checked.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        bool: True if the habit was completed during the week, False otherwise.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        return week_completed(cursor, habit_id, day)
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
@@ -0,0 +1,147 @@
+from datetime import date
+import analytics
+import streak_timeline
+
+# scope of the entries depending on the list of habits only (names, periodicities, creation dates)
+HABITS = "habits"
+# scope of the entries depending on every habit and completion
+ALL = "all"
+
+class CoherentCache:
+    """
+    Cache of analytics results shared safely between processes writing to the same database.
+
+    Before serving an entry, the cache checks `PRAGMA data_version` on a persistent connection. The version changes
+    whenever another connection, in this process or another one, commits to the database. Only then the change log
+    is read from the last seen sequence number, and only the entries depending on the changed habits are dropped:
+    the entries of the changed habits, the HABITS entries if habits were added, removed or renamed, and the ALL entries.
+    """
+
+    def __init__(self, db_name: str = "habit.db") -> None:
+        self.db_name = db_name
+        self.con, self.cursor = analytics.connect_db(db_name)
+        self._data_version = self.cursor.execute("PRAGMA data_version").fetchone()[0]
+        self._seq = self._last_seq()
+        self._entries = {HABITS: {}, ALL: {}}
+        self._habit_entries = {}
+        self._listeners = []
+
+    def __enter__(self) -> "CoherentCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the persistent connection of the cache."""
+        self.con.close()
+
+    def _last_seq(self) -> int:
+        return self.cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+    def subscribe(self, listener) -> None:
+        """
+        Registers a function called with the changes read by `validate`, e.g. to update an index incrementally.
+
+        Args:
+            listener (callable): Called with the list of (seq, operation, habit, new_habit) changes,
+                or with None if the change log was reset and everything must be reloaded.
+        """
+        self._listeners.append(listener)
+
+    def clear(self) -> None:
+        """Drops every entry of the cache."""
+        self._entries = {HABITS: {}, ALL: {}}
+        self._habit_entries = {}
+
+    def validate(self) -> None:
+        """Drops the entries made stale by the changes committed since the last validation."""
+        data_version = self.cursor.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return
+        self._data_version = data_version
+        changes = self.cursor.execute("""
+            SELECT seq, operation, habit, new_habit FROM change_log
+            WHERE seq > ?
+            ORDER BY seq
+        """, (self._seq,)).fetchall()
+
+        if not changes:
+            # the change log is behind the cache if the database file was replaced
+            if self._last_seq() < self._seq:
+                self._seq = self._last_seq()
+                self.clear()
+                for listener in self._listeners:
+                    listener(None)
+            return
+
+        self._seq = changes[-1][0]
+        for _, operation, habit, new_habit in changes:
+            self._habit_entries.pop(habit, None)
+            if new_habit is not None:
+                self._habit_entries.pop(new_habit, None)
+            if operation in ("add_habit", "remove_habit", "rename_habit"):
+                self._entries[HABITS].clear()
+        self._entries[ALL].clear()
+        for listener in self._listeners:
+            listener(changes)
+
+    def get(self, key, compute, habit: str | None = None, scope: str = ALL):
+        """
+        Returns a cached value, computing it if it is missing or stale.
+
+        Args:
+            key (hashable): The key of the value within its scope.
+            compute (callable): Computes the value when it is not cached.
+            habit (str | None, optional): The habit the value depends on. Defaults to None.
+            scope (str, optional): For values not depending on a single habit, HABITS or ALL. Defaults to ALL.
+
+        Returns:
+            The cached or computed value.
+        """
+        self.validate()
+        entries = self._habit_entries.setdefault(habit, {}) if habit is not None else self._entries[scope]
+        if key not in entries:
+            entries[key] = compute()
+        return entries[key]
+
+    def fetch_all_habits(self) -> list[tuple]:
+        """Cached `analytics.fetch_all_habits`."""
+        return self.get("fetch_all_habits", lambda: analytics.fetch_all_habits(self.db_name), scope=HABITS)
+
+    def fetch_habit_names(self) -> list[str]:
+        """Cached `analytics.fetch_habit_names`."""
+        return self.get("fetch_habit_names", lambda: analytics.fetch_habit_names(self.db_name), scope=HABITS)
+
+    def fetch_habit_completion_dates(self, habit: str) -> list:
+        """Cached `analytics.fetch_habit_completion_dates`."""
+        return self.get("completion_dates", lambda: analytics.fetch_habit_completion_dates(habit, self.db_name), habit=habit)
+
+    def get_habit_longest_streak(self, habit: str) -> int:
+        """Cached `analytics.get_habit_longest_streak`."""
+        return self.get("longest_streak", lambda: analytics.get_habit_longest_streak(habit, self.db_name), habit=habit)
+
+    def get_habit_with_longest_daily_streak(self) -> tuple[str, int]:
+        """Cached `analytics.get_habit_with_longest_daily_streak`."""
+        return self.get("longest_daily_streak", lambda: analytics.get_habit_with_longest_daily_streak(self.db_name))
+
+    def get_habit_with_longest_weekly_streak(self) -> tuple[str, int]:
+        """Cached `analytics.get_habit_with_longest_weekly_streak`."""
+        return self.get("longest_weekly_streak", lambda: analytics.get_habit_with_longest_weekly_streak(self.db_name))
+
+    def get_daily_habits_completion_ratio(self) -> list[tuple[str, float]]:
+        """Cached `analytics.get_daily_habits_completion_ratio`, for the current day."""
+        return self.get(("daily_completion_ratio", date.today()), lambda: analytics.get_daily_habits_completion_ratio(self.db_name))
+
+    def get_weekly_habits_completion_ratio(self) -> list[tuple[str, float]]:
+        """Cached `analytics.get_weekly_habits_completion_ratio`, for the current day."""
+        return self.get(("weekly_completion_ratio", date.today()), lambda: analytics.get_weekly_habits_completion_ratio(self.db_name))
+
+    def get_streak_timeline(self, habit: str, start: date | None = None, end: date | None = None) -> list[tuple[date, int, int]]:
+        """Cached `streak_timeline.get_streak_timeline`, kept until the habit changes."""
+        end = end or date.today()
+        return self.get(
+            ("streak_timeline", start, end),
+            lambda: streak_timeline.get_streak_timeline(habit, start, end, self.db_name),
+            habit=habit,
+        )
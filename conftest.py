@@ -0,0 +1,22 @@
+import itertools
+import pytest
+import backends
+import db_handler as db
+
+_test_dbs = itertools.count()
+
+@pytest.fixture(scope="session")
+def template_db():
+    """An initialized in-memory database, created once per test session and cloned by `memory_db`."""
+    db_name = "memory:template"
+    db.initialize_db(db_name)
+    yield db_name
+    backends.drop_db(db_name)
+
+@pytest.fixture
+def memory_db(template_db):
+    """A fresh in-memory database of the current schema for a test, cloned from the template and dropped after it."""
+    db_name = f"memory:test-{next(_test_dbs)}"
+    backends.clone_db(template_db, db_name)
+    yield db_name
+    backends.drop_db(db_name)
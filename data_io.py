@@ -0,0 +1,238 @@
+import csv
+import json
+import sqlite3
+import time
+from datetime import date
+from itertools import islice
+import analytics
+import db_handler as db
+from habit import Habit
+
+# number of rows written per transaction by the imports, and between two progress reports
+CHUNK_SIZE = 10000
+
+# columns of the files of every kind of record
+COLUMNS = {
+    "habits": ("habit", "periodicity", "creation_date"),
+    "completions": ("habit", "completion_date"),
+}
+
+EXPORT_QUERIES = {
+    "habits": """
+        SELECT habit, periodicity, creation_date
+        FROM habits
+        ORDER BY id
+    """,
+    "completions": """
+        SELECT h.habit, c.completion_date
+        FROM completions c
+        JOIN habits h ON h.id = c.habit_id
+        ORDER BY c.id
+    """,
+}
+
+def file_format(path: str) -> str:
+    """
+    Returns the format of a data file from its extension.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        str: 'csv' or 'jsonl'.
+
+    Raises:
+        ValueError: If the extension is neither .csv nor .jsonl.
+    """
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith(".jsonl"):
+        return "jsonl"
+    raise ValueError("Data files must have a .csv or .jsonl extension.")
+
+def read_records(file, fmt: str, columns: tuple[str, ...]):
+    """
+    Streams the records of a data file as tuples of strings, one line at a time.
+    Lines that cannot be parsed are yielded as None.
+
+    Args:
+        file: The file, opened in text mode.
+        fmt (str): The format of the file ('csv' or 'jsonl').
+        columns (tuple[str, ...]): The fields of the records.
+
+    Yields:
+        tuple | None: The values of the fields of every record, None for malformed lines.
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(file):
+            try:
+                yield tuple(row[column] for column in columns)
+            except KeyError:
+                yield None
+    else:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                yield tuple(record[column] for column in columns)
+            except (ValueError, KeyError, TypeError):
+                yield None
+
+def parse_date(text: str) -> date:
+    """
+    Parses a date of a data file, which must be written 'YYYY-MM-DD' like the dates stored in the database:
+    the string comparisons of the queries rely on it, while `date.fromisoformat` also accepts e.g. '20250101'.
+
+    Args:
+        text (str): The date.
+
+    Returns:
+        date: The parsed date.
+
+    Raises:
+        ValueError: If the date is not a valid 'YYYY-MM-DD' date.
+    """
+    parsed = date.fromisoformat(text)
+    if parsed.isoformat() != text:
+        raise ValueError(f"Dates must be written YYYY-MM-DD: {text!r}")
+    return parsed
+
+def validate_habit(record: tuple | None) -> tuple | None:
+    """
+    Validates a habit record: name length, periodicity and 'YYYY-MM-DD' creation date.
+
+    Args:
+        record (tuple | None): The habit name, periodicity and creation date.
+
+    Returns:
+        tuple | None: The parameters of the insert, None if the record is invalid.
+    """
+    if record is None:
+        return None
+    habit, periodicity, creation_date = record
+    try:
+        Habit.validate_name(habit)
+        parse_date(creation_date)
+    except (ValueError, TypeError):
+        return None
+    if periodicity not in ("daily", "weekly"):
+        return None
+    return habit, periodicity, creation_date
+
+def validate_completion(record: tuple | None) -> dict | None:
+    """
+    Validates a completion record and adds the bounds of its week, used to check the weekly uniqueness.
+
+    Args:
+        record (tuple | None): The habit name and completion date.
+
+    Returns:
+        dict | None: The parameters of the insert, None if the record is invalid.
+    """
+    if record is None:
+        return None
+    habit, completion_date = record
+    try:
+        monday, sunday = db.iso_week_bounds(parse_date(completion_date))
+    except (ValueError, TypeError):
+        return None
+    return {"habit": habit, "date": completion_date, "monday": monday.isoformat(), "sunday": sunday.isoformat()}
+
+def print_progress(rows: int, seconds: float) -> None:
+    """Prints the number of rows processed so far and the throughput."""
+    print(f"{rows} rows, {rows / seconds if seconds else 0:.0f} rows/s")
+
+def import_records(path: str, kind: str, db_name: str = "habit.db", chunk_size: int = CHUNK_SIZE, progress=None) -> dict:
+    """
+    Imports habits or completions from a CSV or JSONL file. The file is streamed and written in chunked
+    transactions, so that memory does not depend on the size of the file.
+    Habits whose name is taken are skipped, like completions of unknown habits, completions already recorded
+    and completions of weekly habits already completed during the same week.
+
+    Args:
+        path (str): The path of the file, with a .csv or .jsonl extension.
+        kind (str): The kind of records, 'habits' or 'completions'.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        chunk_size (int, optional): The number of rows per transaction. Defaults to CHUNK_SIZE.
+        progress (callable, optional): Called with the number of rows read and the elapsed seconds after
+            every chunk. Defaults to None.
+
+    Returns:
+        dict: The number of rows read ("rows"), inserted ("inserted"), skipped ("skipped") and rejected by
+            the validation ("invalid"), the elapsed seconds ("seconds") and the throughput ("rows_per_second").
+    """
+    if kind == "habits":
+        query, validate = db.insert_habit_if_absent_query, validate_habit
+    else:
+        query, validate = db.insert_completion_if_absent_query, validate_completion
+    stats = {"rows": 0, "inserted": 0, "skipped": 0, "invalid": 0}
+    start = time.perf_counter()
+    with open(path, newline="", encoding="utf-8") as file:
+        records = read_records(file, file_format(path), COLUMNS[kind])
+        try:
+            con, cursor = db.connect_db(db_name)
+            while chunk := list(islice(records, chunk_size)):
+                params = [param for param in map(validate, chunk) if param is not None]
+                inserted = 0
+                if params:
+                    cursor.executemany(query, params)
+                    con.commit()
+                    inserted = cursor.rowcount
+                stats["rows"] += len(chunk)
+                stats["invalid"] += len(chunk) - len(params)
+                stats["inserted"] += inserted
+                stats["skipped"] += len(params) - inserted
+                if progress:
+                    progress(stats["rows"], time.perf_counter() - start)
+        except sqlite3.Error as e:
+            con.rollback()
+            print(f"database error: {e}")
+        finally:
+            con.close()
+    stats["seconds"] = time.perf_counter() - start
+    stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0
+    return stats
+
+def export_records(path: str, kind: str, db_name: str = "habit.db", chunk_size: int = CHUNK_SIZE, progress=None) -> dict:
+    """
+    Exports habits or completions to a CSV or JSONL file, from a streaming cursor so that memory does not
+    depend on the size of the database. Completions reference their habit by name.
+
+    Args:
+        path (str): The path of the file, with a .csv or .jsonl extension.
+        kind (str): The kind of records, 'habits' or 'completions'.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        chunk_size (int, optional): The number of rows between two progress reports. Defaults to CHUNK_SIZE.
+        progress (callable, optional): Called with the number of rows written and the elapsed seconds every
+            `chunk_size` rows. Defaults to None.
+
+    Returns:
+        dict: The number of rows written ("rows"), the elapsed seconds ("seconds") and the throughput
+            ("rows_per_second").
+    """
+    fmt = file_format(path)
+    columns = COLUMNS[kind]
+    rows = 0
+    start = time.perf_counter()
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        try:
+            con, cursor = analytics.connect_db(db_name, read_only=True)
+            cursor.execute(EXPORT_QUERIES[kind])
+            if fmt == "csv":
+                writer = csv.writer(file)
+                writer.writerow(columns)
+            while chunk := cursor.fetchmany(chunk_size):
+                if fmt == "csv":
+                    writer.writerows(chunk)
+                else:
+                    file.writelines(json.dumps(dict(zip(columns, row))) + "\n" for row in chunk)
+                rows += len(chunk)
+                if progress:
+                    progress(rows, time.perf_counter() - start)
+        except sqlite3.Error as e:
+            print(f"database error: {e}")
+        finally:
+            con.close()
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds else 0}
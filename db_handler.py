@@ -1,33 +1,63 @@
 import sqlite3
 from datetime import date
-from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+import backends
 
 def connect_db(db_name: str = "habit.db") -> sqlite3.Connection: # default value to be removed if not used in pytest & analytics
     """
     Establishes a connection to the SQLite database and enables foreign key constraints.
 
     Args:
-        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        db_name (str, optional): The name of the database file, or of an in-memory database ("memory:<name>").
+            Defaults to "habit.db".
 
     Returns:
         sqlite3.Connection: A connection object to interact with the database.
     """
-    con = sqlite3.connect(db_name)
+    con = backends.connect(db_name)
     con.execute("PRAGMA foreign_keys = ON")
     return con, con.cursor()
 
+change_log_columns = """(
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation TEXT CHECK(operation IN ('add_habit', 'remove_habit', 'rename_habit', 'add_completion', 'remove_completion')) NOT NULL,
+    habit TEXT NOT NULL,
+    periodicity TEXT,
+    change_date TEXT,
+    new_habit TEXT
+)"""
+
+# statuses returned by the conditional writes
+INSERTED = "inserted"
+ALREADY_EXISTS = "already_exists"
+SAME_WEEK_EXISTS = "same_week_exists"
+UNKNOWN_HABIT = "unknown_habit"
+ARCHIVED = "archived"
+REMOVED = "removed"
+
+# version of the database schema, stored in the database with PRAGMA user_version
+SCHEMA_VERSION = 2
+
 def initialize_db(db_name: str) -> None:
     """
-    Creates the 'habits' and 'completions' tables in the SQLite database if they do not already exist.
+    Creates the 'habits', 'completions', 'change_log', 'habit_groups', 'habit_group_members' and 'completion_partitions'
+    tables in the SQLite database if they do not already exist, and migrates databases created with an older schema.
 
     Args:
         db_name (str): The name of the database file to initialize.
     """
     try:
         con, cursor = connect_db(db_name)
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1 and table_exists(cursor, "habits"):
+            migrate_to_habit_id(con, cursor)
+        if version < 2:
+            enable_incremental_vacuum(cursor)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS habits (
-                habit TEXT PRIMARY KEY,
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                habit TEXT NOT NULL UNIQUE,
                 periodicity TEXT CHECK(periodicity IN ('daily', 'weekly')) NOT NULL,
                 creation_date TEXT NOT NULL
             )
@@ -35,19 +65,267 @@ def initialize_db(db_name: str) -> None:
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS completions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                habit TEXT NOT NULL,
+                habit_id INTEGER NOT NULL,
                 completion_date TEXT NOT NULL,
-                FOREIGN KEY(habit) REFERENCES habits(habit) ON DELETE CASCADE,
-                UNIQUE (habit, completion_date)
+                FOREIGN KEY(habit_id) REFERENCES habits(id) ON DELETE CASCADE,
+                UNIQUE (habit_id, completion_date)
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS change_log {change_log_columns}
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS habit_groups (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE
             )
         """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS habit_group_members (
+                group_id INTEGER NOT NULL,
+                habit_id INTEGER NOT NULL,
+                FOREIGN KEY(group_id) REFERENCES habit_groups(id) ON DELETE CASCADE,
+                FOREIGN KEY(habit_id) REFERENCES habits(id) ON DELETE CASCADE,
+                PRIMARY KEY (group_id, habit_id)
+            ) WITHOUT ROWID
+        """)
+        # ISO years whose completions were moved to a read-only database file by partitions.archive_year
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS completion_partitions (
+                year INTEGER PRIMARY KEY,
+                file TEXT NOT NULL UNIQUE,
+                first_day TEXT NOT NULL,
+                last_day TEXT NOT NULL,
+                completions INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS reject_archived_completion BEFORE INSERT ON completions
+            WHEN EXISTS (
+                SELECT 1 FROM completion_partitions WHERE NEW.completion_date BETWEEN first_day AND last_day
+            )
+            BEGIN
+                SELECT RAISE(ABORT, 'completions of archived years are read-only');
+            END
+        """)
+        create_indexes(cursor)
+        create_change_log_triggers(cursor)
+        seed_change_log(cursor)
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         con.commit()
     except sqlite3.Error as e:
         print(f"database error: {e}")
     finally:
         con.close()
 
-def add_habit(habit: str, periodicity: str, creation_date: date, db_name: str) -> None:
+def table_exists(cursor: sqlite3.Cursor, table: str) -> bool:
+    """
+    Checks if a table exists in the database.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database.
+        table (str): The name of the table.
+
+    Returns:
+        bool: True if the table exists, False otherwise.
+    """
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?
+    """, (table,))
+    return cursor.fetchone() is not None
+
+def has_partitions(cursor: sqlite3.Cursor) -> bool:
+    """
+    Checks if years of completions are archived to partition files.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database.
+
+    Returns:
+        bool: True if at least one year is archived, False otherwise.
+    """
+    return cursor.execute("SELECT 1 FROM completion_partitions LIMIT 1").fetchone() is not None
+
+def enable_incremental_vacuum(cursor: sqlite3.Cursor) -> None:
+    """
+    Switches the database to incremental auto-vacuum, so that the pages freed by removals can be returned
+    to the file system in small steps (see maintenance.py) instead of with a full VACUUM.
+    The mode of a new database is set before its tables are created; an existing database is rebuilt once
+    with VACUUM, which must run outside of any transaction.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database, outside of any transaction.
+    """
+    if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    if cursor.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone() is not None:
+        cursor.execute("VACUUM")
+
+def migrate_to_habit_id(con: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
+    """
+    Migrates a database where completions reference habits by name to the schema where they reference
+    an integer habit id, with the name kept as a unique (indexed) attribute of the habit.
+    The migration runs in a single transaction: on error, the database is left untouched.
+
+    Args:
+        con (sqlite3.Connection): A connection to the database, outside of any transaction.
+        cursor (sqlite3.Cursor): A cursor on the connection.
+    """
+    # foreign keys can only be switched off outside of a transaction
+    cursor.execute("PRAGMA foreign_keys = OFF")
+    try:
+        cursor.execute("BEGIN")
+        cursor.execute("""
+            CREATE TABLE habits_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                habit TEXT NOT NULL UNIQUE,
+                periodicity TEXT CHECK(periodicity IN ('daily', 'weekly')) NOT NULL,
+                creation_date TEXT NOT NULL
+            )
+        """)
+        cursor.execute("""
+            INSERT INTO habits_new (habit, periodicity, creation_date)
+            SELECT habit, periodicity, creation_date
+            FROM habits
+            ORDER BY creation_date, habit
+        """)
+        cursor.execute("""
+            CREATE TABLE completions_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                habit_id INTEGER NOT NULL,
+                completion_date TEXT NOT NULL,
+                FOREIGN KEY(habit_id) REFERENCES habits(id) ON DELETE CASCADE,
+                UNIQUE (habit_id, completion_date)
+            )
+        """)
+        cursor.execute("""
+            INSERT INTO completions_new (id, habit_id, completion_date)
+            SELECT c.id, h.id, c.completion_date
+            FROM completions c
+            JOIN habits_new h ON h.habit = c.habit
+            ORDER BY c.id
+        """)
+        if table_exists(cursor, "change_log"):
+            cursor.execute(f"CREATE TABLE change_log_new {change_log_columns}")
+            cursor.execute("""
+                INSERT INTO change_log_new (seq, operation, habit, periodicity, change_date)
+                SELECT seq, operation, habit, periodicity, change_date
+                FROM change_log
+                ORDER BY seq
+            """)
+            cursor.execute("DROP TABLE change_log")
+            cursor.execute("ALTER TABLE change_log_new RENAME TO change_log")
+        # dropping the old tables also drops their triggers, recreated by initialize_db
+        cursor.execute("DROP TABLE completions")
+        cursor.execute("DROP TABLE habits")
+        cursor.execute("ALTER TABLE habits_new RENAME TO habits")
+        cursor.execute("ALTER TABLE completions_new RENAME TO completions")
+        if cursor.execute("PRAGMA foreign_key_check").fetchone() is not None:
+            raise sqlite3.IntegrityError("foreign key violation after migration")
+        cursor.execute("PRAGMA user_version = 1")
+        con.commit()
+    except sqlite3.Error:
+        con.rollback()
+        raise
+    finally:
+        cursor.execute("PRAGMA foreign_keys = ON")
+
+def create_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Creates the covering indexes of the habit listings, so that they are read in the order of their
+    ORDER BY clause instead of being sorted in a temporary B-tree (see query_plan_audit.py),
+    and the index of the groups of a habit.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database.
+    """
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_habits_periodicity_creation_date
+        ON habits (periodicity, creation_date, habit)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_habits_periodicity_habit
+        ON habits (periodicity, habit, creation_date)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_habit_group_members_habit_id
+        ON habit_group_members (habit_id, group_id)
+    """)
+
+def create_change_log_triggers(cursor: sqlite3.Cursor) -> None:
+    """
+    Creates the triggers appending every change of the 'habits' and 'completions' tables to the change log,
+    so that the log entry is written in the same transaction as the change itself.
+    Completions deleted by the cascade of a habit removal are not logged, the 'remove_habit' entry implies them.
+    The log identifies habits by name, so that it can be applied to databases with different habit ids.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database.
+    """
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS log_add_habit AFTER INSERT ON habits
+        BEGIN
+            INSERT INTO change_log (operation, habit, periodicity, change_date)
+            VALUES ('add_habit', NEW.habit, NEW.periodicity, NEW.creation_date);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS log_remove_habit AFTER DELETE ON habits
+        BEGIN
+            INSERT INTO change_log (operation, habit)
+            VALUES ('remove_habit', OLD.habit);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS log_rename_habit AFTER UPDATE OF habit ON habits
+        WHEN OLD.habit <> NEW.habit
+        BEGIN
+            INSERT INTO change_log (operation, habit, new_habit)
+            VALUES ('rename_habit', OLD.habit, NEW.habit);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS log_add_completion AFTER INSERT ON completions
+        BEGIN
+            INSERT INTO change_log (operation, habit, change_date)
+            VALUES ('add_completion', (SELECT habit FROM habits WHERE id = NEW.habit_id), NEW.completion_date);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS log_remove_completion AFTER DELETE ON completions
+        WHEN EXISTS (SELECT 1 FROM habits WHERE id = OLD.habit_id)
+        BEGIN
+            INSERT INTO change_log (operation, habit, change_date)
+            VALUES ('remove_completion', (SELECT habit FROM habits WHERE id = OLD.habit_id), OLD.completion_date);
+        END
+    """)
+
+def seed_change_log(cursor: sqlite3.Cursor) -> None:
+    """
+    Fills an empty change log with the existing habits and completions, so that databases created
+    before the change log can be replicated from scratch.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database.
+    """
+    if cursor.execute("SELECT 1 FROM change_log LIMIT 1").fetchone() is not None:
+        return
+    cursor.execute("""
+        INSERT INTO change_log (operation, habit, periodicity, change_date)
+        SELECT 'add_habit', habit, periodicity, creation_date
+        FROM habits
+        ORDER BY id
+    """)
+    cursor.execute("""
+        INSERT INTO change_log (operation, habit, change_date)
+        SELECT 'add_completion', h.habit, c.completion_date
+        FROM completions c
+        JOIN habits h ON h.id = c.habit_id
+        ORDER BY c.id
+    """)
+
+def add_habit(habit: str, periodicity: str, creation_date: date, db_name: str) -> int | None:
     """
     Adds a new habit to the database.
 
@@ -56,6 +334,9 @@ def add_habit(habit: str, periodicity: str, creation_date: date, db_name: str) -
         periodicity (str): The periodicity of the habit ('daily' or 'weekly').
         creation_date (date): The date the habit was created.
         db_name (str): The name of the database file.
+
+    Returns:
+        int | None: The id of the new habit, None if the habit could not be added.
     """
     try:
         con, cursor = connect_db(db_name)
@@ -64,6 +345,7 @@ def add_habit(habit: str, periodicity: str, creation_date: date, db_name: str) -
             VALUES (?, ?, ?)                
         """, (habit, periodicity, creation_date))
         con.commit()
+        return cursor.lastrowid
     except sqlite3.Error as e:
         print(f"database error: {e}")
     finally:
@@ -112,6 +394,51 @@ def habit_exists(habit: str, db_name: str) -> bool:
     finally:
         con.close()
 
+def fetch_habit_id(habit: str, db_name: str) -> int | None:
+    """
+    Resolves the name of a habit to its id.
+
+    Args:
+        habit (str): The name of the habit.
+        db_name (str): The name of the database file.
+
+    Returns:
+        int | None: The id of the habit, None if the habit does not exist.
+    """
+    try:
+        con, cursor = connect_db(db_name)
+        cursor.execute("""
+            SELECT id FROM habits WHERE habit = ?
+        """, (habit,))
+        result = cursor.fetchone()
+        return result[0] if result else None
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def rename_habit(habit: str, new_name: str, db_name: str) -> None:
+    """
+    Renames a habit. Completions reference the habit id, so only the habit row is updated.
+
+    Args:
+        habit (str): The current name of the habit.
+        new_name (str): The new name of the habit.
+        db_name (str): The name of the database file.
+    """
+    try:
+        con, cursor = connect_db(db_name)
+        cursor.execute("""
+            UPDATE habits
+            SET habit = ?
+            WHERE habit = ?
+        """, (new_name, habit))
+        con.commit()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
 def add_completion_date(habit: str, date: date, db_name: str) -> None:
     """
     Adds a completion date for a habit in the database.
@@ -124,8 +451,8 @@ def add_completion_date(habit: str, date: date, db_name: str) -> None:
     try:
         con, cursor = connect_db(db_name)
         cursor.execute("""
-            INSERT INTO completions (habit, completion_date)
-            VALUES (?, ?)               
+            INSERT INTO completions (habit_id, completion_date)
+            VALUES ((SELECT id FROM habits WHERE habit = ?), ?)               
         """, (habit, date.isoformat()))
         con.commit()
     except sqlite3.Error as e:
@@ -133,22 +460,32 @@ def add_completion_date(habit: str, date: date, db_name: str) -> None:
     finally:
         con.close()
 
-def remove_completion_date(habit: str, date: date, db_name: str) -> None:
+def remove_completion_date(habit: str, date: date, db_name: str) -> str | None:
     """
-    Remove a habit completion date in the db
+    Remove a habit completion date in the db, unless the date belongs to an archived (read-only) year.
 
     Args:
         habit (str): The name of the habit.
         date (date): The completion date.
         db_name (str): The name of the database file.
+
+    Returns:
+        str | None: ARCHIVED if the date belongs to an archived year and nothing was removed, REMOVED otherwise,
+            None on database error.
     """
     try:
         con, cursor = connect_db(db_name)
+        cursor.execute("""
+            SELECT 1 FROM completion_partitions WHERE ? BETWEEN first_day AND last_day
+        """, (date.isoformat(),))
+        if cursor.fetchone() is not None:
+            return ARCHIVED
         cursor.execute("""
             DELETE FROM completions
-            WHERE habit = ? AND completion_date = ?            
+            WHERE habit_id = (SELECT id FROM habits WHERE habit = ?) AND completion_date = ?            
         """, (habit, date.isoformat()))
         con.commit()
+        return REMOVED
     except sqlite3.Error as e:
         print(f"database error: {e}")
     finally:
@@ -156,7 +493,8 @@ def remove_completion_date(habit: str, date: date, db_name: str) -> None:
 
 def completion_date_exists(habit: str, date: date, db_name: str) -> bool:
     """
-    Checks if a habit's completion date exists in the database.
+    Checks if a habit's completion date exists in the database, reading only the partition of the date.
+    When the interval storage is enabled, the check is a lookup of the interval containing the date.
 
     Args:
         habit (str): The name of the habit.
@@ -168,8 +506,15 @@ def completion_date_exists(habit: str, date: date, db_name: str) -> bool:
     """
     try:
         con, cursor = connect_db(db_name)
-        cursor.execute("""
-            SELECT 1 FROM completions WHERE habit = ? AND completion_date = ?              
+        schema = partition_schema(cursor, date, db_name)
+        # the interval storage cannot be enabled along with partitions, so it only covers the main database
+        if schema == "main" and table_exists(cursor, "completion_intervals"):
+            # imported here since interval_store imports db_handler
+            import interval_store
+            return interval_store.day_completed(cursor, habit, date)
+        cursor.execute(f"""
+            SELECT 1 FROM {schema}.completions
+            WHERE habit_id = (SELECT id FROM main.habits WHERE habit = ?) AND completion_date = ?
         """, (habit, date.isoformat()))
         result = cursor.fetchone()
         return result is not None
@@ -180,7 +525,9 @@ def completion_date_exists(habit: str, date: date, db_name: str) -> bool:
 
 def completion_week_exists(habit: str, date: date, db_name: str) -> bool:
     """
-    Checks if a weekly habit was already completed during the same week.
+    Checks if a weekly habit was already completed during the same week. Completions are partitioned by ISO year,
+    so the week is read from a single partition: the current one, unless the date belongs to an archived year.
+    When the bitmap storage is enabled, the check masks the 7 bits of the week in the bitmaps of the habit.
 
     Args:
         habit (str): The name of the habit.
@@ -190,17 +537,178 @@ def completion_week_exists(habit: str, date: date, db_name: str) -> bool:
     Returns:
         bool: True if the habit was completed during the same week, False otherwise.
     """
+    monday, sunday = iso_week_bounds(date)
     try:
         con, cursor = connect_db(db_name)
+        schema = partition_schema(cursor, date, db_name)
+        # the bitmap storage cannot be enabled along with partitions, so it only covers the main database
+        if schema == "main" and table_exists(cursor, "completion_bitmaps"):
+            # imported here since bitmap_store imports db_handler
+            import bitmap_store
+            habit_id = cursor.execute("SELECT id FROM habits WHERE habit = ?", (habit,)).fetchone()
+            return habit_id is not None and bitmap_store.week_completed(cursor, habit_id[0], date)
+        cursor.execute(f"""
+            SELECT 1 FROM {schema}.completions
+            WHERE habit_id = (SELECT id FROM main.habits WHERE habit = ?) AND completion_date BETWEEN ? AND ?
+            LIMIT 1
+        """, (habit, monday.isoformat(), sunday.isoformat()))
+        return cursor.fetchone() is not None
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+# inserts a habit unless its name is taken
+insert_habit_if_absent_query = """
+    INSERT INTO habits (habit, periodicity, creation_date)
+    VALUES (?, ?, ?)
+    ON CONFLICT (habit) DO NOTHING
+    """
+# inserts a completion of an existing habit unless it was completed on :date or, for a weekly habit, during its week,
+# or :date belongs to an archived year
+insert_completion_if_absent_query = """
+    INSERT INTO completions (habit_id, completion_date)
+    SELECT h.id, :date FROM habits h
+    WHERE h.habit = :habit AND NOT EXISTS (
+        SELECT 1 FROM completion_partitions p
+        WHERE :date BETWEEN p.first_day AND p.last_day
+    ) AND NOT EXISTS (
+        SELECT 1 FROM completions c
+        WHERE c.habit_id = h.id
+          AND c.completion_date BETWEEN (CASE h.periodicity WHEN 'weekly' THEN :monday ELSE :date END)
+                                    AND (CASE h.periodicity WHEN 'weekly' THEN :sunday ELSE :date END)
+    )
+    """
+
+def iso_week_bounds(date: date) -> tuple[date, date]:
+    """
+    Returns the first and last day (Monday and Sunday) of the ISO week of a date.
+
+    Args:
+        date (date): The date.
+
+    Returns:
+        tuple[date, date]: The Monday and the Sunday of the week.
+    """
+    monday = date - timedelta(days=date.weekday())
+    return monday, monday + timedelta(days=6)
+
+def iso_year_bounds(year: int) -> tuple[date, date]:
+    """
+    Returns the first and last day (a Monday and a Sunday) of an ISO year, which is made of whole ISO weeks.
+
+    Args:
+        year (int): The ISO year.
+
+    Returns:
+        tuple[date, date]: The Monday of its first week and the Sunday of its last week.
+    """
+    return date.fromisocalendar(year, 1, 1), date.fromisocalendar(year + 1, 1, 1) - timedelta(days=1)
+
+def partition_schema(cursor: sqlite3.Cursor, date: date, db_name: str) -> str:
+    """
+    Returns the schema holding the completions of a date: 'main' for the current partition, or 'archive'
+    for an archived year, whose read-only database file is then attached to the connection.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database, outside of any transaction.
+        date (date): The completion date.
+        db_name (str): The name of the database file.
+
+    Returns:
+        str: The name of the schema to read the completions of the date from.
+    """
+    cursor.execute("""
+        SELECT file FROM completion_partitions WHERE ? BETWEEN first_day AND last_day
+    """, (date.isoformat(),))
+    result = cursor.fetchone()
+    if result is None:
+        return "main"
+    cursor.execute("ATTACH ? AS archive", (partition_uri(db_name, result[0]),))
+    return "archive"
+
+def partition_uri(db_name: str, file: str) -> str:
+    """
+    Returns the URI opening an archived partition read-only. Archived partitions never change, so they are also
+    opened as immutable: SQLite then skips locking and change detection, and their pages can be cached freely.
+
+    Args:
+        db_name (str): The name of the main database file.
+        file (str): The name of the partition file, relative to the directory of the main database file.
+
+    Returns:
+        str: The URI of the partition file.
+    """
+    return f"{(Path(db_name).resolve().parent / file).as_uri()}?mode=ro&immutable=1"
+
+def add_habit_if_absent(habit: str, periodicity: str, creation_date: date, db_name: str) -> tuple[str | None, int | None]:
+    """
+    Adds a new habit to the database unless a habit with the same name exists, in a single statement.
+
+    Args:
+        habit (str): The name of the habit to be added.
+        periodicity (str): The periodicity of the habit ('daily' or 'weekly').
+        creation_date (date): The date the habit was created.
+        db_name (str): The name of the database file.
+
+    Returns:
+        tuple[str | None, int | None]: The status, INSERTED if the habit was added, ALREADY_EXISTS if the name
+            is taken or None on database error, and the id of the new habit (None if it was not added).
+    """
+    try:
+        con, cursor = connect_db(db_name)
+        cursor.execute(insert_habit_if_absent_query, (habit, periodicity, creation_date))
+        con.commit()
+        if cursor.rowcount == 1:
+            return INSERTED, cursor.lastrowid
+        return ALREADY_EXISTS, None
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+        return None, None
+    finally:
+        con.close()
+
+def add_completion_date_if_absent(habit: str, date: date, db_name: str) -> str | None:
+    """
+    Adds a completion date for a habit unless the habit was already completed on that date or, for a weekly habit,
+    during the same ISO week. The check and the insert are a single statement, so concurrent clients cannot
+    both insert a completion for the same period.
+
+    Args:
+        habit (str): The name of the habit.
+        date (date): The completion date.
+        db_name (str): The name of the database file.
+
+    Returns:
+        str | None: INSERTED if the completion was added, ALREADY_EXISTS if the habit was completed on that date,
+            SAME_WEEK_EXISTS if the weekly habit was completed during that week, UNKNOWN_HABIT if the habit
+            does not exist, ARCHIVED if the date belongs to an archived (read-only) year, None on database error.
+    """
+    monday, sunday = iso_week_bounds(date)
+    params = {"habit": habit, "date": date.isoformat(), "monday": monday.isoformat(), "sunday": sunday.isoformat()}
+    try:
+        con, cursor = connect_db(db_name)
+        cursor.execute(insert_completion_if_absent_query, params)
+        if cursor.rowcount == 1:
+            con.commit()
+            return INSERTED
+        # nothing was inserted: find out why within the same transaction
         cursor.execute("""
-            SELECT completion_date FROM completions WHERE habit = ?             
-        """, (habit,))
-        dates = cursor.fetchall()
-        for d in dates:
-            year, week, _ = datetime.strptime(d[0], "%Y-%m-%d").isocalendar()
-            if date.isocalendar()[:2] == (year, week):
-                return True
-        return False
+            SELECT 1 FROM completion_partitions WHERE :date BETWEEN first_day AND last_day
+        """, params)
+        if cursor.fetchone() is not None:
+            con.commit()
+            return ARCHIVED
+        cursor.execute("""
+            SELECT EXISTS (SELECT 1 FROM completions WHERE habit_id = h.id AND completion_date = :date)
+            FROM habits h
+            WHERE h.habit = :habit
+        """, params)
+        result = cursor.fetchone()
+        con.commit()
+        if result is None:
+            return UNKNOWN_HABIT
+        return ALREADY_EXISTS if result[0] else SAME_WEEK_EXISTS
     except sqlite3.Error as e:
         print(f"database error: {e}")
     finally:
@@ -0,0 +1,240 @@
+import sqlite3
+from datetime import date
+import db_handler as db
+import analytics
+from analytics_queries import group_completion_ratio_query, group_best_streak_query, group_daily_completion_rate_query
+
+def create_group(group: str, db_name: str = "habit.db") -> int | None:
+    """
+    Creates a group of habits, e.g. 'health' or 'work'. A habit can belong to several groups,
+    so that groups can also be used as tags.
+
+    Args:
+        group (str): The name of the group.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        int | None: The id of the new group, None if the group could not be created.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("""
+            INSERT INTO habit_groups (name)
+            VALUES (?)
+        """, (group,))
+        con.commit()
+        return cursor.lastrowid
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def remove_group(group: str, db_name: str = "habit.db") -> None:
+    """
+    Removes a group. Its habits are kept, only their membership is removed.
+
+    Args:
+        group (str): The name of the group.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("""
+            DELETE FROM habit_groups
+            WHERE name = ?
+        """, (group,))
+        con.commit()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def add_habit_to_group(habit: str, group: str, db_name: str = "habit.db") -> bool:
+    """
+    Adds a habit to a group. Adding a habit to a group it already belongs to has no effect.
+
+    Args:
+        habit (str): The name of the habit.
+        group (str): The name of the group.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        bool: True if both the habit and the group exist, False otherwise.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("""
+            INSERT OR IGNORE INTO habit_group_members (group_id, habit_id)
+            SELECT g.id, h.id
+            FROM habit_groups g, habits h
+            WHERE g.name = ? AND h.habit = ?
+        """, (group, habit))
+        exists = cursor.execute("""
+            SELECT EXISTS (SELECT 1 FROM habit_groups WHERE name = ?) AND EXISTS (SELECT 1 FROM habits WHERE habit = ?)
+        """, (group, habit)).fetchone()[0]
+        con.commit()
+        return bool(exists)
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def remove_habit_from_group(habit: str, group: str, db_name: str = "habit.db") -> None:
+    """
+    Removes a habit from a group.
+
+    Args:
+        habit (str): The name of the habit.
+        group (str): The name of the group.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("""
+            DELETE FROM habit_group_members
+            WHERE group_id = (SELECT id FROM habit_groups WHERE name = ?)
+              AND habit_id = (SELECT id FROM habits WHERE habit = ?)
+        """, (group, habit))
+        con.commit()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_groups(db_name: str = "habit.db") -> list[str]:
+    """
+    Fetch the names of all groups.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[str]: The group names, sorted by name.
+    """
+    try:
+        con, cursor = analytics.connect_db(db_name)
+        cursor.execute("SELECT name FROM habit_groups ORDER BY name")
+        return [row[0] for row in cursor]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_group_habits(group: str, db_name: str = "habit.db") -> list[str]:
+    """
+    Fetch the habits of a group.
+
+    Args:
+        group (str): The name of the group.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[str]: The habit names, sorted by name.
+    """
+    try:
+        con, cursor = analytics.connect_db(db_name)
+        cursor.execute("""
+            SELECT h.habit
+            FROM habit_group_members m
+            JOIN habits h ON h.id = m.habit_id
+            WHERE m.group_id = (SELECT id FROM habit_groups WHERE name = ?)
+            ORDER BY h.habit
+        """, (group,))
+        return [row[0] for row in cursor]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_habit_groups(habit: str, db_name: str = "habit.db") -> list[str]:
+    """
+    Fetch the groups of a habit.
+
+    Args:
+        habit (str): The name of the habit.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[str]: The group names, sorted by name.
+    """
+    try:
+        con, cursor = analytics.connect_db(db_name)
+        cursor.execute("""
+            SELECT g.name
+            FROM habit_group_members m
+            JOIN habit_groups g ON g.id = m.group_id
+            WHERE m.habit_id = (SELECT id FROM habits WHERE habit = ?)
+            ORDER BY g.name
+        """, (habit,))
+        return [row[0] for row in cursor]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def get_groups_completion_ratio(db_name: str = "habit.db", today: date | None = None) -> list[tuple[str, float]]:
+    """
+    Get the aggregate completion ratio of every group, i.e. the completions of its habits divided by the
+    periods (days or weeks) elapsed since their creation, computed in a single grouped query.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        today (date | None, optional): The date the ratios are computed for. Defaults to today.
+
+    Returns:
+        list[tuple[str, float]]: The group name and its completion ratio, sorted by group name.
+    """
+    today = today or date.today()
+    try:
+        con, cursor = analytics.connect_db(db_name)
+        cursor.execute(group_completion_ratio_query, (today.isoformat(),))
+        return cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def get_groups_best_streak(periodicity: str, db_name: str = "habit.db") -> list[tuple[str, str, int]]:
+    """
+    Get the best streak of the habits of a periodicity in every group, computed in SQL with window functions.
+    Weekly streaks count consecutive calendar weeks.
+
+    Args:
+        periodicity (str): The periodicity of the habits ('daily' or 'weekly').
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[tuple[str, str, int]]: The group name, the habit holding the best streak and the streak, sorted by
+            group name, for the groups with at least one completed habit of the periodicity.
+    """
+    try:
+        con, cursor = analytics.connect_db(db_name)
+        cursor.execute(group_best_streak_query, (periodicity,))
+        return cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def get_group_daily_completion_rate(group: str, start: date, end: date, db_name: str = "habit.db") -> list[tuple[date, float]]:
+    """
+    Get the share of the daily habits of a group completed on every day of a range.
+    Habits only count from their creation date.
+
+    Args:
+        group (str): The name of the group.
+        start (date): The first day of the range.
+        end (date): The last day of the range.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[tuple[date, float]]: Every day of the range and its completion rate (0 if no habit existed yet).
+    """
+    try:
+        con, cursor = analytics.connect_db(db_name)
+        cursor.execute(group_daily_completion_rate_query, (group, start.isoformat(), end.isoformat()))
+        return [(date.fromisoformat(day), rate) for day, rate in cursor]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
@@ -9,30 +9,70 @@ class Habit:
         habit (str): The name of the habit.
         periodicity (str): The periodicity of the habit ('daily' or 'weekly').
         creation_date (date): The date when the habit was created.
+        habit_id (int | None): The id of the habit in the database, None until the habit is saved.
     """
 
-    def __init__(self, habit: str, periodicity: str) -> None:
+    # habits are loaded by the thousands by the HabitRepository: no per-instance __dict__
+    __slots__ = ("habit", "periodicity", "creation_date", "habit_id", "_completion_dates")
+
+    def __init__(self, habit: str, periodicity: str, creation_date: date | None = None, habit_id: int | None = None) -> None:
         """
         Constructs all the necessary attributes for the Habit object and save the habit to the database.
 
         Args:
             habit (str): The name of the habit (3 to 20 characters long).
             periodicity (str): The periodicity of the habit ('daily' or 'weekly').
-        
-        Attributes:
-            creation_date (date): The date when the habit was created.
+            creation_date (date | None, optional): The date when the habit was created. Defaults to today.
+            habit_id (int | None, optional): The id of the habit in the database. Defaults to None.
         """
         if periodicity not in ['daily', 'weekly']:
             raise ValueError("Periodicity must be either 'daily' or 'weekly'.")
         
+        Habit.validate_name(habit)
+        
+        self.habit = habit
+        self.periodicity = periodicity
+        self.creation_date = creation_date or date.today()
+        self.habit_id = habit_id
+        self._completion_dates = None
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Habit":
+        """
+        Builds a habit from a database row, without validating it again.
+
+        Args:
+            row (tuple): The id, name, periodicity and creation date (ISO format) of the habit.
+
+        Returns:
+            Habit: The habit.
+        """
+        habit = cls.__new__(cls)
+        habit.habit_id, habit.habit, habit.periodicity, creation_date = row
+        habit.creation_date = date.fromisoformat(creation_date)
+        habit._completion_dates = None
+        return habit
+
+    @property
+    def completion_dates(self) -> list[date] | None:
+        """The completion dates of the habit attached by a HabitRepository, None until they are loaded."""
+        return self._completion_dates
+
+    @staticmethod
+    def validate_name(habit: str) -> None:
+        """
+        Checks that a habit name is 3 to 20 characters long.
+
+        Args:
+            habit (str): The name of the habit.
+
+        Raises:
+            ValueError: If the name is too short or too long.
+        """
         if len(habit) < 3:
             raise ValueError("Habit name must be at least 3 characters long.")
         elif len(habit) > 20:
             raise ValueError("Habit name must be at most 20 characters long.")
-        
-        self.habit = habit
-        self.periodicity = periodicity
-        self.creation_date = date.today()
 
     def __str__(self) -> str:
         """
@@ -50,8 +90,24 @@ class Habit:
         Args:
             db_name (str, optional): The name of the database file. Defaults to 'habit.db'.
         """
-        db.add_habit(self.habit, self.periodicity, self.creation_date, db_name)
+        self.habit_id = db.add_habit(self.habit, self.periodicity, self.creation_date, db_name)
     
+    def save_if_absent(self, db_name: str = "habit.db") -> str | None:
+        """
+        Save a habit to the database unless a habit with the same name exists, in a single statement.
+        
+        Args:
+            db_name (str, optional): The name of the database file. Defaults to 'habit.db'.
+
+        Returns:
+            str | None: db_handler.INSERTED if the habit was saved, db_handler.ALREADY_EXISTS if the name is taken,
+                None on database error.
+        """
+        status, habit_id = db.add_habit_if_absent(self.habit, self.periodicity, self.creation_date, db_name)
+        if status == db.INSERTED:
+            self.habit_id = habit_id
+        return status
+
     @staticmethod
     def remove(habit: str, db_name: str = "habit.db") -> None:
         """
@@ -63,6 +119,19 @@ class Habit:
         """
         db.remove_habit(habit, db_name)
 
+    @staticmethod
+    def rename(habit: str, new_name: str, db_name: str = "habit.db") -> None:
+        """
+        Rename a habit in the database, keeping its completions.
+        
+        Args:
+            habit (str): The current name of the habit.
+            new_name (str): The new name of the habit (3 to 20 characters long).
+            db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        """
+        Habit.validate_name(new_name)
+        db.rename_habit(habit, new_name, db_name)
+
     @staticmethod
     def exists(habit: str, db_name: str = "habit.db") -> bool:
         """
@@ -90,16 +159,35 @@ class Habit:
         db.add_completion_date(habit, date, db_name)
 
     @staticmethod
-    def remove_completion_date(habit: str, date: date, db_name: str = "habit.db") -> None:
+    def add_completion_date_if_absent(habit: str, date: date, db_name: str = "habit.db") -> str | None:
         """
-        Removes a habit completion date from the database.
+        Add a habit completion date unless the habit was already completed that day or, for a weekly habit,
+        that week. The check and the insert are a single statement.
+        
+        Args:
+            habit (str): The name of the habit.
+            date (date): The completion date to be recorded.
+            db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+        Returns:
+            str | None: One of the db_handler statuses INSERTED, ALREADY_EXISTS, SAME_WEEK_EXISTS or UNKNOWN_HABIT.
+        """
+        return db.add_completion_date_if_absent(habit, date, db_name)
+
+    @staticmethod
+    def remove_completion_date(habit: str, date: date, db_name: str = "habit.db") -> str | None:
+        """
+        Removes a habit completion date from the database, unless the date belongs to an archived year.
 
         Args:
             habit (str): The name of the habit.
             date (date): The completion date to be removed.
             db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+        Returns:
+            str | None: db_handler.REMOVED, db_handler.ARCHIVED if the year is read-only, None on database error.
         """
-        db.remove_completion_date(habit, date, db_name)
+        return db.remove_completion_date(habit, date, db_name)
 
     @staticmethod
     def completion_date_exists(habit: str, date: date, db_name: str = "habit.db") -> bool:
@@ -0,0 +1,136 @@
+import sqlite3
+from datetime import date
+from itertools import groupby
+import analytics
+from analytics_queries import habit_by_id_query, habit_by_name_query, chunk_completion_dates_query
+from habit import Habit
+
+# number of habits whose completions are loaded per query by `load_completion_dates`
+COMPLETIONS_CHUNK_SIZE = 500
+
+class HabitRepository:
+    """
+    Loads Habit objects from the database, keeping an identity map so that every habit is materialized once
+    per repository: loading the same habit again, by id, by name or in a listing, returns the same object.
+    Completion dates are attached lazily, on first access or in batches.
+    """
+
+    def __init__(self, db_name: str = "habit.db") -> None:
+        self.db_name = db_name
+        self._habits = {}
+
+    def __len__(self) -> int:
+        return len(self._habits)
+
+    def __contains__(self, habit_id: int) -> bool:
+        return habit_id in self._habits
+
+    def _materialize(self, row: tuple) -> Habit:
+        """Returns the habit of a row, reusing the habit already loaded with the same id."""
+        habit = self._habits.get(row[0])
+        if habit is None:
+            habit = self._habits[row[0]] = Habit.from_row(row)
+        else:
+            # the habit may have been renamed since it was loaded
+            habit.habit = row[1]
+        return habit
+
+    def _fetch_one(self, query: str, param) -> Habit | None:
+        try:
+            con, cursor = analytics.connect_db(self.db_name)
+            row = cursor.execute(query, (param,)).fetchone()
+            return self._materialize(row) if row else None
+        except sqlite3.Error as e:
+            print(f"database error: {e}")
+        finally:
+            con.close()
+
+    def get(self, habit_id: int) -> Habit | None:
+        """
+        Returns a habit by id, from the identity map if it was already loaded.
+
+        Args:
+            habit_id (int): The id of the habit.
+
+        Returns:
+            Habit | None: The habit, None if it does not exist.
+        """
+        if habit_id in self._habits:
+            return self._habits[habit_id]
+        return self._fetch_one(habit_by_id_query, habit_id)
+
+    def get_by_name(self, habit_name: str) -> Habit | None:
+        """
+        Returns a habit by name.
+
+        Args:
+            habit_name (str): The name of the habit.
+
+        Returns:
+            Habit | None: The habit, None if it does not exist.
+        """
+        return self._fetch_one(habit_by_name_query, habit_name)
+
+    def all(self) -> list[Habit]:
+        """Returns all habits, in the order of `analytics.fetch_all_habits`."""
+        return [self._materialize(row) for row in analytics.fetch_all_habits_with_id(self.db_name) or []]
+
+    def daily(self) -> list[Habit]:
+        """Returns the daily habits, in the order of `analytics.fetch_daily_habits`."""
+        return [self._materialize(row) for row in analytics.fetch_daily_habits_with_id(self.db_name) or []]
+
+    def weekly(self) -> list[Habit]:
+        """Returns the weekly habits, in the order of `analytics.fetch_weekly_habits`."""
+        return [self._materialize(row) for row in analytics.fetch_weekly_habits_with_id(self.db_name) or []]
+
+    def completion_dates(self, habit: Habit) -> list[date]:
+        """
+        Returns the completion dates of a habit, loading and attaching them on first access.
+
+        Args:
+            habit (Habit): A habit loaded by the repository.
+
+        Returns:
+            list[date]: The completion dates, in chronological order.
+        """
+        if habit.completion_dates is None:
+            self.load_completion_dates([habit])
+        return habit.completion_dates
+
+    def load_completion_dates(self, habits: list[Habit] | None = None) -> None:
+        """
+        Attaches the completion dates of several habits at once, with one query per chunk of habits.
+
+        Args:
+            habits (list[Habit] | None, optional): Habits loaded by the repository. Defaults to every loaded habit
+                whose completion dates are not attached yet.
+        """
+        if habits is None:
+            habits = [habit for habit in self._habits.values() if habit.completion_dates is None]
+        try:
+            con, cursor = analytics.connect_db(self.db_name)
+            for i in range(0, len(habits), COMPLETIONS_CHUNK_SIZE):
+                chunk = {habit.habit_id: habit for habit in habits[i:i + COMPLETIONS_CHUNK_SIZE]}
+                for habit in chunk.values():
+                    habit._completion_dates = []
+                query = chunk_completion_dates_query.format(placeholders=", ".join("?" * len(chunk)))
+                cursor.execute(query, list(chunk))
+                for habit_id, rows in groupby(cursor, key=lambda row: row[0]):
+                    chunk[habit_id]._completion_dates = [date.fromisoformat(row[1]) for row in rows]
+        except sqlite3.Error as e:
+            print(f"database error: {e}")
+        finally:
+            con.close()
+
+    def evict(self, habit_id: int) -> None:
+        """
+        Forgets a habit, e.g. after it was removed, so that it is loaded again from the database if needed.
+
+        Args:
+            habit_id (int): The id of the habit.
+        """
+        self._habits.pop(habit_id, None)
+
+    def clear(self) -> None:
+        """Forgets every loaded habit."""
+        self._habits.clear()
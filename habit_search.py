@@ -0,0 +1,150 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from heapq import nsmallest
+
+STOP_TRIGRAM_MIN_POSTINGS = 1000
+
+def trigrams(text: str) -> set[str]:
+    """
+    Splits a text into its set of trigrams (3 consecutive characters), padded so that short
+    words and word boundaries also produce trigrams.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        set[str]: The trigrams of the text.
+    """
+    padded = f"  {text.casefold()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class HabitSearchIndex:
+    """
+    An in-memory search index over habit names, used to autocomplete habit names.
+
+    Prefix matches are found by binary search in a sorted list of case-folded names, and fuzzy
+    matches (typos, words in the middle of the name) by counting shared trigrams.
+
+    Attributes:
+        names (set[str]): The indexed habit names.
+    """
+
+    def __init__(self, names: list[str] = ()) -> None:
+        """
+        Constructs the index from a list of habit names.
+
+        Args:
+            names (list[str], optional): The habit names to index. Defaults to an empty index.
+        """
+        self.names = set()
+        self._keys = []
+        self._trigrams = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def add(self, name: str) -> None:
+        """
+        Adds a habit name to the index.
+
+        Args:
+            name (str): The habit name to add.
+        """
+        if name in self.names:
+            return
+        self.names.add(name)
+        insort(self._keys, (name.casefold(), name))
+        for trigram in trigrams(name):
+            self._trigrams.setdefault(trigram, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        """
+        Removes a habit name from the index.
+
+        Args:
+            name (str): The habit name to remove.
+        """
+        if name not in self.names:
+            return
+        self.names.remove(name)
+        key = (name.casefold(), name)
+        del self._keys[bisect_left(self._keys, key)]
+        for trigram in trigrams(name):
+            postings = self._trigrams[trigram]
+            postings.discard(name)
+            if not postings:
+                del self._trigrams[trigram]
+
+    def prefix_search(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Finds the habit names starting with a prefix (case insensitive), in alphabetical order.
+
+        Args:
+            prefix (str): The prefix to look for.
+            limit (int, optional): The maximum number of names to return. Defaults to 10.
+
+        Returns:
+            list[str]: The matching habit names.
+        """
+        prefix = prefix.casefold()
+        matches = []
+        position = bisect_left(self._keys, (prefix,))
+        while len(matches) < limit and position < len(self._keys):
+            key, name = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            matches.append(name)
+            position += 1
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> list[str]:
+        """
+        Finds the habit names best matching a query: prefix matches first, then the names sharing
+        the most trigrams with the query.
+
+        Args:
+            query (str): The text typed by the user.
+            limit (int, optional): The maximum number of names to return. Defaults to 10.
+
+        Returns:
+            list[str]: The matching habit names, best matches first.
+        """
+        matches = self.prefix_search(query, limit)
+        if len(matches) >= limit or len(query.strip()) < 2:
+            return matches
+
+        scores, threshold = self.fuzzy_scores(query)
+        for name in matches:
+            del scores[name]
+        fuzzy = nsmallest(limit - len(matches), ((-score, name) for name, score in scores.items() if score >= threshold))
+        matches.extend(name for _, name in fuzzy)
+        return matches
+
+    def fuzzy_scores(self, query: str) -> tuple[Counter, float]:
+        """
+        Counts, for every name sharing one of the query's discriminating trigrams, how many trigrams it shares
+        with the query.
+
+        Args:
+            query (str): The text typed by the user.
+
+        Returns:
+            tuple[Counter, float]: The number of shared trigrams by candidate name, and the score of a fuzzy match.
+        """
+        # trigrams shared by a large part of the names do not discriminate and would make the scoring
+        # linear in the number of names, so they are not counted and assumed present in every candidate
+        max_postings = max(STOP_TRIGRAM_MIN_POSTINGS, len(self.names) // 10)
+        query_trigrams = trigrams(query)
+        postings = [self._trigrams.get(trigram, ()) for trigram in query_trigrams]
+        postings = [names for names in postings if len(names) <= max_postings]
+        scores = Counter()
+        for names in postings:
+            scores.update(names)
+        # a name needs at least half of the query trigrams in common to be a fuzzy match
+        threshold = len(query_trigrams) / 2 - (len(query_trigrams) - len(postings))
+        return scores, threshold
@@ -0,0 +1,280 @@
+import sqlite3
+from datetime import date
+import db_handler as db
+
+# SQL expression converting an ISO date column to its proleptic Gregorian ordinal, as date.toordinal() does
+ordinal_sql = "CAST(julianday({column}) - 1721424.5 AS INTEGER)"
+
+# SQL expression of the start of the interval containing the day {day} of the habit {habit_id}, if any
+containing_start_sql = """(
+    SELECT MAX(start_ordinal) FROM completion_intervals
+    WHERE habit_id = {habit_id} AND start_ordinal <= {day}
+)"""
+
+def create_interval_triggers(cursor: sqlite3.Cursor) -> None:
+    """
+    Creates the triggers merging and splitting the completion intervals when completions are added or removed,
+    so that the intervals are updated in the same transaction as the completions.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database.
+    """
+    day = ordinal_sql.format(column="NEW.completion_date")
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS interval_add_completion AFTER INSERT ON completions
+        BEGIN
+            -- merge the new day with the interval ending the day before and the one starting the day after
+            INSERT OR REPLACE INTO completion_intervals (habit_id, start_ordinal, end_ordinal)
+            VALUES (
+                NEW.habit_id,
+                COALESCE((
+                    SELECT start_ordinal FROM completion_intervals
+                    WHERE habit_id = NEW.habit_id
+                      AND start_ordinal = {containing_start_sql.format(habit_id="NEW.habit_id", day=f"{day} - 1")}
+                      AND end_ordinal = {day} - 1
+                ), {day}),
+                COALESCE((
+                    SELECT end_ordinal FROM completion_intervals
+                    WHERE habit_id = NEW.habit_id AND start_ordinal = {day} + 1
+                ), {day})
+            );
+            DELETE FROM completion_intervals
+            WHERE habit_id = NEW.habit_id AND start_ordinal = {day} + 1;
+        END
+    """)
+    day = ordinal_sql.format(column="OLD.completion_date")
+    containing_start = containing_start_sql.format(habit_id="OLD.habit_id", day=day)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS interval_remove_completion AFTER DELETE ON completions
+        BEGIN
+            -- split the interval containing the removed day into the days before and the days after it
+            INSERT INTO completion_intervals (habit_id, start_ordinal, end_ordinal)
+            SELECT habit_id, {day} + 1, end_ordinal FROM completion_intervals
+            WHERE habit_id = OLD.habit_id AND start_ordinal = {containing_start} AND end_ordinal > {day};
+            DELETE FROM completion_intervals
+            WHERE habit_id = OLD.habit_id AND start_ordinal = {day};
+            UPDATE completion_intervals SET end_ordinal = {day} - 1
+            WHERE habit_id = OLD.habit_id AND start_ordinal = {containing_start} AND end_ordinal >= {day};
+        END
+    """)
+
+def enable_interval_storage(db_name: str = "habit.db") -> None:
+    """
+    Enables the run-length interval storage of completions: every unbroken run of completed days of a habit is
+    kept as a single (habit_id, start_ordinal, end_ordinal) row, built from the existing completions and then
+    maintained by triggers. Streaks, counts and existence checks then scale with the number of breaks in the
+    history instead of the number of completed days. The 'completions' table stays the source of truth.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Raises:
+        ValueError: If years of completions are archived: the triggers only see the completions of the main
+            database file, so the intervals would miss the archived history.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        if db.has_partitions(cursor):
+            raise ValueError("The interval storage cannot be enabled once completions are archived.")
+        cursor.execute("BEGIN")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS completion_intervals (
+                habit_id INTEGER NOT NULL,
+                start_ordinal INTEGER NOT NULL,
+                end_ordinal INTEGER NOT NULL,
+                FOREIGN KEY(habit_id) REFERENCES habits(id) ON DELETE CASCADE,
+                PRIMARY KEY (habit_id, start_ordinal)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("DELETE FROM completion_intervals")
+        # consecutive days share the same difference between their ordinal and their rank (gaps and islands)
+        cursor.execute(f"""
+            INSERT INTO completion_intervals (habit_id, start_ordinal, end_ordinal)
+            SELECT habit_id, MIN(day), MAX(day)
+            FROM (
+                SELECT habit_id, day, day - ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY day) AS island
+                FROM (SELECT habit_id, {ordinal_sql.format(column="completion_date")} AS day FROM completions)
+            )
+            GROUP BY habit_id, island
+        """)
+        create_interval_triggers(cursor)
+        con.commit()
+    except sqlite3.Error as e:
+        con.rollback()
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def disable_interval_storage(db_name: str = "habit.db") -> None:
+    """
+    Disables the interval storage of completions, dropping the intervals and their triggers.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("DROP TRIGGER IF EXISTS interval_add_completion")
+        cursor.execute("DROP TRIGGER IF EXISTS interval_remove_completion")
+        cursor.execute("DROP TABLE IF EXISTS completion_intervals")
+        con.commit()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def is_enabled(db_name: str = "habit.db") -> bool:
+    """
+    Checks if the interval storage of completions is enabled.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        bool: True if the completion intervals are maintained, False otherwise.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        return db.table_exists(cursor, "completion_intervals")
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_intervals_by_id(habit_id: int, db_name: str = "habit.db") -> list[tuple[date, date]]:
+    """
+    Fetch the runs of consecutive completed days of a habit.
+
+    Args:
+        habit_id (int): The id of the habit.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[tuple[date, date]]: The first and last day of every run, in chronological order.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("""
+            SELECT start_ordinal, end_ordinal FROM completion_intervals
+            WHERE habit_id = ?
+            ORDER BY start_ordinal
+        """, (habit_id,))
+        return [(date.fromordinal(start), date.fromordinal(end)) for start, end in cursor]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def day_completed(cursor: sqlite3.Cursor, habit: str, day: date) -> bool:
+    """
+    Checks if a habit was completed on a given day with a lookup of the interval containing the day.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database.
+        habit (str): The name of the habit.
+        day (date): The completion date to check.
+
+    Returns:
+        bool: True if the completion date exists, False otherwise.
+    """
+    cursor.execute("""
+        SELECT end_ordinal >= :day FROM completion_intervals
+        WHERE habit_id = (SELECT id FROM habits WHERE habit = :habit) AND start_ordinal <= :day
+        ORDER BY start_ordinal DESC
+        LIMIT 1
+    """, {"habit": habit, "day": day.toordinal()})
+    result = cursor.fetchone()
+    return bool(result and result[0])
+
+def completion_date_exists(habit: str, day: date, db_name: str = "habit.db") -> bool:
+    """
+    Checks if a habit was completed on a given day with a lookup of the interval containing the day.
+
+    Args:
+        habit (str): The name of the habit.
+        day (date): The completion date to check.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        bool: True if the completion date exists, False otherwise.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        return day_completed(cursor, habit, day)
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def count_completions_by_habit(db_name: str = "habit.db") -> dict[int, int]:
+    """
+    Returns the number of completions of every habit, as the sum of the lengths of its intervals.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        dict[int, int]: The number of completions by habit id, for the habits with at least one completion.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("""
+            SELECT habit_id, SUM(end_ordinal - start_ordinal + 1) FROM completion_intervals
+            GROUP BY habit_id
+        """)
+        return dict(cursor.fetchall())
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def longest_streak_by_id(habit_id: int, db_name: str = "habit.db") -> int:
+    """
+    Returns the longest daily streak of a habit, i.e. the length of its longest interval.
+
+    Args:
+        habit_id (int): The id of the habit.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        int: The longest streak of consecutive days, 0 if the habit has no completion.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("""
+            SELECT COALESCE(MAX(end_ordinal - start_ordinal + 1), 0) FROM completion_intervals
+            WHERE habit_id = ?
+        """, (habit_id,))
+        return cursor.fetchone()[0]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def get_habit_with_longest_daily_streak(db_name: str = "habit.db") -> tuple[str, int]:
+    """
+    Get the daily habit with the longest streak in a single query over the intervals.
+    Ties are resolved like `analytics.get_habit_with_longest_daily_streak`.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        tuple[str, int]: The habit name and its longest daily streak, ("", 0) if no daily habit was completed.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("""
+            SELECT h.habit, MAX(i.end_ordinal - i.start_ordinal + 1) AS streak
+            FROM completion_intervals i
+            JOIN habits h ON h.id = i.habit_id
+            WHERE h.periodicity = 'daily'
+            GROUP BY h.id
+            ORDER BY streak DESC, h.creation_date ASC, h.habit ASC
+            LIMIT 1
+        """)
+        return cursor.fetchone() or ("", 0)
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
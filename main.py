@@ -1,8 +1,20 @@
+import argparse
 import questionary
 import prompts
+import data_io
+import maintenance
+import partitions
+from action_profiler import ActionProfiler
 from db_handler import initialize_db
 
-def start() -> None:
+def run_action(action, profiler: ActionProfiler | None = None) -> None:
+    """Runs a menu action, profiled under the name of its function in profile mode."""
+    if profiler is None:
+        action()
+    else:
+        profiler.run(action.__name__, action)
+
+def start(profiler: ActionProfiler | None = None) -> None:
     """Main entry point for the Habit Tracker App, acting like an interactive menu for the user."""
     
     initialize_db(db_name="habit.db")
@@ -21,20 +33,20 @@ def start() -> None:
         ).ask()
         
         if choice == "Create new habit":
-            prompts.create_habit()
+            run_action(prompts.create_habit, profiler)
         elif choice == "Delete habit":
-            prompts.remove_habit()
+            run_action(prompts.remove_habit, profiler)
         elif choice == "Add habit completion":
-            prompts.add_completion_date()
+            run_action(prompts.add_completion_date, profiler)
         elif choice == "Remove habit completion":
-            prompts.remove_completion_date()
+            run_action(prompts.remove_completion_date, profiler)
         elif choice == "Analytics Module":
-            analytics_module()
+            analytics_module(profiler)
         elif choice == "Exit":
             print("Goodbye!")
             break
 
-def analytics_module() -> None:
+def analytics_module(profiler: ActionProfiler | None = None) -> None:
     """Interactive menu for the Analytics Module."""
     while True:
         choice = questionary.select(
@@ -48,28 +60,90 @@ def analytics_module() -> None:
                 "View longest streak of specific habit",
                 "View daily habits completion ratio",
                 "View weekly habits completion ratio",
+                "View full report",
                 "Back"
             ]
         ).ask()
         if choice == "View all habits":
-            prompts.view_all_habits()
+            run_action(prompts.view_all_habits, profiler)
         elif choice == "View daily habits":
-            prompts.view_daily_habits()
+            run_action(prompts.view_daily_habits, profiler)
         elif choice == "View weekly habits":
-            prompts.view_weekly_habits()
+            run_action(prompts.view_weekly_habits, profiler)
         elif choice == "View habit completion dates":
-            prompts.view_habit_completion_dates()
+            run_action(prompts.view_habit_completion_dates, profiler)
         elif choice == "View longest streak of all":
-            prompts.view_longest_streak_of_all()
+            run_action(prompts.view_longest_streak_of_all, profiler)
         elif choice == "View longest streak of specific habit":
-            prompts.view_longest_streak_of_habit()
+            run_action(prompts.view_longest_streak_of_habit, profiler)
         elif choice == "View daily habits completion ratio":
-            prompts.view_daily_habits_completion_ratio()
+            run_action(prompts.view_daily_habits_completion_ratio, profiler)
         elif choice == "View weekly habits completion ratio":
-            prompts.view_weekly_habits_completion_ratio()
+            run_action(prompts.view_weekly_habits_completion_ratio, profiler)
+        elif choice == "View full report":
+            run_action(prompts.view_report, profiler)
         elif choice == "Back":
             break
 
-# Start the program with the interactive menu
+def run_command(args: argparse.Namespace) -> None:
+    """Runs an import, export, maintenance or archive command of the command line, printing its outcome."""
+    initialize_db(db_name=args.db)
+    if args.command == "archive":
+        try:
+            moved = partitions.archive_year(args.year, args.db)
+        except ValueError as e:
+            print(e)
+            return
+        if moved is not None:
+            print(f"Archived {moved} completions of {args.year} to {partitions.partition_file(args.db, args.year)}.")
+    elif args.command == "maintenance":
+        report = maintenance.run_maintenance(args.db, full_analyze=args.full_analyze, quick_check=not args.full_check)
+        maintenance.print_maintenance_report(report)
+    elif args.command == "import":
+        stats = data_io.import_records(args.file, args.kind, args.db, progress=data_io.print_progress)
+        print(f"Imported {stats['inserted']} {args.kind}, skipped {stats['skipped']} existing "
+              f"and {stats['invalid']} invalid rows in {stats['seconds']:.2f}s "
+              f"({stats['rows_per_second']:.0f} rows/s).")
+    else:
+        stats = data_io.export_records(args.file, args.kind, args.db, progress=data_io.print_progress)
+        print(f"Exported {stats['rows']} {args.kind} in {stats['seconds']:.2f}s "
+              f"({stats['rows_per_second']:.0f} rows/s).")
+
+def parse_args() -> argparse.Namespace:
+    """Parses the command line: no command starts the interactive menu."""
+    parser = argparse.ArgumentParser(description="Habit Tracker App")
+    parser.add_argument("--db", default="habit.db", help="the database file (default: habit.db)")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile every action of the interactive menu, without the time spent waiting for input")
+    parser.add_argument("--profile-dir", default="profiles", help="the directory of the profiles (default: profiles)")
+    commands = parser.add_subparsers(dest="command")
+    for command, description in (("import", "import habits or completions"), ("export", "export habits or completions")):
+        subparser = commands.add_parser(command, help=description)
+        subparser.add_argument("kind", choices=["habits", "completions"])
+        subparser.add_argument("file", help="a .csv or .jsonl file")
+    subparser = commands.add_parser("maintenance", help="check, analyze and vacuum the database")
+    subparser.add_argument("--full-analyze", action="store_true", help="analyze every row instead of a sample")
+    subparser.add_argument("--full-check", action="store_true", help="run the full integrity check")
+    subparser = commands.add_parser("archive", help="move the completions of a past year to a read-only file")
+    subparser.add_argument("year", type=int, help="the ISO year to archive")
+    return parser.parse_args()
+
+# Start the program with the interactive menu, or run a command
 if __name__ == "__main__":
-    start()
\ No newline at end of file
+    args = parse_args()
+    if args.command:
+        run_command(args)
+    elif args.profile:
+        profiler = ActionProfiler(args.profile_dir)
+        profiler.exclude(questionary.Question, "ask")
+        profiler.exclude(prompts, "pause")
+        profiler.exclude(prompts, "more")
+        try:
+            start(profiler)
+        finally:
+            profiler.restore()
+            paths = profiler.dump()
+            profiler.print_summary()
+            print(f"Wrote {len(paths)} action profiles to {profiler.output_dir}.")
+    else:
+        start()
\ No newline at end of file
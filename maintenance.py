@@ -0,0 +1,180 @@
+import sqlite3
+import db_handler as db
+
+# how long a maintenance step waits for the application to release the database, in milliseconds
+BUSY_TIMEOUT_MS = 5000
+# pages returned to the file system per transaction by `incremental_vacuum`, so that writers are only briefly blocked
+VACUUM_STEP_PAGES = 256
+# rows sampled per index by ANALYZE, which bounds its duration on large tables
+ANALYSIS_LIMIT = 1000
+
+def connect_maintenance_db(db_name: str) -> tuple[sqlite3.Connection, sqlite3.Cursor]:
+    """
+    Opens a connection for maintenance, waiting for the application to release the database
+    instead of failing while it writes.
+
+    Args:
+        db_name (str): The name of the database file.
+
+    Returns:
+        tuple[sqlite3.Connection, sqlite3.Cursor]: The connection and its cursor.
+    """
+    con, cursor = db.connect_db(db_name)
+    cursor.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    return con, cursor
+
+def analyze(db_name: str = "habit.db", full: bool = False) -> None:
+    """
+    Refreshes the statistics of the query planner, then lets PRAGMA optimize apply them.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        full (bool, optional): Reads every row of every index, instead of sampling ANALYSIS_LIMIT rows per index,
+            which bounds the duration of the analysis on large tables. Defaults to False.
+    """
+    try:
+        con, cursor = connect_maintenance_db(db_name)
+        cursor.execute(f"PRAGMA analysis_limit = {0 if full else ANALYSIS_LIMIT}")
+        cursor.execute("ANALYZE")
+        cursor.execute("PRAGMA optimize")
+        con.commit()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def incremental_vacuum(db_name: str = "habit.db", max_pages: int | None = None) -> int:
+    """
+    Returns free pages to the file system, VACUUM_STEP_PAGES pages per transaction.
+    Requires the incremental auto-vacuum mode set by `db_handler.initialize_db`.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        max_pages (int | None, optional): The maximum number of pages to free. Defaults to all free pages.
+
+    Returns:
+        int: The number of pages freed.
+    """
+    freed = 0
+    try:
+        con, cursor = connect_maintenance_db(db_name)
+        if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return 0
+        while max_pages is None or freed < max_pages:
+            free_pages = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+            step = min(free_pages, VACUUM_STEP_PAGES if max_pages is None else min(VACUUM_STEP_PAGES, max_pages - freed))
+            if step == 0:
+                break
+            cursor.execute(f"PRAGMA incremental_vacuum({step})").fetchall()
+            freed += free_pages - cursor.execute("PRAGMA freelist_count").fetchone()[0]
+        return freed
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+        return freed
+    finally:
+        con.close()
+
+def integrity_check(db_name: str = "habit.db", quick: bool = False) -> list[str] | None:
+    """
+    Checks the integrity of the database file and its foreign keys.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        quick (bool, optional): Runs PRAGMA quick_check, which skips the verification of index contents.
+            Defaults to False.
+
+    Returns:
+        list[str] | None: The problems found, empty if the database is sound, None if the check failed.
+    """
+    try:
+        con, cursor = connect_maintenance_db(db_name)
+        check = "quick_check" if quick else "integrity_check"
+        problems = [row[0] for row in cursor.execute(f"PRAGMA {check}") if row[0] != "ok"]
+        for table, rowid, parent, _ in cursor.execute("PRAGMA foreign_key_check"):
+            problems.append(f"row {rowid} of {table} references a missing row of {parent}")
+        return problems
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def database_stats(db_name: str = "habit.db") -> dict | None:
+    """
+    Reports the size of the database and of each of its tables and indexes.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        dict | None: None on database error, otherwise a dictionary with the following keys:
+            - "page_size" (int): The size of a page in bytes.
+            - "page_count" (int): The number of pages of the file.
+            - "freelist_count" (int): The number of free pages, reclaimable by `incremental_vacuum`.
+            - "auto_vacuum" (str): The auto-vacuum mode ('none', 'full' or 'incremental').
+            - "objects" (dict[str, int] | None): The size in bytes of every table and index, by name,
+                None if SQLite was built without the dbstat virtual table.
+    """
+    try:
+        con, cursor = connect_maintenance_db(db_name)
+        stats = {
+            "page_size": cursor.execute("PRAGMA page_size").fetchone()[0],
+            "page_count": cursor.execute("PRAGMA page_count").fetchone()[0],
+            "freelist_count": cursor.execute("PRAGMA freelist_count").fetchone()[0],
+            "auto_vacuum": ("none", "full", "incremental")[cursor.execute("PRAGMA auto_vacuum").fetchone()[0]],
+        }
+        try:
+            cursor.execute("""
+                SELECT name, SUM(pgsize) FROM dbstat
+                GROUP BY name
+                ORDER BY SUM(pgsize) DESC, name
+            """)
+            stats["objects"] = dict(cursor.fetchall())
+        except sqlite3.OperationalError:
+            stats["objects"] = None
+        return stats
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def run_maintenance(db_name: str = "habit.db", full_analyze: bool = False, quick_check: bool = True) -> dict:
+    """
+    Runs every maintenance step: integrity check, statistics refresh and incremental vacuum. Every step only
+    holds short transactions and waits for the application to release the database, so it can be scheduled
+    while the application is running.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        full_analyze (bool, optional): Analyzes every row instead of a sample of every index. Defaults to False.
+        quick_check (bool, optional): Runs PRAGMA quick_check instead of the full integrity check. Defaults to True.
+
+    Returns:
+        dict: The problems found by the integrity check ("problems", None if the check failed), the number of pages
+            freed ("freed_pages"), and the database stats before ("before") and after ("after") the maintenance
+            (None if they could not be read).
+    """
+    before = database_stats(db_name)
+    problems = integrity_check(db_name, quick=quick_check)
+    analyze(db_name, full=full_analyze)
+    freed_pages = incremental_vacuum(db_name)
+    return {"problems": problems, "freed_pages": freed_pages, "before": before, "after": database_stats(db_name)}
+
+def print_maintenance_report(report: dict) -> None:
+    """Prints the outcome of `run_maintenance`."""
+    before, after = report["before"], report["after"]
+    if report["problems"] is None:
+        print("Integrity check failed")
+    elif report["problems"]:
+        print("Integrity problems:")
+        for problem in report["problems"]:
+            print(f" - {problem}")
+    else:
+        print("Integrity check: ok")
+    if before is None or after is None:
+        print(f"Freed {report['freed_pages']} pages, database stats unavailable")
+        return
+    print(f"Freed {report['freed_pages']} pages: {before['page_count']} -> {after['page_count']} pages "
+          f"of {after['page_size']} bytes, {after['freelist_count']} free ({after['auto_vacuum']} auto-vacuum)")
+    if after["objects"] is not None:
+        for name, size in after["objects"].items():
+            print(f" - {name}: {size / 1024:.0f}KB")
@@ -0,0 +1,219 @@
+"""
+Memory profiling harness for the analytics and prompts view functions.
+
+Every function is run against a synthetic database under tracemalloc, reporting its peak allocation and the
+allocation sites still holding memory when it returns, and checked against a per-function memory budget.
+
+Run from the repository root with:
+    python memory_profile.py --habits 500 --days 365
+"""
+import argparse
+import json
+import os
+import tempfile
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+import analytics
+from synthetic_data import populate_synthetic_db
+
+KB = 1024
+MB = 1024 * KB
+
+# synthetic database the default budgets are calibrated for
+BUDGET_HABITS = 500
+BUDGET_DAYS = 365
+
+# peak memory allowed per function, for a database of BUDGET_HABITS habits with BUDGET_DAYS days of history
+MEMORY_BUDGETS = {
+    "analytics.fetch_all_habits": 256 * KB,
+    "analytics.fetch_daily_habits": 128 * KB,
+    "analytics.fetch_weekly_habits": 128 * KB,
+    "analytics.fetch_habit_names": 96 * KB,
+    "analytics.count_habits": 16 * KB,
+    "analytics.count_daily_habits": 16 * KB,
+    "analytics.count_weekly_habits": 16 * KB,
+    "analytics.fetch_habit_completion_dates": 128 * KB,
+    "analytics.get_habit_longest_streak": 96 * KB,
+    "analytics.get_habit_with_longest_daily_streak": 384 * KB,
+    "analytics.get_habit_with_longest_weekly_streak": 256 * KB,
+    "analytics.get_daily_habits_completion_ratio": 192 * KB,
+    "analytics.get_weekly_habits_completion_ratio": 192 * KB,
+    "prompts.view_all_habits": 384 * KB,
+    "prompts.view_daily_habits": 192 * KB,
+    "prompts.view_weekly_habits": 192 * KB,
+    "prompts.view_habit_completion_dates": 192 * KB,
+    "prompts.view_longest_streak_of_habit": 128 * KB,
+    "prompts.view_longest_streak_of_all": 768 * KB,
+    "prompts.view_daily_habits_completion_ratio": 256 * KB,
+    "prompts.view_weekly_habits_completion_ratio": 256 * KB,
+}
+
+def profile_memory(func, *args, top: int = 10, **kwargs) -> dict:
+    """
+    Runs a function under tracemalloc.
+
+    Args:
+        func (callable): The function to profile.
+        *args: The positional arguments of the function.
+        top (int, optional): The number of allocation sites to report. Defaults to 10.
+        **kwargs: The keyword arguments of the function.
+
+    Returns:
+        dict: A dictionary with the peak allocation in bytes ("peak") and the largest allocation sites still
+            alive when the function returns, including its result ("sites", a list of (site, bytes) tuples).
+    """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        result = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    sites = [(str(stat.traceback[0]), stat.size) for stat in snapshot.statistics("lineno")[:top]]
+    return {"peak": peak, "sites": sites}
+
+def analytics_functions(habit_name: str) -> dict:
+    """
+    Returns the analytics functions covered by the harness, ready to be called without arguments
+    against the default database.
+
+    Args:
+        habit_name (str): The habit used by the per-habit functions.
+
+    Returns:
+        dict: The functions by qualified name.
+    """
+    return {
+        "analytics.fetch_all_habits": analytics.fetch_all_habits,
+        "analytics.fetch_daily_habits": analytics.fetch_daily_habits,
+        "analytics.fetch_weekly_habits": analytics.fetch_weekly_habits,
+        "analytics.fetch_habit_names": analytics.fetch_habit_names,
+        "analytics.count_habits": analytics.count_habits,
+        "analytics.count_daily_habits": analytics.count_daily_habits,
+        "analytics.count_weekly_habits": analytics.count_weekly_habits,
+        "analytics.fetch_habit_completion_dates": lambda: analytics.fetch_habit_completion_dates(habit_name),
+        "analytics.get_habit_longest_streak": lambda: analytics.get_habit_longest_streak(habit_name),
+        "analytics.get_habit_with_longest_daily_streak": analytics.get_habit_with_longest_daily_streak,
+        "analytics.get_habit_with_longest_weekly_streak": analytics.get_habit_with_longest_weekly_streak,
+        "analytics.get_daily_habits_completion_ratio": analytics.get_daily_habits_completion_ratio,
+        "analytics.get_weekly_habits_completion_ratio": analytics.get_weekly_habits_completion_ratio,
+    }
+
+def prompts_view_functions(habit_name: str) -> dict:
+    """
+    Returns the prompts view functions covered by the harness, made non-interactive: `pause` returns immediately,
+    `more` pages through every screen of the listings and `select_habit` selects the given habit.
+    The output of the views is discarded.
+
+    Args:
+        habit_name (str): The habit selected by the per-habit views.
+
+    Returns:
+        dict: The functions by qualified name.
+    """
+    # imported here so that the analytics harness runs without the interactive dependencies
+    import prompts
+
+    def non_interactive(view):
+        def run():
+            pause, more, select_habit = prompts.pause, prompts.more, prompts.select_habit
+            prompts.pause = lambda: None
+            prompts.more = lambda message: ""
+            prompts.select_habit = lambda: habit_name
+            try:
+                with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                    view()
+            finally:
+                prompts.pause, prompts.more, prompts.select_habit = pause, more, select_habit
+        return run
+
+    names = [name for name in MEMORY_BUDGETS if name.startswith("prompts.")]
+    return {name: non_interactive(getattr(prompts, name.split(".")[1])) for name in names}
+
+@contextmanager
+def synthetic_database(habits: int = BUDGET_HABITS, days: int = BUDGET_DAYS):
+    """
+    Context manager creating a synthetic 'habit.db' in a temporary directory and making it the working directory,
+    so that functions using the default database read the synthetic one.
+
+    Args:
+        habits (int, optional): The number of habits. Defaults to BUDGET_HABITS.
+        days (int, optional): The length of the history in days. Defaults to BUDGET_DAYS.
+
+    Yields:
+        str: The name of a habit of the database.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            populate_synthetic_db("habit.db", habits=habits, days=days)
+            yield analytics.fetch_habit_names()[0]
+        finally:
+            os.chdir(cwd)
+
+def run_harness(functions: dict, budgets: dict = MEMORY_BUDGETS, top: int = 5) -> list[dict]:
+    """
+    Profiles every function and compares its peak allocation with its budget.
+
+    Args:
+        functions (dict): The functions to profile by qualified name.
+        budgets (dict, optional): The peak memory budgets in bytes by qualified name. Defaults to MEMORY_BUDGETS.
+        top (int, optional): The number of allocation sites reported per function. Defaults to 5.
+
+    Returns:
+        list[dict]: For every function, its name, peak, budget (None if not budgeted), allocation sites and
+            whether it stays within budget ("ok").
+    """
+    report = []
+    for name, func in functions.items():
+        profile = profile_memory(func, top=top)
+        budget = budgets.get(name)
+        report.append({
+            "name": name,
+            "peak": profile["peak"],
+            "budget": budget,
+            "sites": profile["sites"],
+            "ok": budget is None or profile["peak"] <= budget,
+        })
+    return report
+
+def print_report(report: list[dict]) -> None:
+    """Prints the harness report as a table, followed by the allocation sites of the functions over budget."""
+    print(f"{'function':50} {'peak':>10} {'budget':>10}")
+    for entry in sorted(report, key=lambda entry: entry["peak"], reverse=True):
+        budget = f"{entry['budget'] / KB:8.0f}KB" if entry["budget"] else "-"
+        status = "" if entry["ok"] else "  OVER BUDGET"
+        print(f"{entry['name']:50} {entry['peak'] / KB:8.0f}KB {budget:>10}{status}")
+    for entry in report:
+        if not entry["ok"]:
+            print(f"\n{entry['name']}:")
+            for site, size in entry["sites"]:
+                print(f"  {size / KB:8.0f}KB  {site}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=BUDGET_HABITS)
+    parser.add_argument("--days", type=int, default=BUDGET_DAYS)
+    parser.add_argument("--budgets", help="JSON file of budgets in bytes by function name, overriding the defaults")
+    parser.add_argument("--no-prompts", action="store_true", help="only profile the analytics functions")
+    args = parser.parse_args()
+
+    budgets = dict(MEMORY_BUDGETS)
+    if args.budgets:
+        with open(args.budgets) as file:
+            budgets.update(json.load(file))
+
+    with synthetic_database(args.habits, args.days) as habit_name:
+        functions = analytics_functions(habit_name)
+        if not args.no_prompts:
+            functions.update(prompts_view_functions(habit_name))
+        report = run_harness(functions, budgets)
+    print_report(report)
+    raise SystemExit(0 if all(entry["ok"] for entry in report) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import shutil
+import sys
+from itertools import islice
+
+# space between two columns of `columns`
+COLUMN_GAP = 2
+
+def screen_height() -> int:
+    """Returns the number of lines of a screen of the pager, leaving room for its prompt."""
+    return max(shutil.get_terminal_size().lines - 2, 1)
+
+def columns(items, item_width: int, width: int | None = None):
+    """
+    Lays out short items of the same width (e.g. dates) in as many columns as fit the terminal, row by row,
+    so that the items are consumed as the lines are.
+
+    Args:
+        items (iterable[str]): The items.
+        item_width (int): The width of every item.
+        width (int | None, optional): The width of the lines. Defaults to the width of the terminal.
+
+    Yields:
+        str: The lines of the layout.
+    """
+    width = width or shutil.get_terminal_size().columns
+    per_line = max((width + COLUMN_GAP) // (item_width + COLUMN_GAP), 1)
+    items = iter(items)
+    while row := list(islice(items, per_line)):
+        yield (" " * COLUMN_GAP).join(item.ljust(item_width) for item in row).rstrip()
+
+def page(lines, offset: int = 0, limit: int | None = None, page_size: int | None = None,
+         output=None, prompt=input) -> int:
+    """
+    Writes lines one screen at a time, asking before every next screen. Every screen is written at once,
+    and lines are only read from the iterable when their screen is written: with a streaming iterable, the
+    first screen appears as soon as its lines are fetched, whatever the total number of lines.
+
+    Args:
+        lines (iterable[str]): The lines to write.
+        offset (int, optional): The number of lines to skip. Defaults to 0.
+        limit (int | None, optional): The maximum number of lines to write. Defaults to all lines.
+        page_size (int | None, optional): The number of lines of a screen. Defaults to the height of the terminal.
+        output (TextIO, optional): The stream written to. Defaults to sys.stdout.
+        prompt (callable, optional): Asks whether to continue, returning 'q' to stop. Defaults to input.
+
+    Returns:
+        int: The number of lines written.
+    """
+    output = output or sys.stdout
+    page_size = page_size or screen_height()
+    lines = islice(lines, offset, None if limit is None else offset + limit)
+    written = 0
+    # the first line of the next screen is read ahead, so that the user is not asked for an empty screen
+    next_line = next(lines, None)
+    while next_line is not None:
+        screen = [next_line, *islice(lines, page_size - 1)]
+        output.write("\n".join(screen) + "\n")
+        output.flush()
+        written += len(screen)
+        next_line = next(lines, None)
+        if next_line is not None and prompt("-- Enter: next page, q: quit --").strip().lower() == "q":
+            break
+    return written
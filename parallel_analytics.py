@@ -0,0 +1,94 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import groupby
+import analytics
+import backends
+from analytics_queries import chunk_completion_dates_query
+
+DEFAULT_CHUNK_SIZE = 500
+
+def analyze_habit_chunk(habits: list[tuple], today: date, db_name: str = "habit.db") -> list[tuple[str, str, int, float]]:
+    """
+    Worker function computing the longest streak and completion ratio for a chunk of habits.
+    The completions of the chunk are streamed over a dedicated read-only connection.
+
+    Args:
+        habits (list[tuple]): The habits of the chunk, as returned by `analytics.fetch_all_habits_with_id`.
+        today (date): The date the completion ratios are computed for.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[tuple[str, str, int, float]]: The habit name, periodicity, longest streak and completion ratio of
+            every habit of the chunk, in the order of the chunk.
+    """
+    stats = {}
+    con, cursor = analytics.connect_db(db_name, read_only=True)
+    try:
+        periodicities = {habit_id: periodicity for habit_id, _, periodicity, _ in habits}
+        query = chunk_completion_dates_query.format(placeholders=", ".join("?" * len(habits)))
+        cursor.execute(query, list(periodicities))
+        for habit_id, rows in groupby(cursor, key=lambda row: row[0]):
+            dates = [date.fromisoformat(completion_date) for _, completion_date in rows]
+            if periodicities[habit_id] == "daily":
+                stats[habit_id] = (analytics.calculate_daily_streak(dates), len(dates))
+            else:
+                stats[habit_id] = (analytics.calculate_weekly_streak(dates), len(dates))
+    finally:
+        con.close()
+
+    results = []
+    for habit_id, habit, periodicity, creation_date in habits:
+        streak, completions = stats.get(habit_id, (0, 0))
+        ratio = analytics.calculate_completion_ratio(periodicity, date.fromisoformat(creation_date), completions, today)
+        results.append((habit, periodicity, streak, ratio))
+    return results
+
+def get_habits_analytics_parallel(db_name: str = "habit.db", workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Computes the leaderboards and completion ratios of all habits by splitting the habits into chunks
+    analyzed by a pool of worker processes, then reducing the partial results.
+    The results are the same as the ones of the sequential functions of the analytics module.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        workers (int | None, optional): The number of worker processes. Defaults to the number of CPUs.
+            With a single worker, or an in-memory database the worker processes cannot open, the chunks are
+            analyzed in the current process.
+        chunk_size (int, optional): The number of habits per chunk. Defaults to 500.
+
+    Returns:
+        dict: A dictionary with the following keys:
+            - "longest_daily_streak" (tuple[str, int]): The habit with the longest daily streak.
+            - "longest_weekly_streak" (tuple[str, int]): The habit with the longest weekly streak.
+            - "daily_completion_ratios" (list[tuple[str, float]]): The completion ratio of every daily habit.
+            - "weekly_completion_ratios" (list[tuple[str, float]]): The completion ratio of every weekly habit.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    workers = workers or os.cpu_count() or 1
+    habits = analytics.fetch_all_habits_with_id(db_name) or []
+    chunks = [habits[i:i + chunk_size] for i in range(0, len(habits), chunk_size)]
+    today = date.today()
+
+    if workers == 1 or len(chunks) <= 1 or not backends.is_persistent(db_name):
+        partial_results = [analyze_habit_chunk(chunk, today, db_name) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            partial_results = list(executor.map(analyze_habit_chunk, chunks, [today] * len(chunks), [db_name] * len(chunks)))
+
+    # chunks are reduced in the order of fetch_all_habits_with_id so that ties are resolved like the sequential functions
+    longest_streaks = {"daily": ("", 0), "weekly": ("", 0)}
+    completion_ratios = {"daily": [], "weekly": []}
+    for partial_result in partial_results:
+        for habit, periodicity, streak, ratio in partial_result:
+            if streak > longest_streaks[periodicity][1]:
+                longest_streaks[periodicity] = (habit, streak)
+            completion_ratios[periodicity].append((habit, ratio))
+
+    return {
+        "longest_daily_streak": longest_streaks["daily"],
+        "longest_weekly_streak": longest_streaks["weekly"],
+        "daily_completion_ratios": sorted(completion_ratios["daily"]),
+        "weekly_completion_ratios": sorted(completion_ratios["weekly"]),
+    }
@@ -0,0 +1,159 @@
+import os
+import sqlite3
+import stat
+from datetime import date
+from pathlib import Path
+import backends
+import db_handler as db
+
+# completion stores maintained by triggers on the 'completions' table, which moving completions would corrupt
+TRIGGER_STORES = ("completion_bitmaps", "completion_intervals")
+
+def partition_file(db_name: str, year: int) -> Path:
+    """
+    Returns the path of the database file of an archived year, next to the main database file.
+
+    Args:
+        db_name (str): The name of the main database file.
+        year (int): The ISO year.
+
+    Returns:
+        Path: The path of the partition file, e.g. 'habit_2024.db' for 'habit.db'.
+    """
+    path = Path(db_name)
+    return path.with_name(f"{path.stem}_{year}{path.suffix}")
+
+def fetch_partitions(db_name: str = "habit.db") -> list[tuple]:
+    """
+    Fetches the archived years, in chronological order.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[tuple]: The year, file, first day, last day and number of completions of every archived year.
+    """
+    try:
+        con, cursor = db.connect_db(db_name)
+        cursor.execute("""
+            SELECT year, file, first_day, last_day, completions
+            FROM completion_partitions
+            ORDER BY year
+        """)
+        return cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def archive_year(year: int, db_name: str = "habit.db") -> int | None:
+    """
+    Moves the completions of a past ISO year to their own database file, which is then read-only: analytics read it
+    through the 'completions' view of `attach_partitions`, while writes and existence checks of current dates only
+    touch the main database file. ISO years are made of whole weeks, so the weekly uniqueness of completions is
+    always checked within a single partition.
+    The move is a single transaction across both files, and is not recorded in the change log since the
+    completions of the database do not change. Completions of habits removed afterwards stay in the partition,
+    hidden by the view.
+
+    Args:
+        year (int): The ISO year to archive, before the current one.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        int | None: The number of completions moved to the partition, None on database error.
+
+    Raises:
+        ValueError: If the year is not in the past or already archived, if the partition file already exists,
+            if SQLite cannot attach one more partition, if the bitmap or interval storage is enabled, or if the
+            database is in memory.
+    """
+    if year >= date.today().isocalendar().year:
+        raise ValueError("Only past years can be archived.")
+    if not backends.is_persistent(db_name):
+        raise ValueError("Only database files can be archived.")
+    path = partition_file(db_name, year)
+    first_day, last_day = db.iso_year_bounds(year)
+    con, cursor = db.connect_db(db_name)
+    try:
+        archived = cursor.execute("SELECT year FROM completion_partitions").fetchall()
+        if (year,) in archived:
+            raise ValueError(f"The year {year} is already archived.")
+        # every partition is attached to the read connections of analytics, along with the main database
+        if len(archived) + 1 >= con.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED):
+            raise ValueError("No more years can be archived.")
+        if any(db.table_exists(cursor, table) for table in TRIGGER_STORES):
+            raise ValueError("The bitmap and interval storages must be disabled to archive completions.")
+        if path.exists():
+            raise ValueError(f"The partition file {path} already exists.")
+
+        cursor.execute("ATTACH ? AS archive", (str(path),))
+        cursor.execute("BEGIN")
+        cursor.execute("""
+            CREATE TABLE archive.completions (
+                id INTEGER PRIMARY KEY,
+                habit_id INTEGER NOT NULL,
+                completion_date TEXT NOT NULL,
+                UNIQUE (habit_id, completion_date)
+            )
+        """)
+        bounds = (first_day.isoformat(), last_day.isoformat())
+        cursor.execute("""
+            INSERT INTO archive.completions (id, habit_id, completion_date)
+            SELECT id, habit_id, completion_date
+            FROM main.completions
+            WHERE completion_date BETWEEN ? AND ?
+            ORDER BY habit_id, completion_date
+        """, bounds)
+        moved = cursor.rowcount
+        # the completions are moved, not removed: the removal is kept out of the change log
+        cursor.execute("DROP TRIGGER log_remove_completion")
+        cursor.execute("""
+            DELETE FROM main.completions WHERE completion_date BETWEEN ? AND ?
+        """, bounds)
+        db.create_change_log_triggers(cursor)
+        cursor.execute("""
+            INSERT INTO completion_partitions (year, file, first_day, last_day, completions)
+            VALUES (?, ?, ?, ?, ?)
+        """, (year, path.name, *bounds, moved))
+        con.commit()
+    except sqlite3.Error as e:
+        con.rollback()
+        print(f"database error: {e}")
+        moved = None
+    finally:
+        con.close()
+    if moved is None:
+        path.unlink(missing_ok=True)
+        return None
+    os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    return moved
+
+def attach_partitions(cursor: sqlite3.Cursor, db_name: str) -> None:
+    """
+    Attaches the archived years to a connection, read-only, and shadows the 'completions' table with a temporary
+    view of the same name, the UNION ALL of the current and archived partitions, so that the queries of
+    analytics_queries read every completion unchanged. SQLite pushes the conditions of a query on the view down
+    to every partition, where they use the index of the partition.
+    Without archived years, nothing is attached and the queries read the 'completions' table directly.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database, outside of any transaction.
+        db_name (str): The name of the database file.
+    """
+    try:
+        partitions = cursor.execute("SELECT year, file FROM completion_partitions ORDER BY year").fetchall()
+    except sqlite3.OperationalError:
+        # the database was not initialized with partitioning
+        return
+    if not partitions:
+        return
+    selects = ["SELECT id, habit_id, completion_date FROM main.completions"]
+    for year, file in partitions:
+        cursor.execute(f"ATTACH ? AS y{year}", (db.partition_uri(db_name, file),))
+        # there are no foreign keys across database files: hide the completions of removed habits
+        selects.append(f"""
+            SELECT id, habit_id, completion_date FROM y{year}.completions
+            WHERE habit_id IN (SELECT id FROM main.habits)
+        """)
+    cursor.execute(f"CREATE TEMP VIEW completions AS {' UNION ALL '.join(selects)}")
@@ -0,0 +1,202 @@
+"""
+Point-in-time variants of the analytics functions: every function computes its result as of an end date, and
+optionally over a period starting at a start date, instead of over the whole history as of today.
+The bounds are pushed into the queries ('completion_date BETWEEN ? AND ?' on the index of the completions), so
+a result as of a past date only reads the completions up to that date. With no bounds, the results are the
+ones of the analytics module.
+"""
+import sqlite3
+from datetime import date, datetime
+import analytics
+import report
+from analytics_queries import (all_habits_as_of_query, periodicity_habits_as_of_query,
+                               habit_completion_dates_between_query, habit_count_completions_between_query)
+
+def fetch_all_habits(end: date | None = None, db_name: str = "habit.db") -> list[tuple]:
+    """
+    Fetch all habits created by a date, in the order of `analytics.fetch_all_habits`.
+
+    Args:
+        end (date | None, optional): The date the habits are listed as of. Defaults to today.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[tuple]: A list of tuples containing the habit name, periodicity, and creation date.
+    """
+    con, cursor = analytics.connect_db(db_name, read_only=True)
+    try:
+        return cursor.execute(all_habits_as_of_query, ((end or date.today()).isoformat(),)).fetchall()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_periodicity_habits(periodicity: str, end: date | None = None, db_name: str = "habit.db") -> list[tuple]:
+    """
+    Fetch the daily or weekly habits created by a date, in the order of `analytics.fetch_daily_habits`.
+
+    Args:
+        periodicity (str): The periodicity of the habits ('daily' or 'weekly').
+        end (date | None, optional): The date the habits are listed as of. Defaults to today.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[tuple]: A list of tuples containing the habit name, periodicity, and creation date.
+    """
+    con, cursor = analytics.connect_db(db_name, read_only=True)
+    try:
+        cursor.execute(periodicity_habits_as_of_query, (periodicity, (end or date.today()).isoformat()))
+        return cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def fetch_habit_completion_dates(habit_name: str, start: date | None = None, end: date | None = None,
+                                 db_name: str = "habit.db") -> list[datetime]:
+    """
+    Fetch the completion dates of a habit within a period, like `analytics.fetch_habit_completion_dates`.
+
+    Args:
+        habit_name (str): The name of the habit.
+        start (date | None, optional): The first date of the period. Defaults to the whole history.
+        end (date | None, optional): The last date of the period. Defaults to the whole history.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[datetime]: A list of datetime objects representing the completion dates.
+    """
+    con, cursor = analytics.connect_db(db_name, read_only=True)
+    try:
+        cursor.execute(habit_completion_dates_between_query, (habit_name, *analytics.date_bounds(start, end)))
+        return [datetime.fromisoformat(row[0]) for row in cursor]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def count_completions(habit_name: str, start: date | None = None, end: date | None = None,
+                      db_name: str = "habit.db") -> int:
+    """
+    Count the completions of a habit within a period.
+
+    Args:
+        habit_name (str): The name of the habit.
+        start (date | None, optional): The first date of the period. Defaults to the whole history.
+        end (date | None, optional): The last date of the period. Defaults to the whole history.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        int: The number of completions.
+    """
+    con, cursor = analytics.connect_db(db_name, read_only=True)
+    try:
+        cursor.execute(habit_count_completions_between_query, (habit_name, *analytics.date_bounds(start, end)))
+        return cursor.fetchone()[0]
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def get_habit_longest_streak(habit_name: str, start: date | None = None, end: date | None = None,
+                             db_name: str = "habit.db") -> int:
+    """
+    Get the longest streak of a habit within a period, like `analytics.get_habit_longest_streak`.
+
+    Args:
+        habit_name (str): The name of the habit.
+        start (date | None, optional): The first date of the period. Defaults to the whole history.
+        end (date | None, optional): The last date of the period. Defaults to the whole history.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        int: The longest streak of completions ('daily' or 'weekly') of the habit within the period.
+    """
+    habit = analytics.fetch_habit_id_and_periodicity(habit_name, db_name)
+    if not habit:
+        return 0
+    dates = fetch_habit_completion_dates(habit_name, start, end, db_name)
+    if not dates:
+        return 0
+    if habit[1] == "daily":
+        return analytics.calculate_daily_streak(dates)
+    return analytics.calculate_weekly_streak(dates)
+
+def get_habit_with_longest_daily_streak(start: date | None = None, end: date | None = None,
+                                        db_name: str = "habit.db") -> tuple[str, int]:
+    """
+    Get the habit with the longest daily streak within a period, like
+    `analytics.get_habit_with_longest_daily_streak`.
+
+    Args:
+        start (date | None, optional): The first date of the period. Defaults to the whole history.
+        end (date | None, optional): The last date of the period. Defaults to the whole history.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        tuple[str, int]: The habit name and its longest daily streak, ("", 0) if there is none.
+    """
+    return report.build_report(db_name, start=start, end=end)["longest_daily_streak"]
+
+def get_habit_with_longest_weekly_streak(start: date | None = None, end: date | None = None,
+                                         db_name: str = "habit.db") -> tuple[str, int]:
+    """
+    Get the habit with the longest weekly streak within a period, like
+    `analytics.get_habit_with_longest_weekly_streak`.
+
+    Args:
+        start (date | None, optional): The first date of the period. Defaults to the whole history.
+        end (date | None, optional): The last date of the period. Defaults to the whole history.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        tuple[str, int]: The habit name and its longest weekly streak, ("", 0) if there is none.
+    """
+    return report.build_report(db_name, start=start, end=end)["longest_weekly_streak"]
+
+def get_daily_habits_completion_ratio(start: date | None = None, end: date | None = None,
+                                      db_name: str = "habit.db") -> list[tuple[str, float]]:
+    """
+    Get the completion ratio of the daily habits created by the end date, over the days of the period they existed,
+    like `analytics.get_daily_habits_completion_ratio`.
+
+    Args:
+        start (date | None, optional): The first date of the period. Defaults to the whole history.
+        end (date | None, optional): The last date of the period. Defaults to today.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[tuple[str, float]]: A list of tuples containing the habit name and the completion ratio.
+    """
+    return report.build_report(db_name, start=start, end=end or date.today())["daily_completion_ratios"]
+
+def get_weekly_habits_completion_ratio(start: date | None = None, end: date | None = None,
+                                       db_name: str = "habit.db") -> list[tuple[str, float]]:
+    """
+    Get the completion ratio of the weekly habits created by the end date, over the weeks of the period they
+    existed, like `analytics.get_weekly_habits_completion_ratio`.
+
+    Args:
+        start (date | None, optional): The first date of the period. Defaults to the whole history.
+        end (date | None, optional): The last date of the period. Defaults to today.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[tuple[str, float]]: A list of tuples containing the habit name and the completion ratio.
+    """
+    return report.build_report(db_name, start=start, end=end or date.today())["weekly_completion_ratios"]
+
+def build_historical_reports(dates: list[date], start: date | None = None, db_name: str = "habit.db") -> dict:
+    """
+    Builds the full report as of every date of a list, e.g. every month end. Every report is a single pass
+    over the habits, reading only the completions of its own period from the index.
+
+    Args:
+        dates (list[date]): The end dates of the reports.
+        start (date | None, optional): The first date of the period of every report. Defaults to the whole history.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        dict: The report of `report.build_report` of every date, by date.
+    """
+    return {end: report.build_report(db_name, start=start, end=end) for end in dates}
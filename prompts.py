@@ -1,18 +1,96 @@
 import questionary
-from datetime import datetime
+from datetime import date, datetime
+from prompt_toolkit.completion import Completer, Completion
 from habit import Habit
+import db_handler as db
+from habit_search import HabitSearchIndex
+from coherent_cache import CoherentCache
 import analytics
+import report
+import pager
+from analytics_queries import (all_habits_query, daily_habits_query, weekly_habits_query,
+                               habit_completion_dates_query, habit_completion_ratios_query)
+
+# above this number of habits, select_habit switches from a list to an autocomplete prompt
+SELECT_HABIT_MAX_CHOICES = 20
+
+_search_index = None
+_cache = None
+
+class HabitCompleter(Completer):
+    """Autocompletes habit names from the habit search index."""
+
+    def __init__(self, index: HabitSearchIndex, limit: int = 10) -> None:
+        self.index = index
+        self.limit = limit
+
+    def get_completions(self, document, complete_event):
+        text = document.text_before_cursor
+        for name in self.index.search(text, self.limit):
+            yield Completion(name, start_position=-len(text))
+
+def get_cache() -> CoherentCache:
+    """Returns the analytics cache, kept coherent with the changes made to the database by other processes."""
+    global _cache
+    if _cache is None:
+        _cache = CoherentCache()
+        _cache.subscribe(update_search_index)
+    return _cache
+
+def update_search_index(changes: list[tuple] | None) -> None:
+    """Applies the habits added, removed and renamed in the database to the habit search index."""
+    global _search_index
+    if _search_index is None:
+        return
+    if changes is None:
+        _search_index = HabitSearchIndex(analytics.fetch_habit_names())
+        return
+    for _, operation, habit, new_habit in changes:
+        if operation == "add_habit":
+            _search_index.add(habit)
+        elif operation == "remove_habit":
+            _search_index.remove(habit)
+        elif operation == "rename_habit":
+            _search_index.remove(habit)
+            _search_index.add(new_habit)
+
+def get_search_index() -> HabitSearchIndex:
+    """Returns the habit search index, building it from the database on first use and keeping it up to date."""
+    global _search_index
+    cache = get_cache()
+    if _search_index is None:
+        _search_index = HabitSearchIndex(analytics.fetch_habit_names())
+    else:
+        cache.validate()
+    return _search_index
 
 def pause() -> None:
     """Makes a pause between prompts to avoid getting lost with outputs."""
     input("Press Enter to continue..\n")
 
+def more(message: str) -> str:
+    """Asks with the message of the pager whether to show the next screen of a long listing, returning 'q' to stop."""
+    return input(message)
+
+def page(lines) -> int:
+    """Shows the lines of a listing one screen at a time, returning the number of lines shown."""
+    return pager.page(lines, prompt=more)
+
 def select_habit() -> str | None:
-    """Prompt the user to select a habit from the list of habits."""
-    if analytics.count_habits() > 0:
+    """Prompt the user to select a habit from the list of habits, or to search it when there are too many habits to list."""
+    index = get_search_index()
+    if len(index) > SELECT_HABIT_MAX_CHOICES:
+        habit_name = questionary.autocomplete(
+            "Search the habit:",
+            choices=[],
+            completer=HabitCompleter(index),
+            validate=lambda text: text in index or "Unknown habit, pick one of the suggestions."
+        ).ask()
+        return habit_name
+    elif len(index) > 0:
         habit_name = questionary.select(
             "Select the habit:",
-            choices=[habit[0] for habit in analytics.fetch_all_habits()]
+            choices=[habit[0] for habit in get_cache().fetch_all_habits()]
         ).ask()
         return habit_name
     else:
@@ -50,12 +128,15 @@ def create_habit() -> None:
     ).ask()
 
     if habit_name:
-        if Habit.exists(habit_name):
+        new_habit = Habit(habit_name, periodicity)
+        status = new_habit.save_if_absent()
+        if status == db.INSERTED:
+            get_search_index().add(habit_name)
+            print(f"Habit '{habit_name}' added successfully.")
+        elif status == db.ALREADY_EXISTS:
             print(f"Habit '{habit_name}' already exists.")
         else:
-            new_habit = Habit(habit_name, periodicity)
-            Habit.save(new_habit)
-            print(f"Habit '{habit_name}' added successfully.")
+            print(f"Habit '{habit_name}' could not be added.")
         pause()
     else:
         print("Error: Habit name is required.")
@@ -66,63 +147,64 @@ def remove_habit() -> None:
     habit_name = select_habit()
     if habit_name is not None:
         Habit.remove(habit_name)
+        get_search_index().remove(habit_name)
         print(f"Habit '{habit_name}' removed successfully.")
         pause()
 
 def add_completion_date() -> None:
     """Prompts the user with a list of existing habits and asks to enter a completion date with format (DD.MM.YYYY)."""
     habit_name = select_habit()
-    periodicity = analytics.fetch_habit_periodicity(habit_name)
-    if habit_name is not None:
-        completion_date = enter_date()
-    if periodicity == "daily" and Habit.completion_date_exists(habit_name, completion_date):
+    if habit_name is None:
+        return
+    completion_date = enter_date()
+    status = Habit.add_completion_date_if_absent(habit_name, completion_date)
+    if status == db.INSERTED:
+        print(f"Completion added for habit '{habit_name}' on {completion_date}.")
+    elif status == db.ALREADY_EXISTS:
         print(f"Completion already exists for habit '{habit_name}' on {completion_date}.")
-    elif periodicity == "weekly" and Habit.completion_week_exists(habit_name, completion_date):
+    elif status == db.SAME_WEEK_EXISTS:
         print(f"Completion already exists for habit '{habit_name}' on the week of {completion_date}.")
-    else:
-        Habit.add_completion_date(habit_name, completion_date)
-        print(f"Completion added for habit '{habit_name}' on {completion_date}.")
+    elif status == db.UNKNOWN_HABIT:
+        print(f"Habit '{habit_name}' does not exist anymore.")
+    elif status == db.ARCHIVED:
+        print(f"The completions of {completion_date.isocalendar().year} are archived and cannot be changed.")
     pause()
 
 def remove_completion_date() -> None:
     """Prompts the user with a list of existing habits and asks to enter a completion date with format (DD.MM.YYY) he wants to remove from the DB."""
     habit_name = select_habit()
-    if habit_name is not None:
-        completion_date = enter_date()
-    if Habit.completion_date_exists(habit_name, completion_date):
-        Habit.remove_completion_date(habit_name, completion_date)
-        print(f"Completion removed for habit '{habit_name}' on {completion_date}.")
-    else:
+    if habit_name is None:
+        return
+    completion_date = enter_date()
+    if not Habit.completion_date_exists(habit_name, completion_date):
         print(f"No completion found for habit '{habit_name}' on {completion_date}.")
+        pause()
+        return
+    status = Habit.remove_completion_date(habit_name, completion_date)
+    if status == db.REMOVED:
+        print(f"Completion removed for habit '{habit_name}' on {completion_date}.")
+    elif status == db.ARCHIVED:
+        print(f"The completions of {completion_date.isocalendar().year} are archived and cannot be changed.")
     pause()
 
 def view_all_habits() -> None:
     """Enables user to get access to the analytics module by calling the corresponding function."""
-    habits = analytics.fetch_all_habits()
-    if habits:
-        for habit in habits:
-            print(f" - {habit[0]} - {habit[1]} (created on {habit[2]})")
-    else:
+    habits = analytics.stream_rows(all_habits_query)
+    if page(f" - {habit} - {periodicity} (created on {creation_date})" for habit, periodicity, creation_date in habits) == 0:
         print("No habits found.")
     pause()
 
 def view_daily_habits() -> None:
     """Enables user to get access to the analytics module by calling the corresponding function."""
-    habits = analytics.fetch_daily_habits()
-    if habits:
-        for habit in habits:
-            print(f" - {habit[0]} (created on {habit[2]})")
-    else:
+    habits = analytics.stream_rows(daily_habits_query)
+    if page(f" - {habit} (created on {creation_date})" for habit, _, creation_date in habits) == 0:
         print("No daily habits found.")
     pause()
 
 def view_weekly_habits() -> None:
     """Enables user to get access to the analytics module by calling the corresponding function."""
-    habits = analytics.fetch_weekly_habits()
-    if habits:
-        for habit in habits:
-            print(f" - {habit[0]} (created on {habit[2]})")
-    else:
+    habits = analytics.stream_rows(weekly_habits_query)
+    if page(f" - {habit} (created on {creation_date})" for habit, _, creation_date in habits) == 0:
         print("No weekly habits found.")
     pause()
 
@@ -130,11 +212,8 @@ def view_habit_completion_dates() -> None:
     """Enables user to get access to the analytics module by calling the corresponding function."""
     habit_name = select_habit()
     if habit_name is not None:
-        dates = analytics.fetch_habit_completion_dates(habit_name)
-        if dates:
-            for date in dates:
-                print(f" - {date.date()}")
-        else:
+        dates = (row[0] for row in analytics.stream_rows(habit_completion_dates_query, (habit_name,)))
+        if page(pager.columns(dates, len("YYYY-MM-DD"))) == 0:
             print("No completion dates found.")
         pause()
 
@@ -142,7 +221,7 @@ def view_longest_streak_of_habit() -> None:
     """Enables user to get access to the analytics module by calling the corresponding function."""
     habit_name = select_habit()
     if habit_name is not None:
-        longest_streak = analytics.get_habit_longest_streak(habit_name)
+        longest_streak = get_cache().get_habit_longest_streak(habit_name)
         periodicity = analytics.fetch_habit_periodicity(habit_name)
         formatted_period = (lambda x: "days" if x == "daily" else "weeks")(periodicity)
         if longest_streak == 0:
@@ -161,10 +240,10 @@ def view_longest_streak_of_all() -> None:
     if analytics.count_habits == 0:
         print("No habits found.")
     else:
-        daily_streak = analytics.get_habit_with_longest_daily_streak()
+        daily_streak = get_cache().get_habit_with_longest_daily_streak()
         if daily_streak[1] == 0:
             print("No daily streak found.")
-        weekly_streak = analytics.get_habit_with_longest_weekly_streak()
+        weekly_streak = get_cache().get_habit_with_longest_weekly_streak()
         if weekly_streak[1] == 0:
             print("No weekly streak found.")
 
@@ -174,20 +253,28 @@ def view_longest_streak_of_all() -> None:
 
 def view_daily_habits_completion_ratio() -> None:
     """Enables user to get access to the analytics module by calling the corresponding function."""
-    if analytics.count_daily_habits() == 0:
+    ratios = analytics.stream_rows(habit_completion_ratios_query, (date.today().isoformat(), "daily"))
+    if page(f" - {habit}: {completion_ratio * 100:.2f}%" for habit, completion_ratio in ratios) == 0:
         print("No daily habits found.")
-    else:
-        ratio = analytics.get_daily_habits_completion_ratio()
-        for habit, completion_ratio in ratio:
-            print(f" - {habit}: {completion_ratio *100:.2f}%")
     pause()
 
 def view_weekly_habits_completion_ratio() -> None:
     """Enables user to get access to the analytics module by calling the corresponding function."""
-    if analytics.count_weekly_habits() == 0:
+    ratios = analytics.stream_rows(habit_completion_ratios_query, (date.today().isoformat(), "weekly"))
+    if page(f" - {habit}: {completion_ratio * 100:.2f}%" for habit, completion_ratio in ratios) == 0:
         print("No weekly habits found.")
-    else:
-        ratio = analytics.get_weekly_habits_completion_ratio()
-        for habit, completion_ratio in ratio:
-            print(f" - {habit}: {completion_ratio *100:.2f}%")
+    pause()
+
+def format_habit_report(habit: report.HabitReport) -> str:
+    """Formats the analytics of a habit as a line of the full report."""
+    period = "days" if habit.periodicity == "daily" else "weeks"
+    return (f" - {habit.habit} ({habit.periodicity}): {habit.completions} completions, "
+            f"{habit.completion_ratio * 100:.2f}%, current streak {habit.current_streak} {period}, "
+            f"longest streak {habit.longest_streak} {period}, last completed {habit.last_completion or 'never'}")
+
+def view_report() -> None:
+    """Prints the analytics of every habit, computed at once by the report engine."""
+    habits_report = get_cache().get(("report", date.today()), report.build_report)
+    if page(format_habit_report(habit) for habit in habits_report["habits"]) == 0:
+        print("No habits found.")
     pause()
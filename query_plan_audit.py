@@ -0,0 +1,245 @@
+"""
+Query plan audit of the analytics queries.
+
+Every query of analytics_queries.py is run with EXPLAIN QUERY PLAN against a seeded synthetic database, and
+flagged if SQLite reads a whole table of the database or sorts its result in a temporary B-tree. Scans of
+common table expressions and subqueries are intermediate results and are not flagged. For flagged queries
+on a single table, a covering index is suggested.
+
+Run from the repository root with:
+    python query_plan_audit.py [--db habit.db]
+"""
+import argparse
+import os
+import re
+import sqlite3
+import tempfile
+import analytics_queries
+from synthetic_data import populate_synthetic_db
+
+# tables read whole by design, by query: their scan is accepted as long as it goes through a covering index
+FULL_SCAN_QUERIES = {
+    "all_habits_query": {"habits"},
+    "all_habits_with_id_query": {"habits"},
+    "habit_names_query": {"habits"},
+    "count_habits_query": {"habits"},
+    # the ratio of every group, from all of its members
+    "group_completion_ratio_query": {"habit_groups", "habit_group_members"},
+    # the members of any group, whose streaks are ranked
+    "group_best_streak_query": {"habit_group_members"},
+}
+
+# tables accepted with a plain table scan, by query, each with the reason no covering index helps
+TABLE_SCAN_QUERIES = {
+    # the report reads every column of every habit in id order, which is the order of the table itself:
+    # a covering index would be a copy of the table
+    "report_stream_query": {"habits"},
+}
+
+# temporary B-tree sorts accepted by query, with how many times each occurs: they sort intermediate results
+# (window functions, aggregates over CTEs, computed rankings), which no index can order
+TEMP_SORT_QUERIES = {
+    "group_best_streak_query": {
+        # the weeks of the completions of weekly habits
+        "USE TEMP B-TREE FOR DISTINCT": 1,
+        # the islands and streaks of the periods
+        "USE TEMP B-TREE FOR GROUP BY": 2,
+        # the two window functions ranking periods and streaks, and the groups of the result
+        "USE TEMP B-TREE FOR ORDER BY": 3,
+    },
+    # the days of the range, generated by a recursive CTE
+    "group_daily_completion_rate_query": {"USE TEMP B-TREE FOR GROUP BY": 1},
+    # the page of the computed ratios
+    "ranked_completion_ratio_query": {"USE TEMP B-TREE FOR ORDER BY": 1},
+}
+
+# number of "?" placeholders the chunked queries are formatted with
+CHUNK_PLACEHOLDERS = 3
+
+def registered_queries() -> dict[str, str]:
+    """
+    Returns the queries covered by the audit: every module-level string of analytics_queries.py whose name
+    ends with '_query'. Queries with a {placeholders} slot are formatted with CHUNK_PLACEHOLDERS placeholders.
+
+    Returns:
+        dict[str, str]: The SQL of every query by name.
+    """
+    queries = {}
+    for name, sql in sorted(vars(analytics_queries).items()):
+        if name.endswith("_query") and isinstance(sql, str):
+            queries[name] = sql.format(placeholders=", ".join("?" * CHUNK_PLACEHOLDERS)) if "{placeholders}" in sql else sql
+    return queries
+
+def explain_query(cursor: sqlite3.Cursor, sql: str) -> list[str]:
+    """
+    Returns the query plan of a query, binding a sample value to each of its parameters.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database.
+        sql (str): The query.
+
+    Returns:
+        list[str]: The detail of every step of the plan, in order.
+    """
+    parameters = [1] * sql.count("?")
+    return [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+
+def table_aliases(sql: str) -> dict[str, str]:
+    """
+    Returns the tables read by a query under each of their aliases, including the tables without alias.
+
+    Args:
+        sql (str): The query.
+
+    Returns:
+        dict[str, str]: The table (or common table expression) by alias.
+    """
+    keywords = {"ON", "WHERE", "JOIN", "LEFT", "INNER", "CROSS", "GROUP", "ORDER", "LIMIT", "USING"}
+    aliases = {}
+    for table, alias in re.findall(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", sql, re.IGNORECASE):
+        aliases[table] = table
+        if alias and alias.upper() not in keywords:
+            aliases[alias] = table
+    return aliases
+
+def plan_issues(name: str, sql: str, plan: list[str], tables: set[str]) -> list[str]:
+    """
+    Flags the steps of a query plan that read a whole table or sort in a temporary B-tree, apart from the
+    scans and sorts the query is exempted from.
+
+    Args:
+        name (str): The name of the query.
+        sql (str): The query.
+        plan (list[str]): The query plan, as returned by `explain_query`.
+        tables (set[str]): The tables of the database; scans of anything else are intermediate results.
+
+    Returns:
+        list[str]: A description of every flagged step, empty if the plan is fully indexed.
+    """
+    aliases = table_aliases(sql)
+    accepted_sorts = dict(TEMP_SORT_QUERIES.get(name, {}))
+    issues = []
+    for step in plan:
+        if step.startswith("SCAN "):
+            scanned = aliases.get(step.split()[1], step.split()[1])
+            covering_scan = "USING COVERING INDEX" in step
+            accepted = scanned in TABLE_SCAN_QUERIES.get(name, ()) or \
+                (scanned in FULL_SCAN_QUERIES.get(name, ()) and covering_scan)
+            if scanned in tables and not accepted:
+                issues.append(f"full scan: {step}")
+        elif "USE TEMP B-TREE" in step:
+            if accepted_sorts.get(step, 0) > 0:
+                accepted_sorts[step] -= 1
+            else:
+                issues.append(f"temp sort: {step}")
+    return issues
+
+def suggest_index(sql: str) -> str | None:
+    """
+    Suggests a covering index for a query on a single table: the columns compared for equality in the
+    WHERE clause, then the ORDER BY columns, then the other selected columns.
+
+    Args:
+        sql (str): The query.
+
+    Returns:
+        str | None: The CREATE INDEX statement, None if the query reads several tables.
+    """
+    normalized = " ".join(sql.split())
+    match = re.fullmatch(
+        r"SELECT (?P<columns>.+?) FROM (?P<table>\w+)(?: WHERE (?P<where>.+?))?(?: ORDER BY (?P<order>.+?))?",
+        normalized, re.IGNORECASE,
+    )
+    if match is None or "SELECT" in (match["where"] or "").upper():
+        return None
+    index_columns = re.findall(r"(\w+)\s*=", match["where"] or "")
+    for column in (match["order"] or "").split(","):
+        column = re.sub(r"\s+(ASC|DESC)$", "", column.strip(), flags=re.IGNORECASE)
+        if column and column not in index_columns:
+            index_columns.append(column)
+    for column in match["columns"].split(","):
+        column = column.strip()
+        if re.fullmatch(r"\w+", column) and column != "id" and column not in index_columns:
+            index_columns.append(column)
+    if not index_columns:
+        return None
+    table = match["table"]
+    return f"CREATE INDEX idx_{table}_{'_'.join(index_columns)} ON {table} ({', '.join(index_columns)})"
+
+def audit_queries(db_name: str, queries: dict[str, str] | None = None) -> list[dict]:
+    """
+    Explains every query against a database and flags its plan.
+
+    Args:
+        db_name (str): The name of the database file, initialized and preferably analyzed.
+        queries (dict[str, str] | None, optional): The SQL of the queries by name. Defaults to the registered queries.
+
+    Returns:
+        list[dict]: For every query, its name, plan, issues and suggested index (None if the plan has no issue).
+    """
+    queries = registered_queries() if queries is None else queries
+    con = sqlite3.connect(db_name)
+    try:
+        cursor = con.cursor()
+        tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_schema WHERE type = 'table'")}
+        report = []
+        for name, sql in queries.items():
+            plan = explain_query(cursor, sql)
+            issues = plan_issues(name, sql, plan, tables)
+            report.append({
+                "name": name,
+                "plan": plan,
+                "issues": issues,
+                "suggestion": suggest_index(sql) if issues else None,
+            })
+        return report
+    finally:
+        con.close()
+
+def seed_audit_db(db_name: str, habits: int = 200, days: int = 60) -> None:
+    """
+    Creates a synthetic database for the audit and gathers its statistics, so that the planner chooses
+    the plans it would choose on a real history.
+
+    Args:
+        db_name (str): The name of the database file to create.
+        habits (int, optional): The number of habits. Defaults to 200.
+        days (int, optional): The length of the history in days. Defaults to 60.
+    """
+    populate_synthetic_db(db_name, habits=habits, days=days)
+    con = sqlite3.connect(db_name)
+    try:
+        con.execute("ANALYZE")
+        con.commit()
+    finally:
+        con.close()
+
+def print_report(report: list[dict]) -> None:
+    """Prints the plan of every query, its issues and the suggested index."""
+    for entry in report:
+        status = "ok" if not entry["issues"] else "FLAGGED"
+        print(f"{entry['name']}: {status}")
+        for step in entry["plan"]:
+            print(f"    {step}")
+        for issue in entry["issues"]:
+            print(f"  ! {issue}")
+        if entry["suggestion"]:
+            print(f"  suggestion: {entry['suggestion']}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="audit an existing database instead of a synthetic one")
+    args = parser.parse_args()
+
+    if args.db:
+        report = audit_queries(args.db)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_name = os.path.join(tmp, "habit.db")
+            seed_audit_db(db_name)
+            report = audit_queries(db_name)
+    print_report(report)
+    raise SystemExit(0 if all(not entry["issues"] for entry in report) else 1)
+
+if __name__ == "__main__":
+    main()
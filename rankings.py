@@ -0,0 +1,74 @@
+import heapq
+import sqlite3
+from datetime import date
+import analytics
+from analytics_queries import ranked_completion_ratio_query
+from report import stream_habit_reports
+
+# metrics habits can be ranked by, as named in report.HabitReport
+METRICS = ("longest_streak", "current_streak", "completion_ratio")
+
+def rank_habits(metric: str, limit: int = 10, offset: int = 0, periodicity: str | None = None,
+                ascending: bool = False, db_name: str = "habit.db", today: date | None = None) -> list[tuple]:
+    """
+    Returns one page of the habits ranked by a metric. Ties are ranked by habit name.
+    Only the first `offset + limit` habits of the ranking are ever kept in memory: completion ratios are ranked
+    by SQLite with ORDER BY ... LIMIT, and streaks with a bounded heap over the one-pass report stream.
+
+    Args:
+        metric (str): The metric to rank by, one of METRICS.
+        limit (int, optional): The number of habits of the page. Defaults to 10.
+        offset (int, optional): The number of habits ranked before the page. Defaults to 0.
+        periodicity (str | None, optional): Only rank the 'daily' or 'weekly' habits. Defaults to all habits.
+        ascending (bool, optional): Rank the lowest values first. Defaults to False.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        today (date | None, optional): The date the ratios and current streaks are computed for. Defaults to today.
+
+    Returns:
+        list[tuple]: The habit name and the value of the metric of every habit of the page, in ranking order.
+
+    Raises:
+        ValueError: If the metric is unknown, or the limit or offset is negative.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Habits can only be ranked by {', '.join(METRICS)}.")
+    if limit < 0 or offset < 0:
+        raise ValueError("The limit and offset must not be negative.")
+    today = today or date.today()
+
+    if metric == "completion_ratio":
+        try:
+            con, cursor = analytics.connect_db(db_name, read_only=True)
+            periodicities = (periodicity, periodicity) if periodicity else ("daily", "weekly")
+            cursor.execute(ranked_completion_ratio_query, (
+                today.isoformat(), *periodicities, -1 if ascending else 1, limit, offset
+            ))
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"database error: {e}")
+        finally:
+            con.close()
+
+    sign = 1 if ascending else -1
+    reports = (
+        (report.habit, getattr(report, metric)) for report in stream_habit_reports(db_name, today)
+        if periodicity is None or report.periodicity == periodicity
+    )
+    ranked = heapq.nsmallest(offset + limit, reports, key=lambda item: (sign * item[1], item[0]))
+    return ranked[offset:]
+
+def top_habits(metric: str, limit: int = 10, offset: int = 0, periodicity: str | None = None,
+               db_name: str = "habit.db", today: date | None = None) -> list[tuple]:
+    """
+    Returns one page of the best habits by a metric, e.g. the leaderboard of the longest streaks.
+    See `rank_habits` for the arguments.
+    """
+    return rank_habits(metric, limit, offset, periodicity, False, db_name, today)
+
+def bottom_habits(metric: str, limit: int = 10, offset: int = 0, periodicity: str | None = None,
+                  db_name: str = "habit.db", today: date | None = None) -> list[tuple]:
+    """
+    Returns one page of the worst habits by a metric, e.g. the habits at risk with the lowest completion ratios.
+    See `rank_habits` for the arguments.
+    """
+    return rank_habits(metric, limit, offset, periodicity, True, db_name, today)
@@ -0,0 +1,157 @@
+import sqlite3
+from pathlib import Path
+import analytics
+import db_handler as db
+
+def fetch_changes_since(seq: int, db_name: str = "habit.db", limit: int | None = None) -> list[tuple]:
+    """
+    Fetch the entries of the change log written after a given sequence number.
+
+    Args:
+        seq (int): The last sequence number already known by the caller (0 to fetch all changes).
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        limit (int | None, optional): The maximum number of changes to fetch. Defaults to no limit.
+
+    Returns:
+        list[tuple]: A list of tuples containing the sequence number, operation, habit name, periodicity,
+            date and new habit name (for renames) of every change, in sequence order.
+    """
+    con, cursor = analytics.connect_db(db_name, read_only=True)
+    try:
+        cursor.execute("""
+            SELECT seq, operation, habit, periodicity, change_date, new_habit
+            FROM change_log
+            WHERE seq > ?
+            ORDER BY seq
+            LIMIT ?
+        """, (seq, -1 if limit is None else limit))
+        return cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def apply_change(cursor: sqlite3.Cursor, change: tuple) -> None:
+    """
+    Applies a single change log entry to a database. Applying a change twice has no further effect.
+
+    Args:
+        cursor (sqlite3.Cursor): A cursor on the database receiving the change.
+        change (tuple): The change, as returned by `fetch_changes_since`.
+    """
+    _, operation, habit, periodicity, change_date, new_habit = change
+    if operation == "add_habit":
+        cursor.execute("""
+            INSERT OR IGNORE INTO habits (habit, periodicity, creation_date)
+            VALUES (?, ?, ?)
+        """, (habit, periodicity, change_date))
+    elif operation == "remove_habit":
+        cursor.execute("""
+            DELETE FROM habits
+            WHERE habit = ?
+        """, (habit,))
+    elif operation == "rename_habit":
+        cursor.execute("""
+            UPDATE habits
+            SET habit = ?
+            WHERE habit = ?
+        """, (new_habit, habit))
+    elif operation == "add_completion":
+        cursor.execute("""
+            INSERT OR IGNORE INTO completions (habit_id, completion_date)
+            VALUES ((SELECT id FROM habits WHERE habit = ?), ?)
+        """, (habit, change_date))
+    elif operation == "remove_completion":
+        cursor.execute("""
+            DELETE FROM completions
+            WHERE habit_id = (SELECT id FROM habits WHERE habit = ?) AND completion_date = ?
+        """, (habit, change_date))
+    else:
+        raise ValueError(f"Unknown change log operation '{operation}'.")
+
+def get_replicated_seq(source: str, db_name: str) -> int:
+    """
+    Returns the last sequence number of a source database already applied to a replica.
+
+    Args:
+        source (str): The name of the source database file.
+        db_name (str): The name of the replica database file.
+
+    Returns:
+        int: The last applied sequence number, 0 if nothing was replicated yet.
+    """
+    con, cursor = db.connect_db(db_name)
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS replication_state (
+                source TEXT PRIMARY KEY,
+                last_seq INTEGER NOT NULL
+            )
+        """)
+        con.commit()
+        row = cursor.execute("""
+            SELECT last_seq FROM replication_state WHERE source = ?
+        """, (str(Path(source).resolve()),)).fetchone()
+        return row[0] if row else 0
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
+
+def apply_changes(changes: list[tuple], source: str, db_name: str) -> int:
+    """
+    Applies a batch of changes from a source database to a replica in a single transaction,
+    together with the new replication position of the source.
+
+    Args:
+        changes (list[tuple]): The changes to apply, as returned by `fetch_changes_since`.
+        source (str): The name of the source database file.
+        db_name (str): The name of the replica database file.
+
+    Returns:
+        int: The number of changes applied.
+    """
+    if not changes:
+        return 0
+    con, cursor = db.connect_db(db_name)
+    try:
+        for change in changes:
+            apply_change(cursor, change)
+        cursor.execute("""
+            INSERT INTO replication_state (source, last_seq)
+            VALUES (?, ?)
+            ON CONFLICT (source) DO UPDATE SET last_seq = excluded.last_seq
+        """, (str(Path(source).resolve()), changes[-1][0]))
+        con.commit()
+        return len(changes)
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+        return 0
+    finally:
+        con.close()
+
+def sync(source: str, db_name: str, batch_size: int = 1000) -> int:
+    """
+    Replicates the changes of a source database not yet applied to a replica.
+    The cost of a sync grows with the number of new changes, not with the size of the databases.
+
+    Args:
+        source (str): The name of the source database file.
+        db_name (str): The name of the replica database file, initialized with `db_handler.initialize_db`.
+        batch_size (int, optional): The number of changes applied per transaction. Defaults to 1000.
+
+    Returns:
+        int: The number of changes applied.
+    """
+    applied = 0
+    seq = get_replicated_seq(source, db_name)
+    while True:
+        changes = fetch_changes_since(seq, source, limit=batch_size)
+        if not changes:
+            return applied
+        batch_applied = apply_changes(changes, source, db_name)
+        if batch_applied == 0:
+            # the batch was rolled back, the next sync resumes from the last applied sequence number
+            return applied
+        applied += batch_applied
+        seq = changes[-1][0]
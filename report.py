@@ -0,0 +1,173 @@
+from datetime import date, timedelta
+from typing import Iterator, NamedTuple
+import analytics
+from analytics_queries import report_stream_query
+
+class HabitReport(NamedTuple):
+    """Analytics of a single habit, as computed by the report engine."""
+    habit: str
+    periodicity: str
+    creation_date: date
+    completions: int
+    longest_streak: int
+    current_streak: int
+    completion_ratio: float
+    last_completion: date | None
+
+def continues_streak(periodicity: str, previous: date, current: date) -> bool:
+    """
+    Checks if a completion continues the streak of the previous completion of a habit.
+
+    Args:
+        periodicity (str): The periodicity of the habit ('daily' or 'weekly').
+        previous (date): The previous completion date.
+        current (date): The completion date.
+
+    Returns:
+        bool: True if the completion is on the day (or week) following the previous one, False otherwise.
+    """
+    if periodicity == "daily":
+        return current - previous == timedelta(days=1)
+    return analytics.is_next_week(previous, current)
+
+def is_streak_alive(periodicity: str, last_completion: date, today: date) -> bool:
+    """
+    Checks if a streak ending with a completion can still be extended, i.e. if the last completion is in the
+    current or the previous period.
+
+    Args:
+        periodicity (str): The periodicity of the habit ('daily' or 'weekly').
+        last_completion (date): The last completion date of the streak.
+        today (date): The current date.
+
+    Returns:
+        bool: True if the streak is still running, False otherwise.
+    """
+    if periodicity == "daily":
+        return 0 <= (today - last_completion).days <= 1
+    return analytics.is_same_week(last_completion, today) or analytics.is_next_week(last_completion, today)
+
+def stream_habit_reports(db_name: str = "habit.db", today: date | None = None, start: date | None = None,
+                         end: date | None = None) -> Iterator[HabitReport]:
+    """
+    Streams the analytics of every habit in a single pass over the completions, ordered by habit and date.
+    Only the state of the current habit is kept, so memory does not grow with the number of habits or completions.
+    With a start or end date, the report is computed as of that period: habits created after the end date and
+    completions outside of the period are left out by the query itself, using the index of the completions.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        today (date | None, optional): The date the ratios and current streaks are computed for.
+            Defaults to the end date, or today.
+        start (date | None, optional): The first date of the period. Defaults to the whole history.
+        end (date | None, optional): The last date of the period. Defaults to the whole history.
+
+    Yields:
+        HabitReport: The analytics of every habit, in the order of their creation in the database.
+    """
+    today = today or end or date.today()
+    first_day, last_day = analytics.date_bounds(start, end)
+    con, cursor = analytics.connect_db(db_name, read_only=True)
+    try:
+        cursor.execute(report_stream_query, (first_day, last_day, last_day))
+        current_id = None
+        for habit_id, habit, periodicity, creation_date, completion_date in cursor:
+            if habit_id != current_id:
+                if current_id is not None:
+                    yield build_habit_report(*current_habit, completions, longest_streak, streak, last_completion,
+                                             today, start)
+                current_id = habit_id
+                current_habit = (habit, periodicity, date.fromisoformat(creation_date))
+                completions, longest_streak, streak, last_completion = 0, 0, 0, None
+            if completion_date is None:
+                continue
+            completion_date = date.fromisoformat(completion_date)
+            completions += 1
+            if last_completion is None:
+                streak = 1
+            elif periodicity == "weekly" and analytics.is_same_week(last_completion, completion_date):
+                # a second completion in the same week neither extends nor breaks the streak
+                pass
+            elif continues_streak(periodicity, last_completion, completion_date):
+                streak += 1
+            else:
+                streak = 1
+            longest_streak = max(longest_streak, streak)
+            last_completion = completion_date
+        if current_id is not None:
+            yield build_habit_report(*current_habit, completions, longest_streak, streak, last_completion, today, start)
+    finally:
+        con.close()
+
+def build_habit_report(habit: str, periodicity: str, creation_date: date, completions: int, longest_streak: int,
+                       streak: int, last_completion: date | None, today: date,
+                       start: date | None = None) -> HabitReport:
+    """
+    Builds the report of a habit from the state accumulated by `stream_habit_reports`.
+
+    Args:
+        habit (str): The name of the habit.
+        periodicity (str): The periodicity of the habit ('daily' or 'weekly').
+        creation_date (date): The date the habit was created.
+        completions (int): The number of completions of the habit.
+        longest_streak (int): The longest streak of the habit.
+        streak (int): The streak ending with the last completion.
+        last_completion (date | None): The last completion date, None if the habit was never completed.
+        today (date): The date the ratio and current streak are computed for.
+        start (date | None, optional): The first date of the period of the report; the ratio is computed from
+            this date for habits created before it. Defaults to the whole history.
+
+    Returns:
+        HabitReport: The analytics of the habit.
+    """
+    alive = last_completion is not None and is_streak_alive(periodicity, last_completion, today)
+    return HabitReport(
+        habit=habit,
+        periodicity=periodicity,
+        creation_date=creation_date,
+        completions=completions,
+        longest_streak=longest_streak,
+        current_streak=streak if alive else 0,
+        completion_ratio=analytics.calculate_completion_ratio(
+            periodicity, max(creation_date, start) if start else creation_date, completions, today
+        ),
+        last_completion=last_completion,
+    )
+
+def build_report(db_name: str = "habit.db", today: date | None = None, start: date | None = None,
+                 end: date | None = None) -> dict:
+    """
+    Computes every analytics of the analytics module at once, from a single pass over the completions.
+    The leaderboards and ratios are the same as the ones of the sequential functions of the analytics module.
+
+    Args:
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+        today (date | None, optional): The date the ratios and current streaks are computed for.
+            Defaults to the end date, or today.
+        start (date | None, optional): The first date of the period of the report. Defaults to the whole history.
+        end (date | None, optional): The last date of the period of the report. Defaults to the whole history.
+
+    Returns:
+        dict: A dictionary with the following keys:
+            - "habits" (list[HabitReport]): The analytics of every habit, sorted by name.
+            - "longest_daily_streak" (tuple[str, int]): The habit with the longest daily streak.
+            - "longest_weekly_streak" (tuple[str, int]): The habit with the longest weekly streak.
+            - "daily_completion_ratios" (list[tuple[str, float]]): The completion ratio of every daily habit.
+            - "weekly_completion_ratios" (list[tuple[str, float]]): The completion ratio of every weekly habit.
+    """
+    habits = sorted(stream_habit_reports(db_name, today, start, end))
+    # ties are resolved like the analytics module, which visits habits by creation date and name
+    leaders = {"daily": None, "weekly": None}
+    for report in habits:
+        leader = leaders[report.periodicity]
+        key = (-report.longest_streak, report.creation_date, report.habit)
+        if report.longest_streak > 0 and (leader is None or key < leader[0]):
+            leaders[report.periodicity] = (key, (report.habit, report.longest_streak))
+
+    return {
+        "habits": habits,
+        "longest_daily_streak": leaders["daily"][1] if leaders["daily"] else ("", 0),
+        "longest_weekly_streak": leaders["weekly"][1] if leaders["weekly"] else ("", 0),
+        "daily_completion_ratios": [(r.habit, r.completion_ratio) for r in habits if r.periodicity == "daily"],
+        "weekly_completion_ratios": [(r.habit, r.completion_ratio) for r in habits if r.periodicity == "weekly"],
+    }
@@ -0,0 +1,85 @@
+import sqlite3
+from datetime import date, timedelta
+import analytics
+from analytics_queries import habit_details_query, habit_id_completion_dates_until_query
+from report import continues_streak
+
+def period_start(periodicity: str, day: date) -> date:
+    """
+    Returns the first day of the period (day or ISO week) containing a day.
+
+    Args:
+        periodicity (str): The periodicity of the habit ('daily' or 'weekly').
+        day (date): The day.
+
+    Returns:
+        date: The day itself for daily habits, the Monday of its week for weekly habits.
+    """
+    return day if periodicity == "daily" else day - timedelta(days=day.weekday())
+
+def calculate_streak_timeline(periodicity: str, dates: list[date], start: date, end: date) -> list[tuple[date, int, int]]:
+    """
+    Calculate the running streaks of a habit for every period of a date range, in one pass over the
+    completion dates and the periods.
+
+    Args:
+        periodicity (str): The periodicity of the habit ('daily' or 'weekly').
+        dates (list[date]): The completion dates of the habit up to `end`, in chronological order.
+        start (date): The first day of the range.
+        end (date): The last day of the range.
+
+    Returns:
+        list[tuple[date, int, int]]: For every period of the range, the first day of the period, the streak ending
+            with the period (0 if the period was not completed) and the longest streak up to the period.
+    """
+    step = timedelta(days=1 if periodicity == "daily" else 7)
+    period, last_period = period_start(periodicity, start), period_start(periodicity, end)
+    streak, longest_streak, completed_period = 0, 0, None
+    timeline = []
+    i = 0
+    while period <= last_period:
+        # completions up to the current period, including the ones before the range on the first iteration
+        while i < len(dates) and period_start(periodicity, dates[i]) <= period:
+            completion_period = period_start(periodicity, dates[i])
+            if completion_period != completed_period:
+                if completed_period is not None and continues_streak(periodicity, completed_period, completion_period):
+                    streak += 1
+                else:
+                    streak = 1
+                longest_streak = max(longest_streak, streak)
+                completed_period = completion_period
+            i += 1
+        timeline.append((period, streak if completed_period == period else 0, longest_streak))
+        period += step
+    return timeline
+
+def get_streak_timeline(habit_name: str, start: date | None = None, end: date | None = None, db_name: str = "habit.db") -> list[tuple[date, int, int]]:
+    """
+    Get the running streaks of a habit for every day (daily habits) or week (weekly habits) of a date range,
+    e.g. to chart how its streaks evolved.
+
+    Args:
+        habit_name (str): The name of the habit.
+        start (date | None, optional): The first day of the range. Defaults to the creation date of the habit.
+        end (date | None, optional): The last day of the range. Defaults to today.
+        db_name (str, optional): The name of the database file. Defaults to "habit.db".
+
+    Returns:
+        list[tuple[date, int, int]]: For every period of the range, the first day of the period, the streak ending
+            with the period and the longest streak up to the period. Empty if the habit does not exist.
+    """
+    try:
+        con, cursor = analytics.connect_db(db_name)
+        habit = cursor.execute(habit_details_query, (habit_name,)).fetchone()
+        if habit is None:
+            return []
+        habit_id, periodicity, creation_date = habit
+        start = start or date.fromisoformat(creation_date)
+        end = end or date.today()
+        cursor.execute(habit_id_completion_dates_until_query, (habit_id, end.isoformat()))
+        dates = [date.fromisoformat(row[0]) for row in cursor]
+        return calculate_streak_timeline(periodicity, dates, start, end)
+    except sqlite3.Error as e:
+        print(f"database error: {e}")
+    finally:
+        con.close()
@@ -0,0 +1,44 @@
+import random
+from datetime import date, timedelta
+import backends
+from db_handler import initialize_db
+
+def populate_synthetic_db(db_name: str, habits: int = 1000, days: int = 365, completion_rate: float = 0.8, seed: int = 0) -> None:
+    """
+    Fills a database with synthetic habits and completions, used by benchmarks and large-history tests.
+    Half of the habits are daily and half weekly, all created `days` days ago.
+
+    Args:
+        db_name (str): The name of the database file to populate.
+        habits (int, optional): The number of habits to create. Defaults to 1000.
+        days (int, optional): The length of the completion history in days. Defaults to 365.
+        completion_rate (float, optional): The probability for a habit to be completed in a period. Defaults to 0.8.
+        seed (int, optional): The seed of the random generator, for reproducible databases. Defaults to 0.
+    """
+    initialize_db(db_name)
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=days - 1)
+
+    con = backends.connect(db_name)
+    try:
+        for i in range(habits):
+            habit = f"habit-{i:06d}"
+            periodicity = "daily" if i % 2 == 0 else "weekly"
+            habit_id = con.execute("""
+                INSERT INTO habits (habit, periodicity, creation_date)
+                VALUES (?, ?, ?)
+            """, (habit, periodicity, start.isoformat())).lastrowid
+
+            step = 1 if periodicity == "daily" else 7
+            completions = (
+                (habit_id, (start + timedelta(days=offset)).isoformat())
+                for offset in range(0, days, step)
+                if rng.random() < completion_rate
+            )
+            con.executemany("""
+                INSERT INTO completions (habit_id, completion_date)
+                VALUES (?, ?)
+            """, completions)
+        con.commit()
+    finally:
+        con.close()
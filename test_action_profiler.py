@@ -0,0 +1,72 @@
+import shutil
+import sys
+import time
+import pstats
+from action_profiler import ActionProfiler
+
+class FakePrompt:
+    """Stands for a questionary prompt, waiting for the user when asked."""
+
+    def ask(self):
+        time.sleep(0.2)
+        return "answer"
+
+def wait_for_user():
+    """Stands for prompts.pause."""
+    time.sleep(0.2)
+
+def busy(seconds):
+    """Works without waiting for the user."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def view_action():
+    """An action alternating prompts, work and pauses."""
+    answer = FakePrompt().ask()
+    busy(0.05)
+    wait_for_user()
+    return answer
+
+class TestActionProfiler:
+    output_dir = "test_profiles"
+
+    def setup_method(self):
+        """Setup a profiler excluding the fake prompt and pause before each test."""
+        self.profiler = ActionProfiler(self.output_dir)
+        self.profiler.exclude(FakePrompt, "ask")
+        self.profiler.exclude(sys.modules[__name__], "wait_for_user")
+
+    def teardown_method(self):
+        """Restore the excluded functions and clean up the profile dumps after each test."""
+        self.profiler.restore()
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def test_waiting_time_is_excluded(self):
+        """Test that the timings and profiles of an action do not count the time spent waiting for the user."""
+        assert self.profiler.run("view_action", view_action) == "answer"
+        self.profiler.run("view_action", view_action)
+        [(action, calls, total, slowest)] = self.profiler.action_stats()
+        assert (action, calls) == ("view_action", 2)
+        assert 0.1 <= total < 0.3 and slowest < 0.15
+        functions = {function.split("(")[-1].rstrip(")"): stats for function, *stats in self.profiler.function_stats()}
+        assert functions["view_action"][0] == 2
+        assert functions["view_action"][2] < 0.3
+        assert functions["busy"][2] >= 0.1
+
+    def test_dump_and_summary(self, capsys):
+        """Test that every action is dumped to a loadable profile and listed in the summary."""
+        self.profiler.run("slow action", busy, 0.02)
+        self.profiler.run("fast_action", busy, 0.001)
+        paths = self.profiler.dump()
+        assert sorted(path.name for path in paths) == ["fast_action.prof", "slow_action.prof"]
+        assert pstats.Stats(str(paths[0])).total_calls > 0
+        self.profiler.print_summary()
+        output = capsys.readouterr().out
+        assert output.index("slow action") < output.index("fast_action")
+
+    def test_restore(self):
+        """Test that restoring the profiler puts back the excluded functions."""
+        self.profiler.restore()
+        assert not hasattr(FakePrompt.ask, "__wrapped__")
+        assert not hasattr(wait_for_user, "__wrapped__")
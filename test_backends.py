@@ -0,0 +1,70 @@
+import os
+import sqlite3
+from datetime import date
+import pytest
+import backends
+import db_handler as db
+import analytics
+import parallel_analytics
+import partitions
+from synthetic_data import populate_synthetic_db
+
+class TestMemoryBackend:
+
+    def test_shared_between_connections(self, memory_db):
+        """Test that an in-memory database keeps its data between the connections of every call, until dropped."""
+        db.add_habit("Read", "weekly", date(2025, 1, 1), memory_db)
+        db.add_completion_date("Read", date(2025, 1, 9), memory_db)
+        assert analytics.fetch_all_habits(memory_db) == [("Read", "weekly", "2025-01-01")]
+        assert analytics.get_habit_longest_streak("Read", memory_db) == 1
+        backends.drop_db(memory_db)
+        con = backends.connect(memory_db)
+        assert con.execute("SELECT name FROM sqlite_master").fetchall() == []
+        con.close()
+        backends.drop_db(memory_db)
+
+    def test_clones_are_isolated(self, memory_db, template_db):
+        """Test that the databases cloned from the template start with the schema and share no data."""
+        db.add_habit("Read", "weekly", date(2025, 1, 1), memory_db)
+        assert analytics.count_habits(template_db) == 0
+        assert not os.path.exists(memory_db)
+
+    def test_read_only(self, memory_db):
+        """Test that read-only connections to an in-memory database reject writes."""
+        con, cursor = analytics.connect_db(memory_db, read_only=True)
+        with pytest.raises(sqlite3.OperationalError):
+            cursor.execute("INSERT INTO habits (habit, periodicity, creation_date) VALUES ('Read', 'weekly', '2025-01-01')")
+        con.close()
+
+    def test_archive_rejected(self, memory_db):
+        """Test that the completions of an in-memory database cannot be archived to partition files."""
+        with pytest.raises(ValueError):
+            partitions.archive_year(2024, memory_db)
+
+class TestWhatIf:
+    test_db = "test_habit.db"
+    scratch_db = "memory:what-if"
+
+    def setup_method(self):
+        """Setup a database file and its in-memory copy before each test."""
+        populate_synthetic_db(self.test_db, habits=20, days=60)
+        backends.clone_db(self.test_db, self.scratch_db)
+
+    def teardown_method(self):
+        """Clean up the database file and its copy after each test."""
+        backends.drop_db(self.scratch_db)
+        backends.drop_db(self.test_db)
+
+    def test_clone_of_file(self):
+        """Test that analytics on the in-memory copy match the file, and that changes to the copy leave the file intact."""
+        assert analytics.get_daily_habits_completion_ratio(self.scratch_db) == \
+            analytics.get_daily_habits_completion_ratio(self.test_db)
+        db.remove_habit("habit-000000", self.scratch_db)
+        assert analytics.count_habits(self.scratch_db) == 19
+        assert analytics.count_habits(self.test_db) == 20
+
+    def test_parallel_analytics(self):
+        """Test that the parallel analytics of an in-memory database run in the current process with the same results."""
+        result = parallel_analytics.get_habits_analytics_parallel(self.scratch_db, workers=4, chunk_size=5)
+        assert result["longest_daily_streak"] == analytics.get_habit_with_longest_daily_streak(self.scratch_db)
+        assert result["weekly_completion_ratios"] == analytics.get_weekly_habits_completion_ratio(self.scratch_db)
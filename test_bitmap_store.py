@@ -0,0 +1,101 @@
+import os
+import random
+import sqlite3
+from datetime import date, timedelta
+import db_handler as db
+import analytics
+import bitmap_store
+
+class TestBitmapStore:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database with bitmap storage before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2024, 1, 1), self.test_db)
+        db.add_habit("Read", "weekly", date(2024, 1, 1), self.test_db)
+        for day in (date(2024, 12, 30), date(2024, 12, 31), date(2025, 1, 1), date(2025, 1, 3)):
+            db.add_completion_date("Exercise", day, self.test_db)
+        db.add_completion_date("Read", date(2024, 12, 30), self.test_db)
+        bitmap_store.enable_bitmap_storage(self.test_db)
+        self.exercise_id = db.fetch_habit_id("Exercise", self.test_db)
+        self.read_id = db.fetch_habit_id("Read", self.test_db)
+
+    def teardown_method(self):
+        """Clean up the test database after each test."""
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def test_bitmaps(self):
+        """Test that every habit-year is stored as a 46 byte bitmap."""
+        bitmaps = bitmap_store.fetch_bitmaps_by_id(self.exercise_id, self.test_db)
+        assert bitmaps == {2024: (1 << 364) | (1 << 365), 2025: 0b101}
+        assert len(bitmap_store.build_bitmap([date(2024, 12, 31)])) == 46
+
+    def test_streak_across_years(self):
+        """Test that the bit-run scan continues runs from one year to the next."""
+        assert bitmap_store.longest_streak_by_id(self.exercise_id, self.test_db) == 3
+        assert analytics.get_habit_longest_streak("Exercise", self.test_db) == 3
+
+    def test_counts_follow_writes(self):
+        """Test that added and removed completions are reflected in the popcount."""
+        assert bitmap_store.count_completions_by_habit(self.test_db) == {self.exercise_id: 4, self.read_id: 1}
+        db.add_completion_date("Exercise", date(2025, 1, 2), self.test_db)
+        db.remove_completion_date("Read", date(2024, 12, 30), self.test_db)
+        assert bitmap_store.count_completions_by_habit(self.test_db) == {self.exercise_id: 5}
+        assert bitmap_store.longest_streak_by_id(self.exercise_id, self.test_db) == 5
+
+    def test_week_exists(self):
+        """Test the weekly existence check, including a week spanning two years."""
+        # 2024-12-30 is the Monday of ISO week 1 of 2025
+        assert bitmap_store.completion_week_exists(self.read_id, date(2025, 1, 5), self.test_db)
+        assert bitmap_store.completion_week_exists(self.read_id, date(2024, 12, 30), self.test_db)
+        assert not bitmap_store.completion_week_exists(self.read_id, date(2025, 1, 6), self.test_db)
+        assert not bitmap_store.completion_week_exists(self.read_id, date(2024, 12, 29), self.test_db)
+
+    def test_existence_check_uses_bitmaps(self):
+        """Test that the weekly existence check of db_handler, used by Habit and prompts, masks the bitmaps when enabled."""
+        assert db.completion_week_exists("Read", date(2025, 1, 2), self.test_db)
+        con = sqlite3.connect(self.test_db)
+        con.execute("UPDATE completion_bitmaps SET bits = ? WHERE habit_id = ?", (bytes(46), self.read_id))
+        con.commit()
+        con.close()
+        assert not db.completion_week_exists("Read", date(2025, 1, 2), self.test_db)
+        bitmap_store.disable_bitmap_storage(self.test_db)
+        assert db.completion_week_exists("Read", date(2025, 1, 2), self.test_db)
+
+    def test_writes_update_bitmaps(self):
+        """Test that every writer sets and clears the bits in its own transaction, so reads never rebuild a bitmap."""
+        db.add_completion_date("Exercise", date(2025, 1, 2), self.test_db)
+        db.add_completion_date("Exercise", date(2024, 6, 1), self.test_db)
+        con = sqlite3.connect(self.test_db)
+        con.execute("INSERT INTO completions (habit_id, completion_date) VALUES (?, '2025-12-31')", (self.exercise_id,))
+        con.execute("DELETE FROM completions WHERE habit_id = ? AND completion_date = '2024-12-30'", (self.read_id,))
+        con.commit()
+        stored = con.execute("SELECT habit_id, year, bits FROM completion_bitmaps ORDER BY habit_id, year").fetchall()
+        con.close()
+        assert stored == [
+            (self.exercise_id, 2024, bitmap_store.build_bitmap([date(2024, 6, 1), date(2024, 12, 30), date(2024, 12, 31)])),
+            (self.exercise_id, 2025, bitmap_store.build_bitmap([date(2025, 1, d) for d in (1, 2, 3)] + [date(2025, 12, 31)])),
+        ]
+        con, cursor = analytics.connect_db(self.test_db, read_only=True)
+        assert bitmap_store.bitmaps_by_id(cursor, self.exercise_id, 2025) == {2025: 0b111 | (1 << 364)}
+        con.close()
+        assert bitmap_store.count_completions_by_habit(self.test_db) == {self.exercise_id: 7}
+
+    def test_matches_completions(self):
+        """Test that random writes keep the bitmaps equal to the completions."""
+        rng = random.Random(0)
+        for _ in range(200):
+            day = date(2024, 12, 1) + timedelta(days=rng.randrange(60))
+            if db.completion_date_exists("Exercise", day, self.test_db):
+                db.remove_completion_date("Exercise", day, self.test_db)
+            else:
+                db.add_completion_date("Exercise", day, self.test_db)
+            monday = day - timedelta(days=day.weekday())
+            week = [monday + timedelta(days=i) for i in range(7)]
+            assert bitmap_store.completion_week_exists(self.exercise_id, day, self.test_db) == \
+                any(d in week for d in [d.date() for d in analytics.fetch_completion_dates_by_id(self.exercise_id, self.test_db)])
+        dates = analytics.fetch_completion_dates_by_id(self.exercise_id, self.test_db)
+        assert bitmap_store.count_completions_by_habit(self.test_db)[self.exercise_id] == len(dates)
+        assert bitmap_store.longest_streak_by_id(self.exercise_id, self.test_db) == analytics.calculate_daily_streak(dates)
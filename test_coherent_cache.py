@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+from datetime import date
+import db_handler as db
+from coherent_cache import CoherentCache, HABITS
+
+class TestCoherentCache:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database and a cache on it before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Read", "weekly", date(2025, 1, 1), self.test_db)
+        db.add_completion_date("Exercise", date(2025, 1, 1), self.test_db)
+        db.add_completion_date("Exercise", date(2025, 1, 2), self.test_db)
+        self.cache = CoherentCache(self.test_db)
+        self.computed = []
+
+    def teardown_method(self):
+        """Close the cache and clean up the test database after each test."""
+        self.cache.close()
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def cached(self, key, habit=None, scope=HABITS):
+        """Returns a cached value, recording the keys that had to be computed."""
+        def compute():
+            self.computed.append(key)
+            return key
+        return self.cache.get(key, compute, habit=habit, scope=scope)
+
+    def test_cached_results(self):
+        """Test that the cache serves the analytics results and keeps them while the database does not change."""
+        assert self.cache.get_habit_longest_streak("Exercise") == 2
+        assert self.cache.fetch_habit_names() == ["Exercise", "Read"]
+        self.cached("exercise", habit="Exercise")
+        self.cached("exercise", habit="Exercise")
+        assert self.computed == ["exercise"]
+
+    def test_invalidates_changed_habit_only(self):
+        """Test that a new completion only invalidates the entries of its habit and the global entries."""
+        self.cached("exercise", habit="Exercise")
+        self.cached("read", habit="Read")
+        self.cached("names", scope=HABITS)
+        db.add_completion_date("Exercise", date(2025, 1, 3), self.test_db)
+        self.cached("exercise", habit="Exercise")
+        self.cached("read", habit="Read")
+        self.cached("names", scope=HABITS)
+        assert self.computed == ["exercise", "read", "names", "exercise"]
+        assert self.cache.get_habit_longest_streak("Exercise") == 3
+
+    def test_invalidates_habit_list(self):
+        """Test that adding or renaming a habit invalidates the habit list and the renamed habit."""
+        assert self.cache.fetch_habit_names() == ["Exercise", "Read"]
+        db.add_habit("Meditate", "daily", date(2025, 1, 1), self.test_db)
+        assert self.cache.fetch_habit_names() == ["Exercise", "Meditate", "Read"]
+        assert self.cache.get_habit_longest_streak("Exercise") == 2
+        db.rename_habit("Exercise", "Run", self.test_db)
+        assert self.cache.get_habit_longest_streak("Run") == 2
+        assert self.cache.fetch_habit_names() == ["Meditate", "Read", "Run"]
+
+    def test_other_process(self):
+        """Test that a change committed by another process is seen by the cache."""
+        assert self.cache.get_habit_longest_streak("Exercise") == 2
+        code = (
+            "import db_handler as db; from datetime import date; "
+            f"db.add_completion_date('Exercise', date(2025, 1, 3), {self.test_db!r})"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+        assert self.cache.get_habit_longest_streak("Exercise") == 3
+
+    def test_listeners(self):
+        """Test that the listeners receive the changes read by the cache."""
+        received = []
+        self.cache.subscribe(received.append)
+        db.remove_habit("Read", self.test_db)
+        self.cache.validate()
+        assert [change[1:3] for change in received[0]] == [("remove_habit", "Read")]
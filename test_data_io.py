@@ -0,0 +1,106 @@
+import os
+import json
+import tracemalloc
+from datetime import date, timedelta
+import pytest
+import db_handler as db
+import analytics
+import data_io
+
+class TestDataIO:
+    test_db = "test_habit.db"
+    other_db = "test_habit_import.db"
+
+    def setup_method(self):
+        """Setup a fresh test database before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Read", "weekly", date(2025, 1, 1), self.test_db)
+        for day in (1, 2, 3):
+            db.add_completion_date("Exercise", date(2025, 1, day), self.test_db)
+        db.add_completion_date("Read", date(2025, 1, 9), self.test_db)
+        self.files = []
+
+    def teardown_method(self):
+        """Clean up the test databases and data files after each test."""
+        for path in [self.test_db, self.other_db, *self.files]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def data_file(self, name, lines=None):
+        """Returns the path of a data file removed after the test, written with the given lines if any."""
+        self.files.append(name)
+        if lines is not None:
+            with open(name, "w", encoding="utf-8") as file:
+                file.writelines(line + "\n" for line in lines)
+        return name
+
+    @pytest.mark.parametrize("extension", ["csv", "jsonl"])
+    def test_round_trip(self, extension):
+        """Test that exported habits and completions are imported identically into another database."""
+        habits, completions = self.data_file(f"habits.{extension}"), self.data_file(f"completions.{extension}")
+        assert data_io.export_records(habits, "habits", self.test_db)["rows"] == 2
+        assert data_io.export_records(completions, "completions", self.test_db, chunk_size=3)["rows"] == 4
+
+        db.initialize_db(self.other_db)
+        assert data_io.import_records(habits, "habits", self.other_db)["inserted"] == 2
+        stats = data_io.import_records(completions, "completions", self.other_db, chunk_size=3)
+        assert (stats["rows"], stats["inserted"], stats["skipped"], stats["invalid"]) == (4, 4, 0, 0)
+        assert analytics.fetch_all_habits(self.other_db) == analytics.fetch_all_habits(self.test_db)
+        for habit in ("Exercise", "Read"):
+            assert analytics.fetch_habit_completion_dates(habit, self.other_db) == \
+                analytics.fetch_habit_completion_dates(habit, self.test_db)
+
+    def test_validation(self):
+        """Test that invalid rows are rejected, and existing habits and completions of the same week are skipped."""
+        habits = self.data_file("habits.csv", [
+            "habit,periodicity,creation_date",
+            "Meditate,daily,2025-01-01",
+            "Exercise,daily,2025-01-01",
+            "No,daily,2025-01-01",
+            "Stretching,monthly,2025-01-01",
+            "Journal,weekly,01.01.2025",
+            "Walk,daily,20250101",
+            "Swim,weekly,2025-W01-3",
+        ])
+        stats = data_io.import_records(habits, "habits", self.test_db)
+        assert (stats["inserted"], stats["skipped"], stats["invalid"]) == (1, 1, 5)
+
+        completions = self.data_file("completions.jsonl", [
+            json.dumps({"habit": "Read", "completion_date": "2025-01-10"}),
+            json.dumps({"habit": "Read", "completion_date": "2025-01-13"}),
+            json.dumps({"habit": "Read", "completion_date": "2025-01-14"}),
+            json.dumps({"habit": "Unknown", "completion_date": "2025-01-14"}),
+            json.dumps({"habit": "Exercise"}),
+            "not json",
+            json.dumps({"habit": "Exercise", "completion_date": "20250104"}),
+            json.dumps({"habit": "Exercise", "completion_date": "2025-W02-1"}),
+        ])
+        stats = data_io.import_records(completions, "completions", self.test_db, chunk_size=2)
+        assert (stats["rows"], stats["inserted"], stats["skipped"], stats["invalid"]) == (8, 1, 3, 4)
+        assert len(analytics.fetch_habit_completion_dates("Exercise", self.test_db)) == 3
+        assert analytics.fetch_habit_completion_dates("Read", self.test_db)[-1].date() == date(2025, 1, 13)
+
+    def import_peak(self, rows):
+        """Imports a file of completions of the given number of rows and returns the peak memory of the import."""
+        start = date(1900, 1, 1)
+        completions = self.data_file(f"completions_{rows}.csv", ["habit,completion_date"] + [
+            f"Exercise,{start + timedelta(days=i)}" for i in range(rows)
+        ])
+        tracemalloc.start()
+        try:
+            stats = data_io.import_records(completions, "completions", self.test_db, chunk_size=500)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert stats["rows"] == rows
+        return peak
+
+    def test_bounded_memory(self):
+        """Test that the memory used by an import does not grow with the size of the file."""
+        assert self.import_peak(20000) < 1.5 * self.import_peak(2000)
+
+    def test_unknown_extension(self):
+        """Test that files other than CSV and JSONL are refused."""
+        with pytest.raises(ValueError, match="Data files must have a .csv or .jsonl extension."):
+            data_io.export_records(self.data_file("habits.txt"), "habits", self.test_db)
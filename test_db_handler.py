@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import db_handler as db
+import analytics
+import replication
+
+class TestMigration:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a database with the schema where completions reference habits by name."""
+        con = sqlite3.connect(self.test_db)
+        con.executescript("""
+            CREATE TABLE habits (
+                habit TEXT PRIMARY KEY,
+                periodicity TEXT CHECK(periodicity IN ('daily', 'weekly')) NOT NULL,
+                creation_date TEXT NOT NULL
+            );
+            CREATE TABLE completions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                habit TEXT NOT NULL,
+                completion_date TEXT NOT NULL,
+                FOREIGN KEY(habit) REFERENCES habits(habit) ON DELETE CASCADE,
+                UNIQUE (habit, completion_date)
+            );
+            INSERT INTO habits VALUES ('Read', 'weekly', '2025-01-01'), ('Exercise', 'daily', '2025-01-01');
+            INSERT INTO completions (habit, completion_date)
+            VALUES ('Exercise', '2025-01-01'), ('Exercise', '2025-01-02'), ('Read', '2025-01-09');
+        """)
+        con.close()
+
+    def teardown_method(self):
+        """Clean up the test database after each test."""
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def test_migrate_to_habit_id(self):
+        """Test that the migration keeps every habit and completion and switches to integer habit ids."""
+        db.initialize_db(self.test_db)
+        con, cursor = db.connect_db(self.test_db)
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(completions)")]
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        con.close()
+        assert columns == ["id", "habit_id", "completion_date"]
+        assert version == db.SCHEMA_VERSION
+
+        assert analytics.fetch_all_habits(self.test_db) == [
+            ("Exercise", "daily", "2025-01-01"), ("Read", "weekly", "2025-01-01")
+        ]
+        assert analytics.get_habit_longest_streak("Exercise", self.test_db) == 2
+        assert analytics.get_habit_longest_streak("Read", self.test_db) == 1
+
+    def test_migrated_database_is_writable(self):
+        """Test that cascades and the change log work on a migrated database."""
+        db.initialize_db(self.test_db)
+        db.initialize_db(self.test_db)
+        db.remove_habit("Exercise", self.test_db)
+        con, cursor = db.connect_db(self.test_db)
+        assert cursor.execute("SELECT COUNT(*) FROM completions").fetchone()[0] == 1
+        con.close()
+        changes = replication.fetch_changes_since(0, self.test_db)
+        assert changes[-1][1:3] == ("remove_habit", "Exercise")
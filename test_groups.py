@@ -0,0 +1,85 @@
+import os
+from datetime import date
+import pytest
+import db_handler as db
+import analytics
+import groups
+
+class TestGroups:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database with two groups before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Brush teeth", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Meditate", "daily", date(2025, 1, 3), self.test_db)
+        db.add_habit("Read", "weekly", date(2025, 1, 1), self.test_db)
+        db.add_habit("Check mails", "weekly", date(2025, 1, 1), self.test_db)
+        for day in (1, 2, 3, 5):
+            db.add_completion_date("Exercise", date(2025, 1, day), self.test_db)
+        for day in (3, 4):
+            db.add_completion_date("Brush teeth", date(2025, 1, day), self.test_db)
+        db.add_completion_date("Meditate", date(2025, 1, 3), self.test_db)
+        for day in (1, 9, 22):
+            db.add_completion_date("Read", date(2025, 1, day), self.test_db)
+        db.add_completion_date("Check mails", date(2025, 1, 22), self.test_db)
+
+        groups.create_group("health", self.test_db)
+        groups.create_group("work", self.test_db)
+        for habit in ("Exercise", "Brush teeth", "Meditate", "Read"):
+            groups.add_habit_to_group(habit, "health", self.test_db)
+        groups.add_habit_to_group("Check mails", "work", self.test_db)
+        groups.add_habit_to_group("Read", "work", self.test_db)
+
+    def teardown_method(self):
+        """Clean up the test database after each test."""
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def test_membership(self):
+        """Test that habits can belong to several groups and that membership follows removals."""
+        assert groups.fetch_groups(self.test_db) == ["health", "work"]
+        assert groups.fetch_habit_groups("Read", self.test_db) == ["health", "work"]
+        assert groups.add_habit_to_group("Unknown", "work", self.test_db) is False
+        groups.remove_habit_from_group("Read", "work", self.test_db)
+        assert groups.fetch_group_habits("work", self.test_db) == ["Check mails"]
+        db.remove_habit("Exercise", self.test_db)
+        groups.remove_group("work", self.test_db)
+        assert groups.fetch_group_habits("health", self.test_db) == ["Brush teeth", "Meditate", "Read"]
+        assert groups.fetch_habit_groups("Check mails", self.test_db) == []
+
+    def test_completion_ratio(self):
+        """Test the aggregate completion ratio of every group, 0 for a group without habits."""
+        groups.create_group("empty", self.test_db)
+        # health: (4 + 2 + 1 + 3) completions over (10 + 10 + 8 + 2) periods
+        assert groups.get_groups_completion_ratio(self.test_db, today=date(2025, 1, 10)) == [
+            ("empty", 0),
+            ("health", pytest.approx(10 / 30)),
+            ("work", pytest.approx(4 / 4)),
+        ]
+
+    def test_completion_ratio_matches_analytics(self):
+        """Test that the ratio of a group of one habit is the completion ratio of the habit."""
+        groups.create_group("solo", self.test_db)
+        groups.add_habit_to_group("Exercise", "solo", self.test_db)
+        ratios = dict(groups.get_groups_completion_ratio(self.test_db))
+        assert ratios["solo"] == pytest.approx(dict(analytics.get_daily_habits_completion_ratio(self.test_db))["Exercise"])
+
+    def test_best_streak(self):
+        """Test the best streak of every group, with the habit holding it."""
+        assert groups.get_groups_best_streak("daily", self.test_db) == [("health", "Exercise", 3)]
+        assert groups.get_groups_best_streak("weekly", self.test_db) == [("health", "Read", 2), ("work", "Read", 2)]
+
+    def test_daily_completion_rate(self):
+        """Test the share of the daily habits of a group completed every day, counting habits from their creation."""
+        assert groups.get_group_daily_completion_rate("health", date(2025, 1, 1), date(2025, 1, 5), self.test_db) == [
+            (date(2025, 1, 1), 1 / 2),
+            (date(2025, 1, 2), 1 / 2),
+            (date(2025, 1, 3), 1.0),
+            (date(2025, 1, 4), pytest.approx(1 / 3)),
+            (date(2025, 1, 5), pytest.approx(1 / 3)),
+        ]
+        assert groups.get_group_daily_completion_rate("work", date(2025, 1, 1), date(2025, 1, 1), self.test_db) == [
+            (date(2025, 1, 1), 0)
+        ]
@@ -1,6 +1,7 @@
 import os
 from datetime import date
 import db_handler as db
+import analytics
 from habit import Habit
 import pytest
 
@@ -23,6 +24,13 @@ class TestHabit:
         assert habit.periodicity == "daily"
         assert isinstance(habit.creation_date, date)
 
+    def test_habit_with_creation_date(self):
+        """Test that a habit can be constructed with its creation date and id, and has no instance dictionary."""
+        habit = Habit("Exercise", "daily", date(2025, 1, 1), habit_id=3)
+        assert (habit.creation_date, habit.habit_id) == (date(2025, 1, 1), 3)
+        assert not hasattr(habit, "__dict__")
+        assert Habit.from_row((3, "Exercise", "daily", "2025-01-01")).creation_date == date(2025, 1, 1)
+
     def test_invalid_habit_name(self):
         """Test if a habit name is invalid."""
         with pytest.raises(ValueError, match="Habit name must be at least 3 characters long."):
@@ -45,6 +53,24 @@ class TestHabit:
         habit.save(self.test_db)
         assert Habit.exists("Exercise", self.test_db)
 
+    def test_save_sets_habit_id(self):
+        """Test that saving a habit sets its id."""
+        habit = Habit("Exercise", "daily")
+        assert habit.habit_id is None
+        habit.save(self.test_db)
+        assert habit.habit_id == db.fetch_habit_id("Exercise", self.test_db)
+
+    def test_rename_habit(self):
+        """Test renaming a habit keeps its completions."""
+        habit = Habit("Exercise", "daily")
+        habit.save(self.test_db)
+        Habit.add_completion_date("Exercise", date.today(), self.test_db)
+        Habit.rename("Exercise", "Workout", self.test_db)
+        assert not Habit.exists("Exercise", self.test_db)
+        assert Habit.completion_date_exists("Workout", date.today(), self.test_db)
+        with pytest.raises(ValueError, match="Habit name must be at least 3 characters long."):
+            Habit.rename("Workout", "Wo", self.test_db)
+
     def test_remove_habit(self):
         """Test removing a habit from the database."""
         habit = Habit("Exercise", "daily")
@@ -65,4 +91,38 @@ class TestHabit:
         habit.save(self.test_db)
         Habit.add_completion_date("Exercise", date.today(), self.test_db)
         Habit.remove_completion_date("Exercise", date.today(), self.test_db)
-        assert not Habit.completion_date_exists("Exercise", date.today(), self.test_db)
\ No newline at end of file
+        assert not Habit.completion_date_exists("Exercise", date.today(), self.test_db)
+
+    def test_save_if_absent(self):
+        """Test that a habit is only saved once."""
+        habit = Habit("Exercise", "daily")
+        assert habit.save_if_absent(self.test_db) == db.INSERTED
+        assert habit.habit_id == db.fetch_habit_id("Exercise", self.test_db)
+        assert Habit("Exercise", "weekly").save_if_absent(self.test_db) == db.ALREADY_EXISTS
+        assert analytics.fetch_habit_periodicity("Exercise", self.test_db) == "daily"
+
+    def test_add_completion_date_if_absent(self):
+        """Test the statuses of conditional completion writes for daily and weekly habits."""
+        Habit("Exercise", "daily").save(self.test_db)
+        Habit("Read", "weekly").save(self.test_db)
+        monday = date(2025, 1, 6)
+
+        assert Habit.add_completion_date_if_absent("Exercise", monday, self.test_db) == db.INSERTED
+        assert Habit.add_completion_date_if_absent("Exercise", monday, self.test_db) == db.ALREADY_EXISTS
+        assert Habit.add_completion_date_if_absent("Exercise", date(2025, 1, 7), self.test_db) == db.INSERTED
+
+        assert Habit.add_completion_date_if_absent("Read", date(2025, 1, 8), self.test_db) == db.INSERTED
+        assert Habit.add_completion_date_if_absent("Read", date(2025, 1, 8), self.test_db) == db.ALREADY_EXISTS
+        assert Habit.add_completion_date_if_absent("Read", monday, self.test_db) == db.SAME_WEEK_EXISTS
+        assert Habit.add_completion_date_if_absent("Read", date(2025, 1, 12), self.test_db) == db.SAME_WEEK_EXISTS
+        assert Habit.add_completion_date_if_absent("Read", date(2025, 1, 13), self.test_db) == db.INSERTED
+
+        assert Habit.add_completion_date_if_absent("Unknown", monday, self.test_db) == db.UNKNOWN_HABIT
+
+    def test_completion_week_exists(self):
+        """Test the weekly existence check around the bounds of an ISO week."""
+        Habit("Read", "weekly").save(self.test_db)
+        Habit.add_completion_date("Read", date(2025, 1, 12), self.test_db)
+        assert Habit.completion_week_exists("Read", date(2025, 1, 6), self.test_db)
+        assert not Habit.completion_week_exists("Read", date(2025, 1, 5), self.test_db)
+        assert not Habit.completion_week_exists("Read", date(2025, 1, 13), self.test_db)
\ No newline at end of file
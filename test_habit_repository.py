@@ -0,0 +1,62 @@
+import os
+from datetime import date
+import db_handler as db
+from habit import Habit
+from habit_repository import HabitRepository
+
+class TestHabitRepository:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database and repository before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Read", "weekly", date(2025, 1, 2), self.test_db)
+        for day in (1, 2, 3):
+            db.add_completion_date("Exercise", date(2025, 1, day), self.test_db)
+        self.repository = HabitRepository(self.test_db)
+
+    def teardown_method(self):
+        """Clean up the test database after each test."""
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def test_load_habits(self):
+        """Test that habits are loaded from the database with their id and creation date."""
+        exercise = self.repository.get_by_name("Exercise")
+        assert isinstance(exercise, Habit)
+        assert (exercise.habit_id, exercise.periodicity, exercise.creation_date) == (1, "daily", date(2025, 1, 1))
+        assert [habit.habit for habit in self.repository.weekly()] == ["Read"]
+        assert self.repository.get_by_name("Unknown") is None
+        assert self.repository.get(42) is None
+
+    def test_identity_map(self):
+        """Test that a habit is materialized once, whichever way it is loaded."""
+        exercise = self.repository.get_by_name("Exercise")
+        assert self.repository.get(exercise.habit_id) is exercise
+        assert self.repository.all()[0] is exercise
+        assert self.repository.daily() == [exercise]
+        assert len(self.repository) == 2
+
+    def test_renamed_habit(self):
+        """Test that reloading a renamed habit updates the loaded object."""
+        exercise = self.repository.get_by_name("Exercise")
+        db.rename_habit("Exercise", "Run", self.test_db)
+        assert self.repository.get_by_name("Run") is exercise
+        assert exercise.habit == "Run"
+
+    def test_lazy_completion_dates(self):
+        """Test that completion dates are attached on first access, and in batches."""
+        exercise, read = self.repository.all()
+        assert exercise.completion_dates is None
+        assert self.repository.completion_dates(exercise) == [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)]
+        assert exercise.completion_dates is not None
+        self.repository.load_completion_dates()
+        assert read.completion_dates == []
+
+    def test_evict(self):
+        """Test that an evicted habit is loaded again as a new object."""
+        exercise = self.repository.get_by_name("Exercise")
+        self.repository.evict(exercise.habit_id)
+        assert exercise.habit_id not in self.repository
+        assert self.repository.get(exercise.habit_id) is not exercise
@@ -0,0 +1,44 @@
+from habit_search import HabitSearchIndex
+
+class TestHabitSearchIndex:
+
+    def setup_method(self):
+        """Setup a search index before each test."""
+        self.index = HabitSearchIndex(["Exercise", "Brush teeth", "Read", "Check mails", "Read news"])
+
+    def test_prefix_search(self):
+        """Test that prefix matches are case insensitive and sorted alphabetically."""
+        assert self.index.search("re") == ["Read", "Read news"]
+        assert self.index.search("READ N")[0] == "Read news"
+        assert self.index.search("") == ["Brush teeth", "Check mails", "Exercise", "Read", "Read news"]
+
+    def test_fuzzy_search(self):
+        """Test that typos and words in the middle of a name still match."""
+        assert self.index.search("exercize")[0] == "Exercise"
+        assert self.index.search("teeth") == ["Brush teeth"]
+        assert self.index.search("zzz") == []
+
+    def test_limit(self):
+        """Test that the number of matches is limited."""
+        assert self.index.search("", limit=2) == ["Brush teeth", "Check mails"]
+
+    def test_add_and_remove(self):
+        """Test adding and removing names from the index."""
+        self.index.add("Meditate")
+        assert "Meditate" in self.index
+        assert self.index.search("medi") == ["Meditate"]
+        self.index.remove("Meditate")
+        assert "Meditate" not in self.index
+        assert self.index.search("medi") == []
+        assert len(self.index) == 5
+
+    def test_search_scales(self):
+        """Test that with thousands of habits, a fuzzy search only scores the names of its discriminating trigrams."""
+        index = HabitSearchIndex(f"habit number {i}" for i in range(10000))
+        for query in ("number 99", "nmber 42"):
+            scores, _ = index.fuzzy_scores(query)
+            # the trigrams of 'habit number' are shared by every name and not counted
+            assert 0 < len(scores) < len(index) // 20
+            assert all(query[-2:] in name for name, score in scores.items() if score == max(scores.values()))
+        assert index.search("nmber 42")[0] == "habit number 42"
+        assert index.search("habit n") == [f"habit number {i}" for i in sorted(range(10000), key=str)[:10]]
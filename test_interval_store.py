@@ -0,0 +1,100 @@
+import os
+import random
+import sqlite3
+from datetime import date, timedelta
+import db_handler as db
+import analytics
+import interval_store
+
+class TestIntervalStore:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database with interval storage before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Brush teeth", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Read", "weekly", date(2025, 1, 1), self.test_db)
+        for day in (1, 2, 3, 5):
+            db.add_completion_date("Exercise", date(2025, 1, day), self.test_db)
+        db.add_completion_date("Brush teeth", date(2025, 1, 5), self.test_db)
+        db.add_completion_date("Read", date(2025, 1, 9), self.test_db)
+        interval_store.enable_interval_storage(self.test_db)
+        self.exercise_id = db.fetch_habit_id("Exercise", self.test_db)
+
+    def teardown_method(self):
+        """Clean up the test database after each test."""
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def completed(self, day):
+        """Checks the 'completions' table itself for a completion of Exercise."""
+        con = sqlite3.connect(self.test_db)
+        row = con.execute("""
+            SELECT 1 FROM completions WHERE habit_id = ? AND completion_date = ?
+        """, (self.exercise_id, day.isoformat())).fetchone()
+        con.close()
+        return row is not None
+
+    def test_build_intervals(self):
+        """Test that enabling the interval storage builds the runs of existing completions."""
+        assert interval_store.is_enabled(self.test_db)
+        assert interval_store.fetch_intervals_by_id(self.exercise_id, self.test_db) == [
+            (date(2025, 1, 1), date(2025, 1, 3)), (date(2025, 1, 5), date(2025, 1, 5))
+        ]
+
+    def test_merge_and_split(self):
+        """Test that adding a completion merges intervals and removing one splits them."""
+        db.add_completion_date("Exercise", date(2025, 1, 4), self.test_db)
+        assert interval_store.fetch_intervals_by_id(self.exercise_id, self.test_db) == [
+            (date(2025, 1, 1), date(2025, 1, 5))
+        ]
+        db.remove_completion_date("Exercise", date(2025, 1, 2), self.test_db)
+        db.remove_completion_date("Exercise", date(2025, 1, 5), self.test_db)
+        assert interval_store.fetch_intervals_by_id(self.exercise_id, self.test_db) == [
+            (date(2025, 1, 1), date(2025, 1, 1)), (date(2025, 1, 3), date(2025, 1, 4))
+        ]
+
+    def test_matches_completions(self):
+        """Test that random additions and removals keep the intervals equal to the completion runs."""
+        rng = random.Random(0)
+        for _ in range(300):
+            day = date(2025, 1, 1) + timedelta(days=rng.randrange(60))
+            if db.completion_date_exists("Exercise", day, self.test_db):
+                db.remove_completion_date("Exercise", day, self.test_db)
+            else:
+                db.add_completion_date("Exercise", day, self.test_db)
+            assert interval_store.completion_date_exists("Exercise", day, self.test_db) == self.completed(day)
+
+        dates = [d.date() for d in analytics.fetch_completion_dates_by_id(self.exercise_id, self.test_db)]
+        days = [start + timedelta(days=i) for start, end in interval_store.fetch_intervals_by_id(self.exercise_id, self.test_db)
+                for i in range((end - start).days + 1)]
+        assert days == dates
+        assert interval_store.count_completions_by_habit(self.test_db)[self.exercise_id] == len(dates)
+        assert interval_store.longest_streak_by_id(self.exercise_id, self.test_db) == analytics.calculate_daily_streak(dates)
+
+    def test_existence_checks_use_intervals(self):
+        """Test that the existence checks of db_handler, used by Habit and prompts, read the intervals when enabled."""
+        assert db.completion_date_exists("Exercise", date(2025, 1, 2), self.test_db)
+        con = sqlite3.connect(self.test_db)
+        con.execute("DELETE FROM completion_intervals WHERE habit_id = ?", (self.exercise_id,))
+        con.commit()
+        con.close()
+        assert self.completed(date(2025, 1, 2))
+        assert not db.completion_date_exists("Exercise", date(2025, 1, 2), self.test_db)
+        interval_store.disable_interval_storage(self.test_db)
+        assert db.completion_date_exists("Exercise", date(2025, 1, 2), self.test_db)
+
+    def test_analytics_use_intervals(self):
+        """Test that the analytics functions give the same results with interval storage."""
+        assert analytics.get_habit_longest_streak("Exercise", self.test_db) == 3
+        assert analytics.get_habit_with_longest_daily_streak(self.test_db) == ("Exercise", 3)
+        with_intervals = analytics.get_daily_habits_completion_ratio(self.test_db)
+        interval_store.disable_interval_storage(self.test_db)
+        assert not interval_store.is_enabled(self.test_db)
+        assert analytics.get_daily_habits_completion_ratio(self.test_db) == with_intervals
+
+    def test_remove_habit(self):
+        """Test that removing a habit removes its intervals."""
+        db.remove_habit("Exercise", self.test_db)
+        assert interval_store.fetch_intervals_by_id(self.exercise_id, self.test_db) == []
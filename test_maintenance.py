@@ -0,0 +1,81 @@
+import os
+import sqlite3
+from datetime import date, timedelta
+import db_handler as db
+import maintenance
+
+class TestMaintenance:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database with a habit of many completions before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2000, 1, 1), self.test_db)
+        db.add_habit("Read", "weekly", date(2000, 1, 1), self.test_db)
+        con = sqlite3.connect(self.test_db)
+        con.executemany(
+            "INSERT INTO completions (habit_id, completion_date) VALUES (1, ?)",
+            [(date(2000, 1, 1) + timedelta(days=i),) for i in range(5000)],
+        )
+        con.commit()
+        con.close()
+
+    def teardown_method(self):
+        """Clean up the test database after each test."""
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def test_incremental_auto_vacuum(self):
+        """Test that new databases are created in incremental auto-vacuum mode."""
+        assert maintenance.database_stats(self.test_db)["auto_vacuum"] == "incremental"
+
+    def test_vacuum_after_removal(self):
+        """Test that the pages freed by removing a habit are returned to the file system."""
+        pages = maintenance.database_stats(self.test_db)["page_count"]
+        db.remove_habit("Exercise", self.test_db)
+        free_pages = maintenance.database_stats(self.test_db)["freelist_count"]
+        assert free_pages > 0
+        assert maintenance.incremental_vacuum(self.test_db, max_pages=1) == 1
+        assert maintenance.incremental_vacuum(self.test_db) == free_pages - 1
+        stats = maintenance.database_stats(self.test_db)
+        assert (stats["freelist_count"], stats["page_count"]) == (0, pages - free_pages)
+
+    def test_run_maintenance(self):
+        """Test that a sound database reports no problem, gets planner statistics and per-object sizes."""
+        report = maintenance.run_maintenance(self.test_db, quick_check=False)
+        assert report["problems"] == []
+        assert report["freed_pages"] == 0
+        con, cursor = db.connect_db(self.test_db)
+        assert cursor.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        con.close()
+        objects = report["after"]["objects"]
+        if objects is not None:
+            assert objects["completions"] >= 5000 * 10
+            assert "idx_habits_periodicity_creation_date" in objects
+
+    def test_integrity_problems(self):
+        """Test that completions of a missing habit are reported by the integrity check."""
+        con = sqlite3.connect(self.test_db)
+        # without foreign key enforcement, removing a habit leaves its completions behind
+        con.execute("INSERT INTO completions (habit_id, completion_date) VALUES (2, '2025-01-06')")
+        con.execute("DELETE FROM habits WHERE habit = 'Read'")
+        con.commit()
+        con.close()
+        problems = maintenance.integrity_check(self.test_db)
+        assert len(problems) == 1 and "completions" in problems[0] and "habits" in problems[0]
+
+    def test_locked_database(self, monkeypatch, capsys):
+        """Test that steps failing while the application holds the lock are reported as failed."""
+        monkeypatch.setattr(maintenance, "BUSY_TIMEOUT_MS", 0)
+        con = sqlite3.connect(self.test_db)
+        con.execute("BEGIN EXCLUSIVE")
+        try:
+            report = maintenance.run_maintenance(self.test_db)
+        finally:
+            con.rollback()
+            con.close()
+        assert (report["problems"], report["freed_pages"], report["before"], report["after"]) == (None, 0, None, None)
+        maintenance.print_maintenance_report(report)
+        output = capsys.readouterr().out
+        assert "Integrity check failed" in output and "Integrity check: ok" not in output
+        assert "Freed 0 pages, database stats unavailable" in output
@@ -0,0 +1,31 @@
+import pytest
+import memory_profile
+
+class TestMemoryBudgets:
+    """Runs every analytics and prompts view function against a large synthetic database within its memory budget."""
+
+    def setup_class(cls):
+        """Create the synthetic database once for all the tests of the class."""
+        cls.database = memory_profile.synthetic_database()
+        cls.habit_name = cls.database.__enter__()
+
+    def teardown_class(cls):
+        """Remove the synthetic database."""
+        cls.database.__exit__(None, None, None)
+
+    def check_budget(self, functions: dict, name: str):
+        """Profile one function and fail with its allocation sites if it is over budget."""
+        report = memory_profile.run_harness({name: functions[name]})[0]
+        sites = "\n".join(f"{size} B  {site}" for site, size in report["sites"])
+        assert report["ok"], f"{name} peaked at {report['peak']} B, budget {report['budget']} B\n{sites}"
+
+    @pytest.mark.parametrize("name", [name for name in memory_profile.MEMORY_BUDGETS if name.startswith("analytics.")])
+    def test_analytics_budget(self, name):
+        """Test that an analytics function stays within its memory budget."""
+        self.check_budget(memory_profile.analytics_functions(self.habit_name), name)
+
+    @pytest.mark.parametrize("name", [name for name in memory_profile.MEMORY_BUDGETS if name.startswith("prompts.")])
+    def test_prompts_view_budget(self, name):
+        """Test that a prompts view function stays within its memory budget."""
+        pytest.importorskip("questionary")
+        self.check_budget(memory_profile.prompts_view_functions(self.habit_name), name)
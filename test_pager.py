@@ -0,0 +1,118 @@
+import io
+import os
+from datetime import date, timedelta
+import pytest
+import db_handler as db
+import analytics
+import pager
+from analytics_queries import all_habits_query, habit_completion_ratios_query
+
+class TestPager:
+    def test_screens(self):
+        """Test that every screen is written at once, and lines are only read when their screen is written."""
+        read = []
+        def lines():
+            for i in range(25):
+                read.append(i)
+                yield f"line {i}"
+        output, answers = io.StringIO(), []
+        def prompt(message):
+            answers.append(len(read))
+            return ""
+        assert pager.page(lines(), page_size=10, output=output, prompt=prompt) == 25
+        assert output.getvalue() == "".join(f"line {i}\n" for i in range(25))
+        # the first line of the next screen is read ahead, and no prompt follows the last screen
+        assert answers == [11, 21]
+
+    def test_quit(self):
+        """Test that answering 'q' stops the listing without reading further lines."""
+        lines = iter(f"line {i}" for i in range(1000000))
+        assert pager.page(lines, page_size=10, output=io.StringIO(), prompt=lambda message: "q") == 10
+        assert next(lines) == "line 11"
+
+    def test_offset_and_limit(self):
+        """Test that offset and limit select a slice of the lines, and that exhausting a screen does not prompt."""
+        output = io.StringIO()
+        written = pager.page((str(i) for i in range(100)), offset=20, limit=10, page_size=10, output=output,
+                             prompt=lambda message: 1 / 0)
+        assert written == 10
+        assert output.getvalue().split() == [str(i) for i in range(20, 30)]
+        assert pager.page(iter([]), output=output) == 0
+
+    def test_columns(self):
+        """Test that items are laid out row by row in as many columns as fit the width."""
+        dates = [f"2025-01-{day:02d}" for day in range(1, 8)]
+        assert list(pager.columns(dates, 10, width=34)) == [
+            "2025-01-01  2025-01-02  2025-01-03",
+            "2025-01-04  2025-01-05  2025-01-06",
+            "2025-01-07",
+        ]
+        assert list(pager.columns(dates[:2], 10, width=5)) == ["2025-01-01", "2025-01-02"]
+
+class TestStreamRows:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Read", "weekly", date(2025, 1, 1), self.test_db)
+        db.add_habit("Meditate", "daily", date(2025, 1, 2), self.test_db)
+        for day in (1, 2, 3):
+            db.add_completion_date("Exercise", date(2025, 1, day), self.test_db)
+        db.add_completion_date("Read", date(2025, 1, 2), self.test_db)
+
+    def teardown_method(self):
+        """Clean up the test database after each test."""
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def test_stream_rows(self):
+        """Test that streamed rows are the rows of the query, whatever the chunk size."""
+        rows = list(analytics.stream_rows(all_habits_query, db_name=self.test_db, chunk_size=2))
+        assert rows == analytics.fetch_all_habits(self.test_db)
+
+    def test_completion_ratios(self):
+        """Test that the streamed completion ratios are the ratios of the analytics module, in listing order."""
+        today = date(2025, 1, 10)
+        for periodicity in ("daily", "weekly"):
+            habits = analytics.fetch_daily_habits_with_id(self.test_db) if periodicity == "daily" \
+                else analytics.fetch_weekly_habits_with_id(self.test_db)
+            expected = [
+                (habit, analytics.calculate_completion_ratio(
+                    periodicity, date.fromisoformat(creation_date),
+                    analytics.count_completions_by_id(habit_id, self.test_db), today))
+                for habit_id, habit, _, creation_date in habits
+            ]
+            rows = analytics.stream_rows(habit_completion_ratios_query, (today.isoformat(), periodicity), self.test_db)
+            assert list(rows) == expected
+
+class TestPromptsPaging:
+    views = ["view_all_habits", "view_daily_habits", "view_weekly_habits", "view_habit_completion_dates",
+             "view_daily_habits_completion_ratio", "view_weekly_habits_completion_ratio", "view_report"]
+
+    @pytest.mark.parametrize("view", views)
+    def test_views_page(self, view, tmp_path, monkeypatch, capsys):
+        """Test that the listing views of prompts go through several screens, asking the user before each next one."""
+        prompts = pytest.importorskip("prompts")
+        # the views read the default database of the working directory
+        monkeypatch.chdir(tmp_path)
+        db.initialize_db("habit.db")
+        for i in range(12):
+            db.add_habit(f"Habit {i:02d}", "daily" if i % 2 else "weekly", date(2025, 1, 1), "habit.db")
+        for day in range(40):
+            db.add_completion_date("Habit 01", date(2025, 1, 1) + timedelta(days=day), "habit.db")
+        monkeypatch.setattr(prompts, "_cache", None)
+        monkeypatch.setattr(prompts, "select_habit", lambda: "Habit 01")
+        monkeypatch.setattr(prompts, "pause", lambda: None)
+        monkeypatch.setattr(pager, "screen_height", lambda: 2)
+        monkeypatch.setattr(pager.shutil, "get_terminal_size", lambda: os.terminal_size((40, 4)))
+        messages = []
+        monkeypatch.setattr("builtins.input", lambda message="": messages.append(message) or "")
+        getattr(prompts, view)()
+        if prompts._cache is not None:
+            prompts._cache.close()
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) >= 6 and "found" not in lines[0]
+        assert len(messages) == (len(lines) - 1) // 2
+        assert set(messages) == {"-- Enter: next page, q: quit --"}
@@ -0,0 +1,44 @@
+import os
+from datetime import datetime
+import pytest
+import db_handler as db
+import analytics
+import parallel_analytics
+
+class TestParallelAnalytics:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database before each test."""
+        db.initialize_db(self.test_db)
+
+        db.add_habit("Exercise", "daily", datetime(2025, 1, 1).date(), self.test_db)
+        db.add_habit("Brush teeth", "daily", datetime(2025, 1, 1).date(), self.test_db)
+        db.add_habit("Read", "weekly", datetime(2025, 1, 1).date(), self.test_db)
+        db.add_habit("Check mails", "weekly", datetime(2025, 1, 1).date(), self.test_db)
+
+        for day in (1, 2, 3, 5):
+            db.add_completion_date("Exercise", datetime(2025, 1, day).date(), self.test_db)
+        db.add_completion_date("Brush teeth", datetime(2025, 1, 5).date(), self.test_db)
+        for day in (1, 9, 22):
+            db.add_completion_date("Read", datetime(2025, 1, day).date(), self.test_db)
+        db.add_completion_date("Check mails", datetime(2025, 1, 22).date(), self.test_db)
+
+    def teardown_method(self):
+        """Clean up the test database after each test."""
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    @pytest.mark.parametrize("workers, chunk_size", [(1, 500), (1, 1), (2, 1), (2, 3)])
+    def test_matches_sequential_analytics(self, workers, chunk_size):
+        """Test that the parallel mode returns the same results as the sequential functions."""
+        results = parallel_analytics.get_habits_analytics_parallel(self.test_db, workers=workers, chunk_size=chunk_size)
+        assert results["longest_daily_streak"] == analytics.get_habit_with_longest_daily_streak(self.test_db)
+        assert results["longest_weekly_streak"] == analytics.get_habit_with_longest_weekly_streak(self.test_db)
+        assert results["daily_completion_ratios"] == analytics.get_daily_habits_completion_ratio(self.test_db)
+        assert results["weekly_completion_ratios"] == analytics.get_weekly_habits_completion_ratio(self.test_db)
+
+    def test_invalid_chunk_size(self):
+        """Test that a chunk size lower than 1 raises a ValueError."""
+        with pytest.raises(ValueError, match="Chunk size must be at least 1."):
+            parallel_analytics.get_habits_analytics_parallel(self.test_db, chunk_size=0)
@@ -0,0 +1,108 @@
+import os
+from datetime import date, datetime, timedelta
+import pytest
+import db_handler as db
+import analytics
+import bitmap_store
+import interval_store
+import partitions
+import replication
+import report
+
+class TestPartitions:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database with completions over three ISO years before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2022, 12, 1), self.test_db)
+        db.add_habit("Read", "weekly", date(2022, 12, 1), self.test_db)
+        # ISO year 2023 runs from 2023-01-02 to 2023-12-31, ISO year 2024 from 2024-01-01 to 2024-12-29
+        for i in range(60):
+            db.add_completion_date("Exercise", date(2023, 12, 1) + timedelta(days=i), self.test_db)
+        for i in range(0, 70, 7):
+            db.add_completion_date("Read", date(2023, 12, 1) + timedelta(days=i), self.test_db)
+        db.add_completion_date("Exercise", date(2024, 12, 30), self.test_db)
+
+    def teardown_method(self):
+        """Clean up the test database and its partitions after each test."""
+        for path in [self.test_db, *(partitions.partition_file(self.test_db, year) for year in (2023, 2024))]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def analytics_results(self):
+        """Returns the results of the analytics reading every completion."""
+        return (
+            analytics.fetch_habit_completion_dates("Exercise", self.test_db),
+            analytics.fetch_habit_completion_dates("Read", self.test_db),
+            analytics.get_habit_with_longest_daily_streak(self.test_db),
+            analytics.get_habit_with_longest_weekly_streak(self.test_db),
+            report.build_report(self.test_db, date(2025, 1, 5)),
+        )
+
+    def test_archive_keeps_analytics(self):
+        """Test that archived completions are still read by the analytics, and not logged as removed."""
+        expected = self.analytics_results()
+        change_log_length = len(replication.fetch_changes_since(0, self.test_db))
+        assert partitions.archive_year(2023, self.test_db) == 31 + 5
+        assert partitions.archive_year(2024, self.test_db) == 29 + 5
+        assert [row[0] for row in partitions.fetch_partitions(self.test_db)] == [2023, 2024]
+        assert self.analytics_results() == expected
+        assert len(replication.fetch_changes_since(0, self.test_db)) == change_log_length
+
+    def test_archived_years_are_read_only(self):
+        """Test that completions cannot be added to archived years, while the current partition stays writable."""
+        partitions.archive_year(2024, self.test_db)
+        assert db.add_completion_date_if_absent("Exercise", date(2024, 6, 1), self.test_db) == db.ARCHIVED
+        db.add_completion_date("Exercise", date(2024, 6, 2), self.test_db)
+        assert not db.completion_date_exists("Exercise", date(2024, 6, 2), self.test_db)
+        # 2024-12-30 belongs to the first week of the ISO year 2025, which is not archived
+        assert db.add_completion_date_if_absent("Exercise", date(2024, 12, 30), self.test_db) == db.ALREADY_EXISTS
+        assert db.add_completion_date_if_absent("Read", date(2025, 1, 6), self.test_db) == db.INSERTED
+
+    def test_archived_completions_are_not_removed(self):
+        """Test that removing a completion of an archived year is reported, and leaves the completion in place."""
+        partitions.archive_year(2023, self.test_db)
+        assert db.remove_completion_date("Exercise", date(2023, 12, 31), self.test_db) == db.ARCHIVED
+        assert db.completion_date_exists("Exercise", date(2023, 12, 31), self.test_db)
+        assert datetime(2023, 12, 31) in analytics.fetch_habit_completion_dates("Exercise", self.test_db)
+        assert db.remove_completion_date("Exercise", date(2024, 1, 1), self.test_db) == db.REMOVED
+        assert not db.completion_date_exists("Exercise", date(2024, 1, 1), self.test_db)
+
+    def test_existence_checks_read_one_partition(self):
+        """Test that checks of archived weeks read their partition, and checks of current weeks only the main file."""
+        partitions.archive_year(2023, self.test_db)
+        assert db.completion_week_exists("Read", date(2023, 12, 3), self.test_db)
+        assert db.completion_date_exists("Exercise", date(2023, 12, 31), self.test_db)
+        os.rename(partitions.partition_file(self.test_db, 2023), "test_habit_moved.db")
+        try:
+            assert db.completion_week_exists("Read", date(2024, 1, 3), self.test_db)
+            assert not db.completion_date_exists("Exercise", date(2024, 1, 30), self.test_db)
+        finally:
+            os.rename("test_habit_moved.db", partitions.partition_file(self.test_db, 2023))
+
+    def test_removed_habit(self):
+        """Test that the archived completions of a removed habit are hidden, even if its name is reused."""
+        partitions.archive_year(2023, self.test_db)
+        db.remove_habit("Exercise", self.test_db)
+        db.add_habit("Exercise", "daily", date(2025, 1, 1), self.test_db)
+        assert analytics.fetch_habit_completion_dates("Exercise", self.test_db) == []
+
+    def test_invalid_years(self):
+        """Test that only past years not archived yet can be archived."""
+        with pytest.raises(ValueError, match="Only past years can be archived."):
+            partitions.archive_year(date.today().isocalendar().year, self.test_db)
+        partitions.archive_year(2023, self.test_db)
+        with pytest.raises(ValueError, match="The year 2023 is already archived."):
+            partitions.archive_year(2023, self.test_db)
+
+    def test_compact_stores_rejected(self):
+        """Test that the compact stores, which would miss the archived completions, cannot be enabled after archiving."""
+        partitions.archive_year(2023, self.test_db)
+        longest_daily_streak = analytics.get_habit_with_longest_daily_streak(self.test_db)
+        with pytest.raises(ValueError, match="The interval storage cannot be enabled once completions are archived."):
+            interval_store.enable_interval_storage(self.test_db)
+        with pytest.raises(ValueError, match="The bitmap storage cannot be enabled once completions are archived."):
+            bitmap_store.enable_bitmap_storage(self.test_db)
+        assert not interval_store.is_enabled(self.test_db) and not bitmap_store.is_enabled(self.test_db)
+        assert analytics.get_habit_with_longest_daily_streak(self.test_db) == longest_daily_streak == ("Exercise", 60)
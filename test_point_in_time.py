@@ -0,0 +1,90 @@
+import os
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+import db_handler as db
+import analytics
+import point_in_time
+import report
+
+class TestPointInTime:
+    test_db = "test_habit.db"
+    truncated_db = "test_habit_truncated.db"
+
+    @classmethod
+    def setup_class(cls):
+        """Setup a test database with random habits created and completed over two months."""
+        db.initialize_db(cls.test_db)
+        rng = random.Random(7)
+        for i in range(12):
+            periodicity = "daily" if i % 3 else "weekly"
+            creation_date = date(2025, 1, 1) + timedelta(days=rng.randrange(40))
+            db.add_habit(f"Habit {i:02d}", periodicity, creation_date, cls.test_db)
+            day = creation_date
+            while day <= date(2025, 3, 1):
+                if rng.random() < 0.7:
+                    db.add_completion_date(f"Habit {i:02d}", day, cls.test_db)
+                day += timedelta(days=1 if periodicity == "daily" else 7)
+
+    @classmethod
+    def teardown_class(cls):
+        """Clean up the test databases after the tests of the class."""
+        for path in (cls.test_db, cls.truncated_db):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def truncate(self, end):
+        """Copies the test database without the habits created and the completions made after a date."""
+        if os.path.exists(self.truncated_db):
+            os.remove(self.truncated_db)
+        con = sqlite3.connect(self.test_db)
+        con.execute("VACUUM INTO ?", (self.truncated_db,))
+        con.close()
+        con = sqlite3.connect(self.truncated_db)
+        con.execute("PRAGMA foreign_keys = ON")
+        con.execute("DELETE FROM completions WHERE completion_date > ?", (end.isoformat(),))
+        con.execute("DELETE FROM habits WHERE creation_date > ?", (end.isoformat(),))
+        con.commit()
+        con.close()
+        return self.truncated_db
+
+    def test_as_of(self):
+        """Test that every result as of a date is the result of the analytics module on the history until then."""
+        for end in (date(2025, 1, 10), date(2025, 1, 31), date(2025, 2, 14)):
+            truncated = self.truncate(end)
+            assert point_in_time.fetch_all_habits(end, self.test_db) == analytics.fetch_all_habits(truncated)
+            assert point_in_time.fetch_periodicity_habits("weekly", end, self.test_db) == \
+                analytics.fetch_weekly_habits(truncated)
+            for habit, *_ in analytics.fetch_all_habits(truncated):
+                assert point_in_time.fetch_habit_completion_dates(habit, end=end, db_name=self.test_db) == \
+                    analytics.fetch_habit_completion_dates(habit, truncated)
+                assert point_in_time.get_habit_longest_streak(habit, end=end, db_name=self.test_db) == \
+                    analytics.get_habit_longest_streak(habit, truncated)
+            assert point_in_time.get_habit_with_longest_daily_streak(end=end, db_name=self.test_db) == \
+                analytics.get_habit_with_longest_daily_streak(truncated)
+            assert point_in_time.get_habit_with_longest_weekly_streak(end=end, db_name=self.test_db) == \
+                analytics.get_habit_with_longest_weekly_streak(truncated)
+            assert point_in_time.build_historical_reports([end], db_name=self.test_db)[end] == \
+                report.build_report(truncated, today=end)
+
+    def test_period(self):
+        """Test that completions are counted within the period, and ratios over the days each habit existed in it."""
+        start, end = date(2025, 2, 1), date(2025, 2, 28)
+        ratios = dict(point_in_time.get_daily_habits_completion_ratio(start, end, self.test_db))
+        for habit, periodicity, creation_date in point_in_time.fetch_periodicity_habits("daily", end, self.test_db):
+            dates = point_in_time.fetch_habit_completion_dates(habit, start, end, self.test_db)
+            assert all(datetime(2025, 2, 1) <= day <= datetime(2025, 2, 28) for day in dates)
+            assert point_in_time.count_completions(habit, start, end, self.test_db) == len(dates)
+            days = (end - max(start, date.fromisoformat(creation_date))).days + 1
+            assert ratios[habit] == len(dates) / days
+
+    def test_unbounded(self):
+        """Test that without bounds, the results are the ones of the analytics module."""
+        assert point_in_time.get_habit_with_longest_daily_streak(db_name=self.test_db) == \
+            analytics.get_habit_with_longest_daily_streak(self.test_db)
+        assert point_in_time.get_weekly_habits_completion_ratio(db_name=self.test_db) == \
+            analytics.get_weekly_habits_completion_ratio(self.test_db)
+        assert point_in_time.count_completions("Habit 01", db_name=self.test_db) == \
+            len(analytics.fetch_habit_completion_dates("Habit 01", self.test_db))
+        assert point_in_time.get_habit_longest_streak("Unknown", db_name=self.test_db) == \
+            analytics.get_habit_longest_streak("Unknown", self.test_db) == 0
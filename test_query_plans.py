@@ -0,0 +1,69 @@
+import os
+import sqlite3
+import query_plan_audit as audit
+
+class TestQueryPlans:
+    test_db = "test_habit.db"
+
+    def setup_class(cls):
+        """Seed and analyze a synthetic test database once for all the plan checks."""
+        audit.seed_audit_db(cls.test_db)
+
+    def teardown_class(cls):
+        """Clean up the test database after the plan checks."""
+        if os.path.exists(cls.test_db):
+            os.remove(cls.test_db)
+
+    def test_registered_queries(self):
+        """Test that every query of analytics_queries is audited."""
+        queries = audit.registered_queries()
+        assert "habit_completion_dates_query" in queries
+        assert "daily_habits_query" in queries
+        assert "{placeholders}" not in queries["chunk_completion_dates_query"]
+
+    def test_every_query_uses_an_index(self):
+        """Test that no analytics query reads a whole table or sorts in a temporary B-tree."""
+        flagged = {entry["name"]: entry["issues"] for entry in audit.audit_queries(self.test_db) if entry["issues"]}
+        assert flagged == {}
+
+    def test_regression_is_flagged(self):
+        """Test that a query losing its index is flagged with the index to create."""
+        sql = "SELECT habit FROM habits ORDER BY creation_date"
+        con = sqlite3.connect(self.test_db)
+        plan = audit.explain_query(con.cursor(), sql)
+        con.close()
+        issues = audit.plan_issues("sample_query", sql, plan, {"habits"})
+        assert any(issue.startswith("full scan") for issue in issues)
+        assert any(issue.startswith("temp sort") for issue in issues)
+        assert audit.suggest_index(sql) == (
+            "CREATE INDEX idx_habits_creation_date_habit ON habits (creation_date, habit)"
+        )
+
+    def test_suggest_index(self):
+        """Test the covering index suggested for a filtered and sorted query."""
+        sql = "SELECT id, habit, creation_date FROM habits WHERE periodicity = 'daily' ORDER BY habit ASC"
+        assert audit.suggest_index(sql) == (
+            "CREATE INDEX idx_habits_periodicity_habit_creation_date ON habits (periodicity, habit, creation_date)"
+        )
+        assert audit.suggest_index("SELECT h.habit FROM habits h JOIN completions c ON h.id = c.habit_id") is None
+
+    def test_intermediate_results_are_not_flagged(self):
+        """Test that scans of common table expressions are not flagged, unlike scans of their tables."""
+        sql = "WITH recent AS (SELECT habit_id FROM completions c) SELECT r.habit_id FROM recent r"
+        plan = ["SCAN r", "SCAN c"]
+        assert audit.table_aliases(sql) == {"completions": "completions", "c": "completions", "recent": "recent", "r": "recent"}
+        assert audit.plan_issues("sample_query", sql, plan, {"completions"}) == ["full scan: SCAN c"]
+
+    def test_full_scans_need_a_covering_index(self):
+        """Test that the queries reading every habit by design are still flagged when their scan reads the table."""
+        sql = "SELECT COUNT(*) FROM habits"
+        assert audit.plan_issues("count_habits_query", sql, ["SCAN habits USING COVERING INDEX sqlite_autoindex_habits_1"], {"habits"}) == []
+        assert audit.plan_issues("count_habits_query", sql, ["SCAN habits"], {"habits"}) == ["full scan: SCAN habits"]
+
+    def test_exemptions_are_per_step(self):
+        """Test that a query exempted from some temporary sorts is still flagged for any other scan or sort."""
+        sql = "SELECT h.habit FROM habits h"
+        plan = ["SCAN h", "USE TEMP B-TREE FOR ORDER BY", "USE TEMP B-TREE FOR ORDER BY"]
+        assert audit.plan_issues("ranked_completion_ratio_query", sql, plan, {"habits"}) == [
+            "full scan: SCAN h", "temp sort: USE TEMP B-TREE FOR ORDER BY",
+        ]
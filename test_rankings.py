@@ -0,0 +1,68 @@
+import os
+import random
+from datetime import date, timedelta
+import pytest
+import db_handler as db
+import rankings
+import report
+
+class TestRankings:
+    test_db = "test_habit.db"
+    today = date(2025, 3, 1)
+
+    @classmethod
+    def setup_class(cls):
+        """Setup a test database with random habits and completions, shared by the tests of the class."""
+        db.initialize_db(cls.test_db)
+        rng = random.Random(42)
+        for i in range(40):
+            periodicity = "daily" if i % 3 else "weekly"
+            habit = f"Habit {i:02d}"
+            creation_date = date(2025, 1, 1) + timedelta(days=rng.randrange(60))
+            db.add_habit(habit, periodicity, creation_date, cls.test_db)
+            day = creation_date
+            while day <= cls.today:
+                if rng.random() < 0.6:
+                    db.add_completion_date(habit, day, cls.test_db)
+                day += timedelta(days=1 if periodicity == "daily" else 7)
+
+    @classmethod
+    def teardown_class(cls):
+        """Clean up the test database after the tests of the class."""
+        if os.path.exists(cls.test_db):
+            os.remove(cls.test_db)
+
+    def expected_ranking(self, metric, periodicity=None, ascending=False):
+        """Returns the full ranking of the habits, sorted from the reports of every habit."""
+        reports = [r for r in report.stream_habit_reports(self.test_db, self.today)
+                   if periodicity is None or r.periodicity == periodicity]
+        sign = 1 if ascending else -1
+        return sorted(((r.habit, getattr(r, metric)) for r in reports), key=lambda item: (sign * item[1], item[0]))
+
+    @pytest.mark.parametrize("metric", rankings.METRICS)
+    @pytest.mark.parametrize("periodicity", [None, "daily", "weekly"])
+    def test_top_and_bottom(self, metric, periodicity):
+        """Test that the best and worst habits are ranked like a full sort of the reports."""
+        expected = self.expected_ranking(metric, periodicity)
+        top = rankings.top_habits(metric, 5, periodicity=periodicity, db_name=self.test_db, today=self.today)
+        assert top == expected[:5]
+        expected = self.expected_ranking(metric, periodicity, ascending=True)
+        bottom = rankings.bottom_habits(metric, 5, periodicity=periodicity, db_name=self.test_db, today=self.today)
+        assert bottom == expected[:5]
+
+    @pytest.mark.parametrize("metric", rankings.METRICS)
+    def test_pagination(self, metric):
+        """Test that consecutive pages make up the full ranking, the last one being shorter."""
+        pages = [
+            rankings.top_habits(metric, 15, offset, db_name=self.test_db, today=self.today)
+            for offset in range(0, 45, 15)
+        ]
+        assert [len(page) for page in pages] == [15, 15, 10]
+        assert sum(pages, []) == self.expected_ranking(metric)
+
+    def test_invalid_arguments(self):
+        """Test that unknown metrics and negative pages are refused."""
+        with pytest.raises(ValueError, match="Habits can only be ranked by"):
+            rankings.top_habits("completions", db_name=self.test_db)
+        with pytest.raises(ValueError, match="The limit and offset must not be negative."):
+            rankings.top_habits("longest_streak", offset=-1, db_name=self.test_db)
@@ -0,0 +1,83 @@
+import os
+from datetime import datetime
+import db_handler as db
+import analytics
+import replication
+
+class TestReplication:
+    test_db = "test_habit.db"
+    replica_db = "test_replica.db"
+
+    def setup_method(self):
+        """Setup a fresh source and replica database before each test."""
+        db.initialize_db(self.test_db)
+        db.initialize_db(self.replica_db)
+
+        db.add_habit("Exercise", "daily", datetime(2025, 1, 1).date(), self.test_db)
+        db.add_habit("Read", "weekly", datetime(2025, 1, 1).date(), self.test_db)
+        db.add_completion_date("Exercise", datetime(2025, 1, 1).date(), self.test_db)
+        db.add_completion_date("Exercise", datetime(2025, 1, 2).date(), self.test_db)
+        db.add_completion_date("Read", datetime(2025, 1, 1).date(), self.test_db)
+
+    def teardown_method(self):
+        """Clean up the test databases after each test."""
+        for db_name in (self.test_db, self.replica_db):
+            if os.path.exists(db_name):
+                os.remove(db_name)
+
+    def test_change_log(self):
+        """Test that every mutating function appends to the change log with increasing sequence numbers."""
+        db.remove_completion_date("Exercise", datetime(2025, 1, 2).date(), self.test_db)
+        db.remove_habit("Read", self.test_db)
+        changes = replication.fetch_changes_since(0, self.test_db)
+        assert [change[1:] for change in changes] == [
+            ("add_habit", "Exercise", "daily", "2025-01-01", None),
+            ("add_habit", "Read", "weekly", "2025-01-01", None),
+            ("add_completion", "Exercise", None, "2025-01-01", None),
+            ("add_completion", "Exercise", None, "2025-01-02", None),
+            ("add_completion", "Read", None, "2025-01-01", None),
+            ("remove_completion", "Exercise", None, "2025-01-02", None),
+            ("remove_habit", "Read", None, None, None),
+        ]
+        assert [change[0] for change in changes] == sorted(change[0] for change in changes)
+        assert replication.fetch_changes_since(changes[-2][0], self.test_db) == changes[-1:]
+
+    def test_failed_write_is_not_logged(self):
+        """Test that a rejected write leaves no entry in the change log."""
+        before = replication.fetch_changes_since(0, self.test_db)
+        db.add_completion_date("Exercise", datetime(2025, 1, 1).date(), self.test_db)
+        assert replication.fetch_changes_since(0, self.test_db) == before
+
+    def test_sync(self):
+        """Test that a sync only applies the changes made since the previous sync."""
+        assert replication.sync(self.test_db, self.replica_db) == 5
+        assert analytics.fetch_all_habits(self.replica_db) == analytics.fetch_all_habits(self.test_db)
+
+        db.add_completion_date("Exercise", datetime(2025, 1, 3).date(), self.test_db)
+        db.remove_habit("Read", self.test_db)
+        assert replication.sync(self.test_db, self.replica_db, batch_size=1) == 2
+        assert replication.sync(self.test_db, self.replica_db) == 0
+
+        assert analytics.fetch_all_habits(self.replica_db) == [("Exercise", "daily", "2025-01-01")]
+        assert analytics.fetch_habit_completion_dates("Exercise", self.replica_db) == [
+            datetime(2025, 1, 1), datetime(2025, 1, 2), datetime(2025, 1, 3)
+        ]
+
+    def test_sync_rename(self):
+        """Test that a renamed habit keeps its completions on the replica."""
+        replication.sync(self.test_db, self.replica_db)
+        db.rename_habit("Exercise", "Workout", self.test_db)
+        assert replication.sync(self.test_db, self.replica_db) == 1
+        assert analytics.fetch_habit_completion_dates("Workout", self.replica_db) == [
+            datetime(2025, 1, 1), datetime(2025, 1, 2)
+        ]
+
+    def test_seed_existing_database(self):
+        """Test that a database created before the change log is seeded with its existing data."""
+        con, cursor = db.connect_db(self.test_db)
+        cursor.execute("DELETE FROM change_log")
+        con.commit()
+        con.close()
+        db.initialize_db(self.test_db)
+        assert replication.sync(self.test_db, self.replica_db) == 5
+        assert analytics.fetch_habit_completion_dates("Read", self.replica_db) == [datetime(2025, 1, 1)]
@@ -0,0 +1,68 @@
+import os
+from datetime import date
+import db_handler as db
+import analytics
+import report
+
+class TestReport:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Brush teeth", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Read", "weekly", date(2025, 1, 1), self.test_db)
+        db.add_habit("Check mails", "weekly", date(2025, 1, 1), self.test_db)
+        db.add_habit("Meditate", "daily", date(2025, 1, 8), self.test_db)
+        for day in (1, 2, 3, 5, 6):
+            db.add_completion_date("Exercise", date(2025, 1, day), self.test_db)
+        db.add_completion_date("Brush teeth", date(2025, 1, 5), self.test_db)
+        for day in (1, 9, 22, 29):
+            db.add_completion_date("Read", date(2025, 1, day), self.test_db)
+        db.add_completion_date("Check mails", date(2025, 1, 22), self.test_db)
+
+    def teardown_method(self):
+        """Clean up the test database after each test."""
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def test_habit_reports(self):
+        """Test the analytics of every habit computed in one pass."""
+        reports = {r.habit: r for r in report.stream_habit_reports(self.test_db, today=date(2025, 1, 7))}
+        assert reports["Exercise"] == report.HabitReport(
+            "Exercise", "daily", date(2025, 1, 1), 5, 3, 2, 5 / 7, date(2025, 1, 6)
+        )
+        assert reports["Brush teeth"].current_streak == 0
+        assert reports["Read"].longest_streak == 2
+        assert reports["Read"].current_streak == 0
+        assert reports["Meditate"].completions == 0
+        assert reports["Meditate"].last_completion is None
+
+    def test_weekly_current_streak(self):
+        """Test that a weekly streak is still running during the week following its last completion."""
+        reports = {r.habit: r for r in report.stream_habit_reports(self.test_db, today=date(2025, 2, 5))}
+        assert reports["Read"].current_streak == 2
+        assert reports["Check mails"].current_streak == 0
+
+    def test_matches_sequential_analytics(self):
+        """Test that the report returns the same results as the sequential functions."""
+        results = report.build_report(self.test_db)
+        assert results["longest_daily_streak"] == analytics.get_habit_with_longest_daily_streak(self.test_db)
+        assert results["longest_weekly_streak"] == analytics.get_habit_with_longest_weekly_streak(self.test_db)
+        assert results["daily_completion_ratios"] == analytics.get_daily_habits_completion_ratio(self.test_db)
+        assert results["weekly_completion_ratios"] == analytics.get_weekly_habits_completion_ratio(self.test_db)
+        for habit in results["habits"]:
+            assert habit.longest_streak == analytics.get_habit_longest_streak(habit.habit, self.test_db)
+
+    def test_empty_database(self):
+        """Test the report of a database without habits."""
+        for habit in analytics.fetch_habit_names(self.test_db):
+            db.remove_habit(habit, self.test_db)
+        assert report.build_report(self.test_db) == {
+            "habits": [],
+            "longest_daily_streak": ("", 0),
+            "longest_weekly_streak": ("", 0),
+            "daily_completion_ratios": [],
+            "weekly_completion_ratios": [],
+        }
@@ -0,0 +1,69 @@
+import os
+import random
+from datetime import date, timedelta
+import db_handler as db
+import analytics
+import streak_timeline
+from coherent_cache import CoherentCache
+
+class TestStreakTimeline:
+    test_db = "test_habit.db"
+
+    def setup_method(self):
+        """Setup a fresh test database before each test."""
+        db.initialize_db(self.test_db)
+        db.add_habit("Exercise", "daily", date(2025, 1, 1), self.test_db)
+        db.add_habit("Read", "weekly", date(2025, 1, 1), self.test_db)
+        for day in (1, 2, 3, 5):
+            db.add_completion_date("Exercise", date(2025, 1, day), self.test_db)
+        for day in (1, 9, 22):
+            db.add_completion_date("Read", date(2025, 1, day), self.test_db)
+
+    def teardown_method(self):
+        """Clean up the test database after each test."""
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def test_daily_timeline(self):
+        """Test the running and longest streaks of every day of a range."""
+        timeline = streak_timeline.get_streak_timeline("Exercise", end=date(2025, 1, 6), db_name=self.test_db)
+        assert timeline == [
+            (date(2025, 1, 1), 1, 1),
+            (date(2025, 1, 2), 2, 2),
+            (date(2025, 1, 3), 3, 3),
+            (date(2025, 1, 4), 0, 3),
+            (date(2025, 1, 5), 1, 3),
+            (date(2025, 1, 6), 0, 3),
+        ]
+
+    def test_weekly_timeline(self):
+        """Test that weekly timelines have one entry per week, starting on Mondays, with history before the range."""
+        timeline = streak_timeline.get_streak_timeline("Read", date(2025, 1, 8), date(2025, 1, 26), self.test_db)
+        assert timeline == [
+            (date(2025, 1, 6), 2, 2),
+            (date(2025, 1, 13), 0, 2),
+            (date(2025, 1, 20), 1, 2),
+        ]
+
+    def test_matches_truncated_streaks(self):
+        """Test that the longest streak to date matches the longest streak of the truncated history."""
+        rng = random.Random(0)
+        days = [date(2025, 1, 1) + timedelta(days=i) for i in range(120)]
+        dates = [day for day in days if rng.random() < 0.7]
+        for periodicity, streak in (("daily", analytics.calculate_daily_streak), ("weekly", analytics.calculate_weekly_streak)):
+            timeline = streak_timeline.calculate_streak_timeline(periodicity, dates, days[0], days[-1])
+            for period, _, longest_streak in timeline:
+                end = period if periodicity == "daily" else period + timedelta(days=6)
+                assert longest_streak == streak([day for day in dates if day <= end])
+
+    def test_unknown_habit(self):
+        """Test that an unknown habit has an empty timeline."""
+        assert streak_timeline.get_streak_timeline("Unknown", db_name=self.test_db) == []
+
+    def test_cached_timeline(self):
+        """Test that the cached timeline is refreshed when a completion is added."""
+        with CoherentCache(self.test_db) as cache:
+            end = date(2025, 1, 4)
+            assert cache.get_streak_timeline("Exercise", end=end)[-1] == (end, 0, 3)
+            db.add_completion_date("Exercise", end, self.test_db)
+            assert cache.get_streak_timeline("Exercise", end=end)[-1] == (end, 4, 4)